@@ -0,0 +1,38 @@
+"""add_media_derivatives
+
+Revision ID: a3c9e6d42f17
+Revises: f81b4d0c6a93
+Create Date: 2026-10-20 10:12:31.507244
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c9e6d42f17'
+down_revision: Union[str, None] = 'f81b4d0c6a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Resized WebP/AVIF renditions and the original's SHA-256 per photo
+    op.add_column('media', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column(
+        'media',
+        sa.Column('derivatives', postgresql.JSONB(), nullable=False, server_default=sa.text("'[]'::jsonb"))
+    )
+    op.create_index(op.f('ix_media_content_hash'), 'media', ['content_hash'], unique=False)
+    # Direct uploads exist before the report they will be attached to
+    op.alter_column('media', 'report_id', existing_type=sa.String(), nullable=True)
+
+
+def downgrade() -> None:
+    op.alter_column('media', 'report_id', existing_type=sa.String(), nullable=False)
+    op.drop_index(op.f('ix_media_content_hash'), table_name='media')
+    op.drop_column('media', 'derivatives')
+    op.drop_column('media', 'content_hash')
@@ -0,0 +1,68 @@
+"""add_media_blobs
+
+Revision ID: b7e2d9f4c1a8
+Revises: a3c9e6d42f17
+Create Date: 2026-10-21 09:41:07.318562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d9f4c1a8'
+down_revision: Union[str, None] = 'a3c9e6d42f17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One stored original (plus derivatives and hashes) per distinct content
+    op.create_table(
+        'media_blobs',
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('object_name', sa.String(), nullable=False),
+        sa.Column('mime_type', sa.String(), nullable=True),
+        sa.Column('size_bytes', sa.Integer(), nullable=True),
+        sa.Column('width', sa.Integer(), nullable=True),
+        sa.Column('height', sa.Integer(), nullable=True),
+        sa.Column('phash_hex', sa.String(), nullable=True),
+        sa.Column('dhash_hex', sa.String(), nullable=True),
+        sa.Column('derivatives', postgresql.JSONB(), nullable=False, server_default=sa.text("'[]'::jsonb")),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('released_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('content_hash')
+    )
+    op.create_index(
+        'ix_media_blobs_unreferenced', 'media_blobs', ['released_at'],
+        unique=False, postgresql_where=sa.text('ref_count <= 0')
+    )
+
+    # Existing hashed photos become blobs (earliest row's object and derivatives)
+    op.execute("""
+        INSERT INTO media_blobs (
+            content_hash, object_name, mime_type, size_bytes, width, height,
+            phash_hex, dhash_hex, derivatives, ref_count, processed_at
+        )
+        SELECT DISTINCT ON (content_hash)
+            content_hash, filename, mime_type, size_bytes, width, height,
+            phash_hex, dhash_hex, derivatives,
+            count(*) OVER (PARTITION BY content_hash), now()
+        FROM media
+        WHERE content_hash IS NOT NULL
+        ORDER BY content_hash, created_at
+    """)
+    op.create_foreign_key(
+        'media_content_hash_fkey', 'media', 'media_blobs', ['content_hash'], ['content_hash']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('media_content_hash_fkey', 'media', type_='foreignkey')
+    op.drop_index('ix_media_blobs_unreferenced', table_name='media_blobs', postgresql_where=sa.text('ref_count <= 0'))
+    op.drop_table('media_blobs')
@@ -0,0 +1,33 @@
+"""add_audit_log_actor_email
+
+Revision ID: c3d1f7a92b64
+Revises: a74799b92e96
+Create Date: 2026-10-18 22:10:41.503127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d1f7a92b64'
+down_revision: Union[str, None] = 'a74799b92e96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Denormalize the actor email so audit listings don't join users per row
+    op.add_column('audit_logs', sa.Column('actor_email', sa.String(), nullable=True))
+    op.execute(
+        "UPDATE audit_logs SET actor_email = users.email "
+        "FROM users WHERE users.id = audit_logs.user_id"
+    )
+    op.create_index('ix_audit_logs_actor_email', 'audit_logs', ['actor_email'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_logs_actor_email', table_name='audit_logs')
+    op.drop_column('audit_logs', 'actor_email')
@@ -0,0 +1,55 @@
+"""unique_fraud_result_per_report
+
+Revision ID: c8f1a5e3d2b9
+Revises: b7e2d9f4c1a8
+Create Date: 2026-10-22 14:12:36.904215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f1a5e3d2b9'
+down_revision: Union[str, None] = 'b7e2d9f4c1a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Created by the API's create_all, so it may not exist yet
+    if not sa.inspect(op.get_bind()).has_table('fraud_detection_results'):
+        return
+
+    # Keep the latest result per report; older ones' logs point at it
+    op.execute("""
+        CREATE TEMPORARY TABLE fraud_result_dupes ON COMMIT DROP AS
+        SELECT id, first_value(id) OVER (
+            PARTITION BY report_id ORDER BY detected_at DESC NULLS LAST, created_at DESC
+        ) AS kept_id
+        FROM fraud_detection_results
+    """)
+    op.execute("DELETE FROM fraud_result_dupes WHERE id = kept_id")
+    if sa.inspect(op.get_bind()).has_table('fraud_detection_logs'):
+        op.execute("""
+            UPDATE fraud_detection_logs l SET detection_result_id = d.kept_id
+            FROM fraud_result_dupes d WHERE l.detection_result_id = d.id
+        """)
+    op.execute("DELETE FROM fraud_detection_results r USING fraud_result_dupes d WHERE r.id = d.id")
+
+    # One row per report, so scoring can upsert
+    op.execute("DROP INDEX IF EXISTS ix_fraud_detection_results_report_id")
+    op.create_index(
+        'ix_fraud_detection_results_report_id', 'fraud_detection_results', ['report_id'], unique=True
+    )
+
+
+def downgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table('fraud_detection_results'):
+        return
+    op.drop_index('ix_fraud_detection_results_report_id', table_name='fraud_detection_results')
+    op.create_index(
+        'ix_fraud_detection_results_report_id', 'fraud_detection_results', ['report_id'], unique=False
+    )
@@ -0,0 +1,29 @@
+"""add_media_hash_version
+
+Revision ID: d4a7b2e9c615
+Revises: c8f1a5e3d2b9
+Create Date: 2026-10-23 10:05:48.217340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7b2e9c615'
+down_revision: Union[str, None] = 'c8f1a5e3d2b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing hashes stay NULL (pre-versioning) until the worker recomputes them
+    op.add_column('media_blobs', sa.Column('hash_version', sa.Integer(), nullable=True))
+    op.add_column('media', sa.Column('hash_version', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('media', 'hash_version')
+    op.drop_column('media_blobs', 'hash_version')
@@ -0,0 +1,34 @@
+"""add_report_daily_counts
+
+Revision ID: e5a2c8b17f40
+Revises: c3d1f7a92b64
+Create Date: 2026-10-19 09:42:17.318402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a2c8b17f40'
+down_revision: Union[str, None] = 'c3d1f7a92b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Daily rollup behind the admin reports chart; filled on first read
+    op.create_table(
+        'report_daily_counts',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('created', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('resolved', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('report_daily_counts')
@@ -0,0 +1,42 @@
+"""add_report_resolved_at
+
+Revision ID: e9b3c6a1f275
+Revises: d4a7b2e9c615
+Create Date: 2026-10-23 15:41:09.562817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b3c6a1f275'
+down_revision: Union[str, None] = 'd4a7b2e9c615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Resolution day for the resolved_reports rollup. Reports resolved before
+    # this column existed only have their last edit time to go by.
+    op.add_column('reports', sa.Column('resolved_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE reports SET resolved_at = updated_at WHERE is_resolved")
+    op.create_index('ix_reports_resolved_at', 'reports', ['resolved_at'])
+
+    # The reports chart reads daily_rollups now
+    op.drop_table('report_daily_counts')
+
+
+def downgrade() -> None:
+    op.create_table(
+        'report_daily_counts',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('created', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('resolved', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('day')
+    )
+    op.drop_index('ix_reports_resolved_at', table_name='reports')
+    op.drop_column('reports', 'resolved_at')
@@ -0,0 +1,47 @@
+"""add_daily_rollups
+
+Revision ID: f81b4d0c6a93
+Revises: e5a2c8b17f40
+Create Date: 2026-10-19 14:05:52.871640
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f81b4d0c6a93'
+down_revision: Union[str, None] = 'e5a2c8b17f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Per-day analytics counters; built by the worker's rollup job or on first read
+    op.create_table(
+        'daily_rollups',
+        sa.Column('metric', sa.String(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('dimension', sa.String(), nullable=False),
+        sa.Column('value', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('metric', 'day', 'dimension', 'value')
+    )
+    op.create_index(
+        'ix_daily_rollups_metric_dimension_day', 'daily_rollups', ['metric', 'dimension', 'day']
+    )
+    op.create_table(
+        'rollup_watermarks',
+        sa.Column('metric', sa.String(), nullable=False),
+        sa.Column('watermark', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('metric')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rollup_watermarks')
+    op.drop_index('ix_daily_rollups_metric_dimension_day', table_name='daily_rollups')
+    op.drop_table('daily_rollups')
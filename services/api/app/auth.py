@@ -1,15 +1,52 @@
 """Simple authentication utilities."""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple, TypeVar
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from prometheus_client import Counter, Gauge
 import os
 from functools import lru_cache
 
 from .config import config
+from .exceptions import RateLimitError, ServiceUnavailableError
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Password hashing context. Argon2 is the default; bcrypt hashes from older
+# accounts still verify and are rehashed on the next successful login.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__rounds=config.PASSWORD_ARGON2_TIME_COST,
+    argon2__memory_cost=config.PASSWORD_ARGON2_MEMORY_COST,
+    argon2__parallelism=config.PASSWORD_ARGON2_PARALLELISM,
+)
+
+# Hashing is CPU-bound and ~100s of ms per call, so it runs on a dedicated,
+# size-limited pool instead of the event loop or the shared request threadpool.
+_password_executor = ThreadPoolExecutor(
+    max_workers=config.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+_password_lock = threading.Lock()
+_password_slots_in_use = 0
+_password_slots_by_ip: Dict[str, int] = {}
+_password_jobs_queued = 0
+
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    'password_hash_queue_depth',
+    'Password hashing jobs waiting for or running on the hashing pool'
+)
+
+PASSWORD_HASH_REJECTED = Counter(
+    'password_hash_rejected_total',
+    'Password operations rejected before hashing',
+    ['reason']
+)
+
+T = TypeVar("T")
 
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
@@ -24,14 +61,116 @@ def _get_secret_key() -> str:
     return secret
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+@contextmanager
+def password_slot(client_ip: Optional[str] = None):
+    """
+    Reserve capacity on the password hashing pool for one hashing job.
+    
+    Taken by every job submitted through _run_password_job(_async), so all
+    hashing paths are bounded, not only the login and registration routes.
+    
+    Raises RateLimitError when the client already has PASSWORD_HASH_PER_IP_LIMIT
+    requests hashing, and ServiceUnavailableError when the pool's queue is full,
+    so a burst of logins is shed instead of piling up behind the workers.
+    """
+    global _password_slots_in_use
+    
+    with _password_lock:
+        if _password_slots_in_use >= config.PASSWORD_HASH_WORKERS + config.PASSWORD_HASH_QUEUE_SIZE:
+            PASSWORD_HASH_REJECTED.labels(reason="queue_full").inc()
+            raise ServiceUnavailableError("password hashing", "Too many authentication requests, please retry")
+        if client_ip and _password_slots_by_ip.get(client_ip, 0) >= config.PASSWORD_HASH_PER_IP_LIMIT:
+            PASSWORD_HASH_REJECTED.labels(reason="per_ip").inc()
+            raise RateLimitError("Too many concurrent authentication requests")
+        
+        _password_slots_in_use += 1
+        if client_ip:
+            _password_slots_by_ip[client_ip] = _password_slots_by_ip.get(client_ip, 0) + 1
+    
+    try:
+        yield
+    finally:
+        with _password_lock:
+            _password_slots_in_use -= 1
+            if client_ip:
+                remaining = _password_slots_by_ip.get(client_ip, 1) - 1
+                if remaining:
+                    _password_slots_by_ip[client_ip] = remaining
+                else:
+                    _password_slots_by_ip.pop(client_ip, None)
+
+
+def _track_password_job(delta: int) -> None:
+    global _password_jobs_queued
+    with _password_lock:
+        _password_jobs_queued += delta
+        PASSWORD_HASH_QUEUE_DEPTH.set(_password_jobs_queued)
+
+
+def _run_password_job(func: Callable[..., T], *args, client_ip: Optional[str] = None) -> T:
+    """Run func on the hashing pool and wait for it (for sync callers)."""
+    with password_slot(client_ip):
+        _track_password_job(1)
+        try:
+            return _password_executor.submit(func, *args).result()
+        finally:
+            _track_password_job(-1)
+
+
+async def _run_password_job_async(func: Callable[..., T], *args, client_ip: Optional[str] = None) -> T:
+    """Run func on the hashing pool without blocking the event loop."""
+    with password_slot(client_ip):
+        _track_password_job(1)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(_password_executor, func, *args)
+        finally:
+            _track_password_job(-1)
+
+
+def verify_password(plain_password: str, hashed_password: str, client_ip: Optional[str] = None) -> bool:
     """Verify a password against the stored hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return _run_password_job(pwd_context.verify, plain_password, hashed_password, client_ip=client_ip)
+
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str, client_ip: Optional[str] = None
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if the stored hash uses outdated parameters.
+    
+    Args:
+        client_ip: Requesting client, counted against PASSWORD_HASH_PER_IP_LIMIT
+    
+    Returns:
+        Tuple of (valid, new_hash); new_hash is None unless the caller should store it
+    """
+    return _run_password_job(
+        pwd_context.verify_and_update, plain_password, hashed_password, client_ip=client_ip
+    )
 
-def get_password_hash(password: str) -> str:
+
+def get_password_hash(password: str, client_ip: Optional[str] = None) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return _run_password_job(pwd_context.hash, password, client_ip=client_ip)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str, client_ip: Optional[str] = None
+) -> Tuple[bool, Optional[str]]:
+    """Async variant of verify_and_update_password."""
+    return await _run_password_job_async(
+        pwd_context.verify_and_update, plain_password, hashed_password, client_ip=client_ip
+    )
+
+
+async def get_password_hash_async(password: str, client_ip: Optional[str] = None) -> str:
+    """Async variant of get_password_hash."""
+    return await _run_password_job_async(pwd_context.hash, password, client_ip=client_ip)
+
+
+def shutdown_password_executor() -> None:
+    """Stop the password hashing pool."""
+    _password_executor.shutdown(wait=False, cancel_futures=True)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -5,7 +5,10 @@ Enhanced Redis integration for caching, sessions, and background tasks.
 """
 import json
 import logging
-from typing import Optional, Any, Dict, Union
+import math
+import time
+from collections import OrderedDict
+from typing import Optional, Any, Dict, List, Tuple, Union
 from datetime import datetime, timedelta
 import asyncio
 from contextlib import asynccontextmanager
@@ -100,6 +103,16 @@ class RedisClient:
             logger.error(f"Redis delete failed for key {key}: {e}")
             return False
     
+    async def delete_many(self, *keys: str) -> int:
+        """Delete several keys in one round-trip."""
+        if not keys:
+            return 0
+        try:
+            return await self.client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Redis delete failed for {len(keys)} keys: {e}")
+            return 0
+    
     async def exists(self, key: str) -> bool:
         """Check if key exists in Redis."""
         try:
@@ -407,32 +420,94 @@ async def delete_session(session_id: str) -> bool:
     return await client.delete(session_id)
 
 
+# Principal cache
+# Authenticated-user snapshots, so get_current_user can skip the users lookup.
+# The in-process LRU is checked first; its short TTL bounds how long another
+# worker can keep serving a principal after invalidate_principal().
+_principal_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def _principal_key(user_id: str) -> str:
+    return f"principal:{user_id}"
+
+
+def _remember_principal(user_id: str, principal: Dict[str, Any]) -> None:
+    """Store principal in the in-process LRU, evicting the oldest entries."""
+    _principal_cache[user_id] = (time.monotonic() + config.PRINCIPAL_CACHE_LOCAL_TTL, principal)
+    _principal_cache.move_to_end(user_id)
+    while len(_principal_cache) > config.PRINCIPAL_CACHE_SIZE:
+        _principal_cache.popitem(last=False)
+
+
+async def get_cached_principal(user_id: str) -> Optional[Dict[str, Any]]:
+    """Get cached principal for user, or None on a miss."""
+    if not config.ENABLE_PRINCIPAL_CACHE:
+        return None
+    
+    user_id = str(user_id)
+    entry = _principal_cache.get(user_id)
+    if entry is not None:
+        expires_at, principal = entry
+        if expires_at > time.monotonic():
+            _principal_cache.move_to_end(user_id)
+            return principal
+        del _principal_cache[user_id]
+    
+    principal = await cache_get(_principal_key(user_id))
+    if principal is not None:
+        _remember_principal(user_id, principal)
+    return principal
+
+
+async def set_cached_principal(user_id: str, principal: Dict[str, Any]) -> None:
+    """Cache principal for user in-process and in Redis."""
+    if not config.ENABLE_PRINCIPAL_CACHE:
+        return
+    
+    user_id = str(user_id)
+    _remember_principal(user_id, principal)
+    await cache_set(_principal_key(user_id), principal, config.PRINCIPAL_CACHE_TTL)
+
+
+async def invalidate_principal(user_id: Any) -> None:
+    """Drop cached principal after a user's role, status or profile changes."""
+    if not config.ENABLE_PRINCIPAL_CACHE:
+        return
+    
+    user_id = str(user_id)
+    _principal_cache.pop(user_id, None)
+    await cache_delete(_principal_key(user_id))
+
+
+async def invalidate_principals(user_ids: List[Any]) -> None:
+    """Drop cached principals for many users with a single Redis call."""
+    if not config.ENABLE_PRINCIPAL_CACHE or not user_ids:
+        return
+    
+    user_ids = [str(user_id) for user_id in user_ids]
+    for user_id in user_ids:
+        _principal_cache.pop(user_id, None)
+    
+    if config.ENABLE_REDIS_CACHE:
+        client = get_redis_client()
+        await client.delete_many(*[_principal_key(user_id) for user_id in user_ids])
+
+
 # Rate limiting
 async def check_rate_limit(identifier: str, limit: int, window: int = 60) -> Dict[str, Any]:
-    """Check rate limit for identifier."""
-    key = f"rate_limit:{identifier}"
-    client = get_redis_client()
-    
-    # Get current count
-    current_count = await client.get(key) or 0
-    current_count = int(current_count)
-    
-    if current_count >= limit:
-        return {
-            "allowed": False,
-            "current_count": current_count,
-            "limit": limit,
-            "reset_time": window
-        }
-    
-    # Increment counter
-    await client.incr(key)
-    if current_count == 0:
-        await client.expire(key, window)
-    
+    """
+    Check rate limit for identifier: at most `limit` hits per `window` seconds.
+
+    One atomic Lua call (see app.rate_limit), so concurrent hits can't
+    overshoot the limit and the key always carries a TTL.
+    """
+    from .rate_limit import rate_limiter
+
+    result = await rate_limiter.hit(f"ratelimit:{identifier}", limit, window)
     return {
-        "allowed": True,
-        "current_count": current_count + 1,
+        "allowed": result.allowed,
+        "current_count": limit - result.remaining,
         "limit": limit,
-        "reset_time": window
+        "reset_time": math.ceil(result.reset_after),
+        "retry_after": math.ceil(result.retry_after)
     }
@@ -5,7 +5,7 @@ Handles HTTP communication, caching, retries, and error handling with improved m
 import httpx
 import hashlib
 import json
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Union
 from redis.asyncio import Redis
 import logging
 import asyncio
@@ -14,6 +14,14 @@ from .config import config
 
 logger = logging.getLogger(__name__)
 
+# Hash types vision's fused similarity accepts (SimilarityRequest.hashes1/hashes2)
+FUSED_HASH_TYPES = ("phash", "dhash", "ahash", "whash")
+
+
+def fused_hash_set(hashes: Dict[str, Any]) -> Dict[str, str]:
+    """The hash-type entries of a hash set, without metadata such as hash_version."""
+    return {hash_type: hashes[hash_type] for hash_type in FUSED_HASH_TYPES if hashes.get(hash_type)}
+
 
 class ServiceClient:
     """Base class for service clients with retry and caching logic."""
@@ -372,7 +380,7 @@ class VisionClient(ServiceClient):
         
         # Check cache
         if use_cache and config.ENABLE_VISION_CACHE:
-            cache_key = self._cache_key("vision:hashes", image_file_path)
+            cache_key = self._cache_key(f"vision:hashes:v{config.VISION_HASH_VERSION}", image_file_path)
             cached = await self._get_cached(cache_key)
             if cached:
                 logger.debug(f"Vision cache hit for image hashes: {image_file_path}")
@@ -390,7 +398,8 @@ class VisionClient(ServiceClient):
                 "phash": result.get("phash"),
                 "dhash": result.get("dhash"),
                 "ahash": result.get("ahash"),
-                "whash": result.get("whash")
+                "whash": result.get("whash"),
+                "hash_version": result.get("hash_version", 1)
             }
             
             # Cache result
@@ -406,8 +415,8 @@ class VisionClient(ServiceClient):
     
     async def calculate_image_similarity(
         self,
-        hash1: str,
-        hash2: str,
+        hash1: Union[str, Dict[str, Any]],
+        hash2: Union[str, Dict[str, Any]],
         algorithm: str = "combined",
         use_cache: bool = True
     ) -> Optional[Tuple[float, int]]:
@@ -415,24 +424,31 @@ class VisionClient(ServiceClient):
         Calculate similarity between two image hashes.
         
         Args:
-            hash1: First image hash
-            hash2: Second image hash
-            algorithm: Similarity algorithm (hamming, cosine, combined)
+            hash1: First image hash, or its full hash set for algorithm="fused"
+            hash2: Second image hash, or its full hash set for algorithm="fused"
+            algorithm: Similarity algorithm (hamming, cosine, combined, fused)
             use_cache: Whether to use Redis cache
         
         Returns:
             Tuple of (similarity_score, hamming_distance) or None if failed
         """
+        # Vision only accepts hash strings in a hash set; drop hash_version and the like
+        if isinstance(hash1, dict):
+            hash1 = fused_hash_set(hash1)
+        if isinstance(hash2, dict):
+            hash2 = fused_hash_set(hash2)
         if not hash1 or not hash2:
             return None
         
+        payload = {
+            "hashes1" if isinstance(hash1, dict) else "hash1": hash1,
+            "hashes2" if isinstance(hash2, dict) else "hash2": hash2,
+            "algorithm": algorithm
+        }
+        
         # Check cache first
         if use_cache and config.ENABLE_VISION_CACHE:
-            cache_key = self._cache_key("vision:similarity", {
-                "hash1": hash1,
-                "hash2": hash2,
-                "algorithm": algorithm
-            })
+            cache_key = self._cache_key("vision:similarity", payload)
             cached = await self._get_cached(cache_key)
             if cached:
                 logger.debug(f"Vision cache hit for similarity")
@@ -440,14 +456,7 @@ class VisionClient(ServiceClient):
         
         # Call Vision service
         try:
-            response = await self.client.post(
-                "/similarity",
-                json={
-                    "hash1": hash1,
-                    "hash2": hash2,
-                    "algorithm": algorithm
-                }
-            )
+            response = await self.client.post("/similarity", json=payload)
             response.raise_for_status()
             
             result = response.json()
@@ -468,6 +477,46 @@ class VisionClient(ServiceClient):
             logger.error(f"Vision similarity service error: {e}")
             return None
     
+    async def score_image_candidates(
+        self,
+        query_hashes: Dict[str, str],
+        candidates: List[Dict[str, Any]],
+        threshold: float = 0.0,
+        top_k: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Score one image against many using all four hashes in a single call.
+        
+        Args:
+            query_hashes: Hash set of the query image (phash, dhash, ahash, whash)
+            candidates: Candidate hash sets, each optionally with metadata
+            threshold: Minimum fused similarity
+            top_k: Maximum number of results
+        
+        Returns:
+            Results sorted by fused similarity (each with the candidate's index) or None if failed
+        """
+        if not query_hashes or not candidates:
+            return None
+        
+        try:
+            response = await self.client.post(
+                "/similarity/batch",
+                json={
+                    "query_hashes": fused_hash_set(query_hashes),
+                    "candidates": candidates,
+                    "threshold": threshold,
+                    "top_k": top_k
+                }
+            )
+            response.raise_for_status()
+            
+            return response.json().get("results", [])
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Vision batch similarity service error: {e}")
+            return None
+    
     async def find_image_matches(
         self,
         query_hash: str,
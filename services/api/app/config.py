@@ -50,6 +50,8 @@ class OptimizedConfig:
     VISION_SERVICE_TIMEOUT: int = int(os.getenv("VISION_SERVICE_TIMEOUT", "15"))  # Reduced timeout
     VISION_BATCH_SIZE: int = int(os.getenv("VISION_BATCH_SIZE", "32"))  # Increased batch size
     ENABLE_VISION_CACHE: bool = os.getenv("ENABLE_VISION_CACHE", "true").lower() == "true"
+    # The vision service's HASH_VERSION; stored hashes of other versions are recomputed
+    VISION_HASH_VERSION: int = int(os.getenv("VISION_HASH_VERSION", "2"))
     
     # ========== HTTP Client Configuration ==========
     HTTP_TIMEOUT: int = int(os.getenv("HTTP_TIMEOUT", "10"))
@@ -61,6 +63,13 @@ class OptimizedConfig:
     RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", "300"))  # 5 minutes
     ENABLE_QUERY_CACHE: bool = os.getenv("ENABLE_QUERY_CACHE", "true").lower() == "true"
     QUERY_CACHE_TTL: int = int(os.getenv("QUERY_CACHE_TTL", "600"))  # 10 minutes
+    ENABLE_PRINCIPAL_CACHE: bool = os.getenv("ENABLE_PRINCIPAL_CACHE", "true").lower() == "true"
+    PRINCIPAL_CACHE_TTL: int = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))  # Redis, 1 minute
+    PRINCIPAL_CACHE_LOCAL_TTL: int = int(os.getenv("PRINCIPAL_CACHE_LOCAL_TTL", "5"))  # In-process, bounds cross-worker staleness
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    DASHBOARD_CHART_CACHE_TTL: int = int(os.getenv("DASHBOARD_CHART_CACHE_TTL", "60"))  # 1 minute
+    ROLLUP_REFRESH_MINUTES: int = int(os.getenv("ROLLUP_REFRESH_MINUTES", "5"))  # ARQ cron interval
+    ROLLUP_WATERMARK_OVERLAP: int = int(os.getenv("ROLLUP_WATERMARK_OVERLAP", "300"))  # seconds re-scanned before the watermark
     
     # ========== Performance Configuration ==========
     ENABLE_COMPRESSION: bool = os.getenv("ENABLE_COMPRESSION", "true").lower() == "true"
@@ -70,6 +79,10 @@ class OptimizedConfig:
     # ========== Health Check Optimization ==========
     HEALTH_CHECK_CACHE_TTL: int = int(os.getenv("HEALTH_CHECK_CACHE_TTL", "30"))  # 30 seconds
     ENABLE_HEALTH_CACHE: bool = os.getenv("ENABLE_HEALTH_CACHE", "true").lower() == "true"
+    HEALTH_CHECK_TIMEOUT: float = float(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))  # per dependency, checks run concurrently
+    ENABLE_MONITORING_LOOP: bool = os.getenv("ENABLE_MONITORING_LOOP", "true").lower() == "true"
+    MONITORING_INTERVAL: float = float(os.getenv("MONITORING_INTERVAL", "30"))  # seconds between cycles
+    MONITORING_JITTER: float = float(os.getenv("MONITORING_JITTER", "0.2"))  # +/- fraction of the interval
     
     # ========== JWT Authentication ==========
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
@@ -77,6 +90,15 @@ class OptimizedConfig:
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRE_DAYS", "7"))
     
+    # ========== Password Hashing ==========
+    # Changing the Argon2 costs rehashes each password on the user's next login
+    PASSWORD_ARGON2_TIME_COST: int = int(os.getenv("PASSWORD_ARGON2_TIME_COST", "3"))
+    PASSWORD_ARGON2_MEMORY_COST: int = int(os.getenv("PASSWORD_ARGON2_MEMORY_COST", "65536"))  # KiB
+    PASSWORD_ARGON2_PARALLELISM: int = int(os.getenv("PASSWORD_ARGON2_PARALLELISM", "4"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_QUEUE_SIZE: int = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "32"))
+    PASSWORD_HASH_PER_IP_LIMIT: int = int(os.getenv("PASSWORD_HASH_PER_IP_LIMIT", "2"))
+    
     # ========== Media Storage ==========
     MEDIA_ROOT: str = os.getenv("MEDIA_ROOT", "/app/media")
     MEDIA_URL: str = os.getenv("MEDIA_URL", "/media")
@@ -92,6 +114,31 @@ class OptimizedConfig:
     MINIO_BUCKET_NAME: str = os.getenv("MINIO_BUCKET_NAME", "lost-found-media")
     MINIO_SECURE: bool = os.getenv("MINIO_SECURE", "false").lower() == "true"
     MINIO_REGION: str = os.getenv("MINIO_REGION", "us-east-1")
+    # Uploads stream to MinIO in multipart parts (S3 minimum part size is 5 MB)
+    MINIO_UPLOAD_PART_SIZE_MB: int = int(os.getenv("MINIO_UPLOAD_PART_SIZE_MB", "5"))
+    MINIO_UPLOAD_WORKERS: int = int(os.getenv("MINIO_UPLOAD_WORKERS", "8"))
+    # Host presigned URLs are signed for (reachable by clients); empty uses MINIO_ENDPOINT
+    MINIO_PUBLIC_ENDPOINT: str = os.getenv("MINIO_PUBLIC_ENDPOINT", "")
+    # Shared secret MinIO sends (Authorization: Bearer) with bucket notifications
+    MINIO_WEBHOOK_TOKEN: str = os.getenv("MINIO_WEBHOOK_TOKEN", "")
+    
+    # Derivatives rendered per photo: max edge sizes (px), formats (avif needs Pillow AVIF support)
+    MEDIA_DERIVATIVE_SIZES: List[int] = [
+        int(size) for size in os.getenv("MEDIA_DERIVATIVE_SIZES", "160,480,1080").split(",") if size.strip()
+    ]
+    MEDIA_DERIVATIVE_FORMATS: List[str] = [
+        name.strip().lower() for name in os.getenv("MEDIA_DERIVATIVE_FORMATS", "webp,avif").split(",") if name.strip()
+    ]
+    MEDIA_DERIVATIVE_QUALITY: int = int(os.getenv("MEDIA_DERIVATIVE_QUALITY", "75"))
+    
+    # Direct (presigned PUT) uploads
+    MEDIA_UPLOAD_PREFIX: str = os.getenv("MEDIA_UPLOAD_PREFIX", "uploads/")
+    MEDIA_UPLOAD_URL_TTL: int = int(os.getenv("MEDIA_UPLOAD_URL_TTL", "900"))  # seconds
+    
+    # Media garbage collection: unattached uploads are dropped after MEDIA_ORPHAN_TTL_HOURS,
+    # unreferenced blobs (and their objects) MEDIA_BLOB_GC_GRACE_HOURS after their last release
+    MEDIA_ORPHAN_TTL_HOURS: int = int(os.getenv("MEDIA_ORPHAN_TTL_HOURS", "72"))
+    MEDIA_BLOB_GC_GRACE_HOURS: int = int(os.getenv("MEDIA_BLOB_GC_GRACE_HOURS", "24"))
     
     # ========== Matching Configuration ==========
     MATCH_WEIGHT_TEXT: float = float(os.getenv("MATCH_WEIGHT_TEXT", "0.45"))
@@ -108,6 +155,19 @@ class OptimizedConfig:
     ANN_TOP_K: int = int(os.getenv("ANN_TOP_K", "50"))
     MATCH_MAX_RESULTS: int = int(os.getenv("MATCH_MAX_RESULTS", "20"))
     
+    # ========== Fraud Detection ==========
+    # ML scoring runs on a process pool; smaller batches are scored in-process
+    FRAUD_ML_WORKERS: int = int(os.getenv("FRAUD_ML_WORKERS", "1"))
+    FRAUD_ML_PROCESS_MIN_BATCH: int = int(os.getenv("FRAUD_ML_PROCESS_MIN_BATCH", "64"))
+    # Cross-report duplicates: estimated text similarity (0-1) and how long reports stay indexed
+    FRAUD_DUPLICATE_THRESHOLD: float = float(os.getenv("FRAUD_DUPLICATE_THRESHOLD", "0.8"))
+    FRAUD_DUPLICATE_WINDOW_DAYS: int = int(os.getenv("FRAUD_DUPLICATE_WINDOW_DAYS", "90"))
+    # Reports are scored by the worker in batches collected over FRAUD_SCORING_DELAY_SECONDS
+    FRAUD_SCORING_DELAY_SECONDS: int = int(os.getenv("FRAUD_SCORING_DELAY_SECONDS", "5"))
+    FRAUD_SCORING_BATCH_SIZE: int = int(os.getenv("FRAUD_SCORING_BATCH_SIZE", "500"))
+    # Trained models are saved here and reloaded by the worker (shared volume; empty disables)
+    FRAUD_MODEL_PATH: str = os.getenv("FRAUD_MODEL_PATH", "")
+    
     # ========== Pagination ==========
     DEFAULT_PAGE_SIZE: int = int(os.getenv("DEFAULT_PAGE_SIZE", "20"))
     MAX_PAGE_SIZE: int = int(os.getenv("MAX_PAGE_SIZE", "100"))
@@ -119,6 +179,10 @@ class OptimizedConfig:
     RATE_LIMIT_CREATE_REPORT: str = os.getenv("RATE_LIMIT_CREATE_REPORT", "20/hour")
     RATE_LIMIT_SEARCH: str = os.getenv("RATE_LIMIT_SEARCH", "60/minute")
     RATE_LIMIT_STORAGE: str = os.getenv("RATE_LIMIT_STORAGE", "redis")
+    # Tokens a process reserves per Redis call for hot keys (capped at limit/10; 1 disables)
+    RATE_LIMIT_LOCAL_BATCH: int = int(os.getenv("RATE_LIMIT_LOCAL_BATCH", "10"))
+    # Seconds reserved tokens stay usable before they are forfeited
+    RATE_LIMIT_LOCAL_LEASE: float = float(os.getenv("RATE_LIMIT_LOCAL_LEASE", "1.0"))
     
     # ========== Security & CORS ==========
     CORS_ORIGINS: List[str] = os.getenv(
@@ -129,9 +193,24 @@ class OptimizedConfig:
     
     ENABLE_SECURITY_HEADERS: bool = os.getenv("ENABLE_SECURITY_HEADERS", "true").lower() == "true"
     
+    # CSRF signing keys as "kid:secret" pairs, newest first; the first signs, all verify.
+    # Empty derives a single key from JWT_SECRET_KEY.
+    CSRF_SECRET_KEYS: List[str] = [
+        key.strip() for key in os.getenv("CSRF_SECRET_KEYS", "").split(",") if key.strip()
+    ]
+    CSRF_TOKEN_TTL: int = int(os.getenv("CSRF_TOKEN_TTL", "1800"))  # seconds
+    # Check revoked token ids in Redis (revocation survives until the token would expire)
+    CSRF_REVOCATION_ENABLED: bool = os.getenv("CSRF_REVOCATION_ENABLED", "true").lower() == "true"
+    
     # ========== Monitoring & Metrics ==========
     ENABLE_METRICS: bool = os.getenv("ENABLE_METRICS", "true").lower() == "true"
     METRICS_PORT: int = int(os.getenv("METRICS_PORT", "9090"))
+    # Latency histogram buckets (seconds), dense around the 300 ms read / 1 s write SLOs
+    HTTP_LATENCY_BUCKETS: List[float] = [
+        float(bucket) for bucket in os.getenv(
+            "HTTP_LATENCY_BUCKETS", "0.025,0.05,0.1,0.2,0.3,0.5,0.75,1,1.5,2.5,5,10"
+        ).split(",")
+    ]
     
     # ========== Admin Panel ==========
     ADMIN_SESSION_SECRET: str = os.getenv("ADMIN_SESSION_SECRET", "change-in-production")
@@ -149,6 +228,12 @@ class OptimizedConfig:
     # ========== Feature Flags ==========
     ENABLE_WEBSOCKETS: bool = os.getenv("ENABLE_WEBSOCKETS", "false").lower() == "true"
     ENABLE_AUDIT_LOG: bool = os.getenv("ENABLE_AUDIT_LOG", "true").lower() == "true"
+    AUDIT_LOG_BUFFERED: bool = os.getenv("AUDIT_LOG_BUFFERED", "true").lower() == "true"
+    AUDIT_LOG_BATCH_SIZE: int = int(os.getenv("AUDIT_LOG_BATCH_SIZE", "200"))
+    AUDIT_LOG_FLUSH_INTERVAL: float = float(os.getenv("AUDIT_LOG_FLUSH_INTERVAL", "1.0"))  # seconds
+    AUDIT_LOG_MAX_BUFFER: int = int(os.getenv("AUDIT_LOG_MAX_BUFFER", "10000"))
+    BULK_OPERATION_MAX_IDS: int = int(os.getenv("BULK_OPERATION_MAX_IDS", "5000"))
+    BULK_OPERATION_CHUNK_SIZE: int = int(os.getenv("BULK_OPERATION_CHUNK_SIZE", "1000"))
     
     # ========== Timeouts ==========
     REQUEST_TIMEOUT: int = int(os.getenv("REQUEST_TIMEOUT", "15"))  # Reduced timeout
@@ -174,6 +259,51 @@ class OptimizedConfig:
         if not cls.VISION_SERVICE_URL.startswith(("http://", "https://")):
             errors.append("VISION_SERVICE_URL must be a valid HTTP(S) URL")
         
+        if cls.PASSWORD_HASH_WORKERS < 1:
+            errors.append("PASSWORD_HASH_WORKERS must be at least 1")
+        
+        if cls.PASSWORD_HASH_QUEUE_SIZE < 0 or cls.PASSWORD_HASH_PER_IP_LIMIT < 1:
+            errors.append("PASSWORD_HASH_QUEUE_SIZE must be >= 0 and PASSWORD_HASH_PER_IP_LIMIT >= 1")
+        
+        if not (1 <= cls.ROLLUP_REFRESH_MINUTES <= 60):
+            errors.append("ROLLUP_REFRESH_MINUTES must be between 1 and 60")
+        
+        if cls.HTTP_LATENCY_BUCKETS != sorted(set(cls.HTTP_LATENCY_BUCKETS)):
+            errors.append("HTTP_LATENCY_BUCKETS must be strictly increasing")
+        
+        for key in cls.CSRF_SECRET_KEYS:
+            kid, _, secret = key.partition(":")
+            if not kid or not secret or "." in kid:
+                errors.append("CSRF_SECRET_KEYS entries must be kid:secret with no '.' in the kid")
+                break
+        
+        if cls.MINIO_UPLOAD_PART_SIZE_MB < 5 or cls.MINIO_UPLOAD_WORKERS < 1:
+            errors.append("MINIO_UPLOAD_PART_SIZE_MB must be at least 5 and MINIO_UPLOAD_WORKERS at least 1")
+        
+        if not cls.MEDIA_DERIVATIVE_SIZES or min(cls.MEDIA_DERIVATIVE_SIZES) <= 0:
+            errors.append("MEDIA_DERIVATIVE_SIZES must list positive pixel sizes")
+        
+        if not cls.MEDIA_UPLOAD_PREFIX.endswith("/") or cls.MEDIA_UPLOAD_PREFIX.count("/") != 1:
+            errors.append("MEDIA_UPLOAD_PREFIX must be a single top-level folder ending in '/'")
+        
+        if cls.MEDIA_ORPHAN_TTL_HOURS < 1 or cls.MEDIA_BLOB_GC_GRACE_HOURS < 0:
+            errors.append("MEDIA_ORPHAN_TTL_HOURS must be at least 1 and MEDIA_BLOB_GC_GRACE_HOURS non-negative")
+        
+        if cls.FRAUD_ML_WORKERS < 1 or cls.FRAUD_ML_PROCESS_MIN_BATCH < 1:
+            errors.append("FRAUD_ML_WORKERS and FRAUD_ML_PROCESS_MIN_BATCH must be at least 1")
+        
+        if not 0 < cls.FRAUD_DUPLICATE_THRESHOLD <= 1 or cls.FRAUD_DUPLICATE_WINDOW_DAYS < 1:
+            errors.append("FRAUD_DUPLICATE_THRESHOLD must be in (0, 1] and FRAUD_DUPLICATE_WINDOW_DAYS at least 1")
+        
+        if cls.FRAUD_SCORING_DELAY_SECONDS < 1 or cls.FRAUD_SCORING_BATCH_SIZE < 1:
+            errors.append("FRAUD_SCORING_DELAY_SECONDS and FRAUD_SCORING_BATCH_SIZE must be at least 1")
+        
+        if cls.RATE_LIMIT_LOCAL_BATCH < 1 or cls.RATE_LIMIT_LOCAL_LEASE <= 0:
+            errors.append("RATE_LIMIT_LOCAL_BATCH must be at least 1 and RATE_LIMIT_LOCAL_LEASE positive")
+        
+        if cls.MONITORING_INTERVAL <= 0 or not (0 <= cls.MONITORING_JITTER < 1):
+            errors.append("MONITORING_INTERVAL must be positive and MONITORING_JITTER in [0, 1)")
+        
         # Validate match weights sum to ~1.0
         total_weight = (
             cls.MATCH_WEIGHT_TEXT +
@@ -238,12 +368,14 @@ class OptimizedConfig:
                 "max_concurrent_requests": cls.MAX_CONCURRENT_REQUESTS,
                 "response_cache": cls.ENABLE_RESPONSE_CACHE,
                 "query_cache": cls.ENABLE_QUERY_CACHE,
+                "principal_cache": cls.ENABLE_PRINCIPAL_CACHE,
             },
             "features": {
                 "metrics": cls.ENABLE_METRICS,
                 "rate_limit": cls.ENABLE_RATE_LIMIT,
                 "admin_panel": cls.ENABLE_ADMIN_PANEL,
                 "audit_log": cls.ENABLE_AUDIT_LOG,
+                "audit_log_buffered": cls.AUDIT_LOG_BUFFERED,
             },
             "matching": {
                 "weights": {
@@ -1,163 +1,182 @@
-"""CSRF protection implementation for the Lost & Found API."""
+"""CSRF protection implementation for the Lost & Found API.
 
+Tokens are stateless: each one is signed with HMAC-SHA256 over its key id,
+issue time, a random nonce, the session cookie and the user id, so any
+worker can validate it without shared memory and it expires on its own after
+CSRF_TOKEN_TTL. Signing keys rotate through CSRF_SECRET_KEYS (the first signs,
+all verify). Revoked tokens are remembered in Redis only until they would
+have expired anyway.
+"""
+
+import base64
 import secrets
 import hashlib
 import hmac
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+import logging
+import time
+from typing import Optional, Dict, Any, List, Tuple
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
 
 from .config import config
-from .exceptions import ValidationError, AuthenticationError
+
+logger = logging.getLogger(__name__)
+
+# Cookies a token can be bound to: the admin panel's and the legacy one
+SESSION_COOKIES = ("admin_session", "session_id")
+
+# Tolerated clock skew between workers for tokens issued "in the future"
+_CLOCK_SKEW = 60
+
+
+def _load_signing_keys() -> List[Tuple[str, bytes]]:
+    """Configured (kid, secret) pairs, newest first; falls back to a key derived from JWT_SECRET_KEY."""
+    if config.CSRF_SECRET_KEYS:
+        return [
+            (kid, secret.encode())
+            for kid, _, secret in (key.partition(":") for key in config.CSRF_SECRET_KEYS)
+        ]
+    base = config.JWT_SECRET_KEY or "default-csrf-secret"
+    return [("0", hmac.new(base.encode(), b"csrf", hashlib.sha256).digest())]
 
 
 class CSRFProtection:
-    """CSRF protection implementation."""
+    """Signed, self-expiring CSRF tokens with optional Redis revocation."""
     
-    def __init__(self, secret_key: str = None, token_expiry_minutes: int = 30):
-        self.secret_key = secret_key or config.JWT_SECRET_KEY or "default-csrf-secret"
-        self.token_expiry_minutes = token_expiry_minutes
-        self.session_tokens: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, keys: Optional[List[Tuple[str, bytes]]] = None, token_ttl: Optional[int] = None):
+        keys = keys or _load_signing_keys()
+        self.signing_kid, self.signing_key = keys[0]
+        self.keys: Dict[str, bytes] = dict(keys)
+        self.token_ttl = token_ttl or config.CSRF_TOKEN_TTL
+    
+    @staticmethod
+    def _message(kid: str, issued: str, nonce: str, session_id: str, user_id: Optional[str]) -> bytes:
+        return f"{kid}.{issued}.{nonce}.{session_id}.{user_id or 'anonymous'}".encode()
+    
+    @staticmethod
+    def _sign(key: bytes, message: bytes) -> str:
+        digest = hmac.new(key, message, hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
     
     def generate_csrf_token(self, session_id: str, user_id: str = None) -> str:
-        """Generate a CSRF token for a session."""
-        # Create token data
-        timestamp = datetime.utcnow().timestamp()
-        random_data = secrets.token_hex(16)
-        
-        # Create token payload
-        payload = f"{session_id}:{user_id or 'anonymous'}:{timestamp}:{random_data}"
-        
-        # Generate HMAC signature
-        signature = hmac.new(
-            self.secret_key.encode(),
-            payload.encode(),
-            hashlib.sha256
-        ).hexdigest()
-        
-        # Combine payload and signature
-        token = f"{payload}:{signature}"
-        
-        # Store token in session
-        self.session_tokens[session_id] = {
-            "token": token,
-            "user_id": user_id,
-            "created_at": datetime.utcnow(),
-            "expires_at": datetime.utcnow() + timedelta(minutes=self.token_expiry_minutes)
-        }
-        
-        return token
+        """Generate a CSRF token bound to a session (and user, if given)."""
+        issued = str(int(time.time()))
+        nonce = secrets.token_urlsafe(16)
+        signature = self._sign(
+            self.signing_key, self._message(self.signing_kid, issued, nonce, session_id, user_id)
+        )
+        return f"{self.signing_kid}.{issued}.{nonce}.{signature}"
+    
+    def decode_token(self, token: str) -> Optional[Dict[str, Any]]:
+        """Split a token into its claims; None if it is malformed or signed with an unknown key."""
+        try:
+            kid, issued, nonce, signature = token.split(".")
+            issued_at = int(issued)
+        except (AttributeError, ValueError):
+            return None
+        if kid not in self.keys:
+            return None
+        return {"kid": kid, "issued": issued, "issued_at": issued_at, "nonce": nonce, "signature": signature}
     
     def validate_csrf_token(self, session_id: str, token: str, user_id: str = None) -> bool:
-        """Validate a CSRF token."""
+        """Check signature, session/user binding and expiry. Pure HMAC, no stored state."""
         if not session_id or not token:
             return False
         
-        # Check if session exists
-        if session_id not in self.session_tokens:
+        claims = self.decode_token(token)
+        if claims is None:
             return False
         
-        session_data = self.session_tokens[session_id]
-        
-        # Check if token matches
-        if session_data["token"] != token:
+        age = time.time() - claims["issued_at"]
+        if age > self.token_ttl or age < -_CLOCK_SKEW:
             return False
         
-        # Check if token is expired
-        if datetime.utcnow() > session_data["expires_at"]:
-            # Remove expired token
-            del self.session_tokens[session_id]
+        expected = self._sign(
+            self.keys[claims["kid"]],
+            self._message(claims["kid"], claims["issued"], claims["nonce"], session_id, user_id)
+        )
+        return hmac.compare_digest(claims["signature"], expected)
+    
+    def expires_in(self, token: str) -> int:
+        """Seconds until a token expires (0 if malformed or expired)."""
+        claims = self.decode_token(token)
+        if claims is None:
+            return 0
+        return max(0, int(claims["issued_at"] + self.token_ttl - time.time()))
+    
+    @staticmethod
+    def _revocation_key(nonce: str) -> str:
+        return f"csrf:revoked:{nonce}"
+    
+    async def is_revoked(self, token: str) -> bool:
+        """Whether a (valid) token was revoked. Fails open if Redis is unavailable."""
+        if not config.CSRF_REVOCATION_ENABLED:
             return False
-        
-        # Check user ID if provided
-        if user_id and session_data["user_id"] != user_id:
+        claims = self.decode_token(token)
+        if claims is None:
+            return True
+        try:
+            from .cache import get_redis_client
+            return bool(await get_redis_client().client.exists(self._revocation_key(claims["nonce"])))
+        except Exception as e:
+            logger.warning(f"CSRF revocation check failed: {e}")
             return False
-        
-        return True
     
-    def verify_token_signature(self, token: str) -> bool:
-        """Verify the HMAC signature of a token."""
+    async def revoke_token(self, token: str) -> bool:
+        """Revoke a token for the rest of its lifetime. Returns False if there was nothing to revoke."""
+        claims = self.decode_token(token)
+        remaining = self.expires_in(token)
+        if claims is None or remaining <= 0 or not config.CSRF_REVOCATION_ENABLED:
+            return False
         try:
-            parts = token.split(":")
-            if len(parts) != 5:  # session_id:user_id:timestamp:random:signature
-                return False
-            
-            payload = ":".join(parts[:4])
-            provided_signature = parts[4]
-            
-            # Generate expected signature
-            expected_signature = hmac.new(
-                self.secret_key.encode(),
-                payload.encode(),
-                hashlib.sha256
-            ).hexdigest()
-            
-            # Compare signatures securely
-            return hmac.compare_digest(provided_signature, expected_signature)
-        
-        except Exception:
+            from .cache import get_redis_client
+            await get_redis_client().client.set(self._revocation_key(claims["nonce"]), 1, ex=remaining)
+            return True
+        except Exception as e:
+            logger.error(f"CSRF token revocation failed: {e}")
             return False
     
-    def refresh_token(self, session_id: str, user_id: str = None) -> str:
-        """Refresh a CSRF token for a session."""
-        if session_id in self.session_tokens:
-            del self.session_tokens[session_id]
-        
+    async def refresh_token(self, session_id: str, user_id: str = None, old_token: str = None) -> str:
+        """Issue a new token for a session, revoking the old one."""
+        if old_token:
+            await self.revoke_token(old_token)
         return self.generate_csrf_token(session_id, user_id)
-    
-    def revoke_token(self, session_id: str) -> bool:
-        """Revoke a CSRF token."""
-        if session_id in self.session_tokens:
-            del self.session_tokens[session_id]
-            return True
-        return False
-    
-    def cleanup_expired_tokens(self):
-        """Remove expired tokens from memory."""
-        current_time = datetime.utcnow()
-        expired_sessions = [
-            session_id for session_id, data in self.session_tokens.items()
-            if current_time > data["expires_at"]
-        ]
-        
-        for session_id in expired_sessions:
-            del self.session_tokens[session_id]
-    
-    def get_session_info(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Get session information."""
-        return self.session_tokens.get(session_id)
 
 
 # Global CSRF protection instance
 csrf_protection = CSRFProtection()
 
 
-def get_csrf_token(request: Request) -> str:
-    """Get CSRF token from request headers or generate new one."""
-    session_id = request.cookies.get("session_id")
-    if not session_id:
-        # Generate new session ID
-        session_id = secrets.token_hex(32)
-    
-    # Get user ID from JWT token if available
-    user_id = None
+def _session_id(request: Request) -> Optional[str]:
+    for cookie in SESSION_COOKIES:
+        session_id = request.cookies.get(cookie)
+        if session_id:
+            return session_id
+    return None
+
+
+def _request_user_id(request: Request) -> Optional[str]:
+    """User id from the bearer token, if any."""
     auth_header = request.headers.get("Authorization")
     if auth_header and auth_header.startswith("Bearer "):
         try:
             from .auth import decode_token
-            token = auth_header.split(" ")[1]
-            payload = decode_token(token)
-            user_id = payload.get("sub")
+            payload = decode_token(auth_header.split(" ")[1])
+            return payload.get("sub")
         except Exception:
-            pass  # Ignore JWT errors for CSRF token generation
-    
-    return csrf_protection.generate_csrf_token(session_id, user_id)
+            pass  # Ignore JWT errors for CSRF tokens
+    return None
+
+
+def get_csrf_token(request: Request) -> str:
+    """Generate a CSRF token for the request's session (a new session ID if it has none)."""
+    session_id = _session_id(request) or secrets.token_hex(32)
+    return csrf_protection.generate_csrf_token(session_id, _request_user_id(request))
 
 
-def verify_csrf_token(request: Request, token: str = None) -> bool:
-    """Verify CSRF token from request."""
-    session_id = request.cookies.get("session_id")
+async def verify_csrf_token(request: Request, token: str = None) -> bool:
+    """Verify CSRF token from request against its session cookie and bearer user."""
+    session_id = _session_id(request)
     if not session_id:
         return False
     
@@ -168,24 +187,15 @@ def verify_csrf_token(request: Request, token: str = None) -> bool:
     if not token:
         return False
     
-    # Get user ID from JWT token if available
-    user_id = None
-    auth_header = request.headers.get("Authorization")
-    if auth_header and auth_header.startswith("Bearer "):
-        try:
-            from .auth import decode_token
-            jwt_token = auth_header.split(" ")[1]
-            payload = decode_token(jwt_token)
-            user_id = payload.get("sub")
-        except Exception:
-            pass  # Ignore JWT errors for CSRF verification
+    if not csrf_protection.validate_csrf_token(session_id, token, _request_user_id(request)):
+        return False
     
-    return csrf_protection.validate_csrf_token(session_id, token, user_id)
+    return not await csrf_protection.is_revoked(token)
 
 
-def require_csrf_token(request: Request, token: str = None):
+async def require_csrf_token(request: Request, token: str = None):
     """Dependency to require valid CSRF token."""
-    if not verify_csrf_token(request, token):
+    if not await verify_csrf_token(request, token):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid or missing CSRF token"
@@ -237,7 +247,7 @@ async def csrf_middleware(request: Request, call_next):
     
     # Verify CSRF token for other endpoints
     csrf_token = request.headers.get("X-CSRF-Token")
-    if not verify_csrf_token(request, csrf_token):
+    if not await verify_csrf_token(request, csrf_token):
         return JSONResponse(
             status_code=status.HTTP_403_FORBIDDEN,
             content={
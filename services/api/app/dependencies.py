@@ -1,15 +1,42 @@
 """API dependencies for auth and database access."""
+import uuid
+from datetime import datetime
+from typing import Any, Dict
+
 from fastapi import Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy import select
+from sqlalchemy import DateTime, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .infrastructure.database.session import get_async_db
 from .auth import decode_token
+from .cache import get_cached_principal, set_cached_principal
 from .models import User
 
 security = HTTPBearer()
 
+# Columns kept in the principal cache; the password hash never leaves the database
+_PRINCIPAL_COLUMNS = [column for column in User.__table__.columns if column.key != "password"]
+
+
+def _principal_snapshot(user: User) -> Dict[str, Any]:
+    """JSON-safe snapshot of an authenticated user."""
+    return jsonable_encoder({column.key: getattr(user, column.key) for column in _PRINCIPAL_COLUMNS})
+
+
+def _principal_from_snapshot(snapshot: Dict[str, Any]) -> User:
+    """Rebuild a detached User from a cached snapshot."""
+    values = {}
+    for column in _PRINCIPAL_COLUMNS:
+        value = snapshot.get(column.key)
+        if value is not None and column.key == "id":
+            value = uuid.UUID(value)
+        elif value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        values[column.key] = value
+    return User(**values)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -33,6 +60,11 @@ async def get_current_user(
             detail="Invalid authentication credentials"
         )
     
+    # Only active users are cached, and deactivation invalidates the entry
+    principal = await get_cached_principal(user_id)
+    if principal is not None:
+        return _principal_from_snapshot(principal)
+    
     result = await db.execute(select(User).where(User.id == user_id, User.is_active == True))
     user = result.scalar_one_or_none()
     if user is None:
@@ -41,6 +73,7 @@ async def get_current_user(
             detail="User not found or inactive"
         )
     
+    await set_cached_principal(user_id, _principal_snapshot(user))
     return user
 
 
@@ -67,13 +100,13 @@ async def get_current_admin_dev(
         user = result.scalar_one_or_none()
         if user is None:
             # Create test admin user
-            from .auth import get_password_hash
+            from .auth import get_password_hash_async
             user = User(
                 email="admin@example.com",
                 display_name="Admin User",
                 role="admin",
                 is_active=True,
-                password=get_password_hash("Admin123")
+                password=await get_password_hash_async("Admin123")
             )
             db.add(user)
             await db.commit()
@@ -0,0 +1,141 @@
+"""
+Image Derivatives
+=================
+Resized WebP/AVIF renditions of uploaded photos, so list views download a
+small thumbnail instead of the original.
+
+The original is decoded once (JPEGs in draft mode, which lets libjpeg scale
+down by up to 8x while decoding), then each size is resized from the
+previous, larger one. Every rendition is stored under a key derived from
+its own SHA-256, so identical outputs share one object and can be cached
+forever. A small grayscale copy is produced for perceptual hashing, so the
+vision service never has to receive the original.
+"""
+import hashlib
+import io
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from PIL import Image, ImageOps
+
+from .config import config
+
+try:
+    import pillow_avif  # noqa: F401  (registers AVIF on Pillow < 11.2)
+except ImportError:
+    pass
+
+logger = logging.getLogger(__name__)
+
+_FORMATS = {
+    "webp": ("WEBP", "image/webp", {"method": 4}),
+    "avif": ("AVIF", "image/avif", {"speed": 6}),
+}
+
+# Edge of the grayscale image sent for perceptual hashing (hashes downscale further)
+HASH_INPUT_SIZE = 256
+
+
+def available_formats() -> List[str]:
+    """Configured derivative formats this Pillow build can encode."""
+    Image.init()
+    return [
+        name for name in config.MEDIA_DERIVATIVE_FORMATS
+        if name in _FORMATS and _FORMATS[name][0] in Image.SAVE
+    ]
+
+
+def derivative_key(digest: str, extension: str) -> str:
+    """Content-addressed object key for a rendition."""
+    return f"derivatives/{digest[:2]}/{digest}.{extension}"
+
+
+@dataclass
+class DerivativeSet:
+    """Output of build_derivatives: rendition metadata plus the encoded bytes to store."""
+    width: int
+    height: int
+    derivatives: List[Dict[str, Any]] = field(default_factory=list)
+    blobs: Dict[str, Tuple[bytes, str]] = field(default_factory=dict)  # key -> (data, content type)
+    hash_input: bytes = b""
+
+
+def build_derivatives(data: bytes) -> DerivativeSet:
+    """
+    Decode an image once and encode every configured size/format (CPU-bound; run in a thread).
+
+    Raises:
+        PIL.UnidentifiedImageError / OSError: if the data is not a decodable image
+    """
+    sizes = sorted(config.MEDIA_DERIVATIVE_SIZES, reverse=True)
+    formats = available_formats()
+    image, width, height = _decode(data)
+
+    result = DerivativeSet(width=width, height=height)
+    current = image
+    for size in sizes:
+        current = current.copy()
+        current.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+        for name in formats:
+            pil_format, content_type, options = _FORMATS[name]
+            buffer = io.BytesIO()
+            current.save(buffer, pil_format, quality=config.MEDIA_DERIVATIVE_QUALITY, **options)
+            encoded = buffer.getvalue()
+            digest = hashlib.sha256(encoded).hexdigest()
+            key = derivative_key(digest, name)
+
+            result.blobs[key] = (encoded, content_type)
+            result.derivatives.append({
+                "size": size,
+                "format": name,
+                "key": key,
+                "width": current.width,
+                "height": current.height,
+                "bytes": len(encoded),
+                "content_type": content_type,
+            })
+
+    result.hash_input = _hash_input(image)
+
+    return result
+
+
+def build_hash_input(data: bytes) -> bytes:
+    """
+    Only the grayscale hash input of an image (CPU-bound; run in a thread),
+    decoded as build_derivatives does so both yield the same hashes.
+    """
+    image, _, _ = _decode(data)
+    return _hash_input(image)
+
+
+def _decode(data: bytes) -> Tuple[Image.Image, int, int]:
+    """Upright RGB(A) image at the working scale, with the original's upright size."""
+    largest = max(config.MEDIA_DERIVATIVE_SIZES)
+    with Image.open(io.BytesIO(data)) as source:
+        width, height = source.size
+        # JPEG only: decode at the smallest 1/2^n scale still >= the largest rendition
+        source.draft("RGB", (largest, largest))
+        decoded = source.size
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+    if image.size != decoded:
+        # EXIF orientation turned the image sideways
+        width, height = height, width
+    return image, width, height
+
+
+def _hash_input(image: Image.Image) -> bytes:
+    hash_image = image.convert("L")
+    hash_image.thumbnail((HASH_INPUT_SIZE, HASH_INPUT_SIZE), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    hash_image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def pick_thumbnail(derivatives: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Smallest rendition, preferring WebP for client compatibility."""
+    return min(derivatives, key=lambda item: (item["size"], item["format"] != "webp"))
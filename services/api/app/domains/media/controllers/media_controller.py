@@ -5,20 +5,30 @@ FastAPI controller for the Media domain.
 Handles HTTP requests and responses for media operations.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Request, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+import hmac
 import logging
 import uuid
 import os
+from urllib.parse import unquote_plus
 from datetime import datetime
 
 from ....infrastructure.database.session import get_async_db
 from ....infrastructure.monitoring.metrics import get_metrics_collector
 from ....dependencies import get_current_user
 from ....models import User
-from ....storage import get_minio_client, generate_object_name, validate_file_type
+from ....storage import (
+    get_minio_client, generate_object_name, validate_file_type,
+    iter_upload_chunks, UploadTooLargeError,
+)
 from ....config import config
+from ....schemas import DirectUploadRequest, DirectUploadResponse
+from ....media_uploads import (
+    UploadStatus, create_upload_session, enqueue_upload_processing,
+    get_upload_session, upload_id_from_object,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -43,9 +53,8 @@ async def upload_media(
                 detail="Invalid file type. Only images are allowed."
             )
         
-        # Check file size
-        file_content = await file.read()
-        if len(file_content) > config.MAX_FILE_SIZE:
+        # Reject early when the multipart part reports its size
+        if file.size is not None and file.size > config.MAX_FILE_SIZE:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"File too large. Maximum size is {config.MAX_FILE_SIZE} bytes."
@@ -56,20 +65,21 @@ async def upload_media(
         file_extension = os.path.splitext(file.filename)[1] if file.filename else '.jpg'
         object_name = generate_object_name(f"{file_id}{file_extension}")
         
-        # Upload to MinIO
+        # Stream to MinIO in chunks; the size limit is enforced mid-stream too
         minio_client = get_minio_client()
-        
-        # Convert bytes to BytesIO for MinIO
-        import io
-        data_stream = io.BytesIO(file_content)
-        
-        upload_result = minio_client.upload_data(
-            data=data_stream,
-            object_name=object_name,
-            bucket_name=config.MINIO_BUCKET_NAME,
-            content_type=file.content_type,
-            length=len(file_content)
-        )
+        try:
+            upload_result = await minio_client.upload_stream(
+                iter_upload_chunks(file),
+                object_name=object_name,
+                bucket_name=config.MINIO_BUCKET_NAME,
+                content_type=file.content_type,
+                max_size=config.MAX_FILE_SIZE
+            )
+        except UploadTooLargeError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File too large. Maximum size is {config.MAX_FILE_SIZE} bytes."
+            )
         
         if not upload_result.get("success", False):
             raise HTTPException(
@@ -86,8 +96,9 @@ async def upload_media(
             "message": "File uploaded successfully",
             "file_id": file_id,
             "filename": file.filename,
-            "size": len(file_content),
+            "size": upload_result["size"],
             "content_type": file.content_type,
+            "sha256": upload_result["sha256"],
             "url": file_url,
             "uploaded_at": datetime.utcnow().isoformat()
         }
@@ -102,6 +113,129 @@ async def upload_media(
         )
 
 
+@router.post("/uploads", response_model=DirectUploadResponse)
+async def create_direct_upload(
+    upload_request: DirectUploadRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Start a direct-to-storage upload.
+    
+    Returns a presigned PUT URL; the client uploads the file there with the
+    given headers, then calls /uploads/{upload_id}/complete.
+    """
+    if not validate_file_type(upload_request.content_type):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file type. Only images are allowed."
+        )
+    
+    try:
+        session = await create_upload_session(
+            str(current_user.id),
+            upload_request.content_type,
+            upload_request.size,
+            upload_request.filename
+        )
+    except Exception as e:
+        logger.error(f"Failed to create upload session: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Storage is unavailable"
+        )
+    
+    return DirectUploadResponse(
+        upload_id=session["upload_id"],
+        upload_url=session["upload_url"],
+        headers={"Content-Type": upload_request.content_type},
+        object_name=session["object_name"],
+        expires_in=config.MEDIA_UPLOAD_URL_TTL
+    )
+
+
+async def _get_owned_upload(upload_id: str, current_user: User) -> dict:
+    session = await get_upload_session(upload_id)
+    if session is None or session["owner_id"] != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found"
+        )
+    return session
+
+
+@router.post("/uploads/{upload_id}/complete")
+async def complete_direct_upload(
+    upload_id: str = Path(..., description="Upload ID"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Report that the file was PUT to storage; hashing and thumbnailing run in the worker.
+    """
+    session = await _get_owned_upload(upload_id, current_user)
+    if session["status"] == UploadStatus.PENDING:
+        await enqueue_upload_processing(session)
+    
+    return {
+        "upload_id": upload_id,
+        "object_name": session["object_name"],
+        "status": session["status"]
+    }
+
+
+@router.get("/uploads/{upload_id}")
+async def get_direct_upload(
+    upload_id: str = Path(..., description="Upload ID"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the processing status of a direct upload.
+    """
+    session = await _get_owned_upload(upload_id, current_user)
+    return {
+        "upload_id": upload_id,
+        "object_name": session["object_name"],
+        "status": session["status"],
+        "error": session.get("error"),
+        "media_id": session.get("media_id"),
+        "thumbnail_object": session.get("thumbnail_object")
+    }
+
+
+@router.post("/uploads/events", include_in_schema=False)
+async def direct_upload_events(request: Request):
+    """
+    MinIO bucket notification webhook (s3:ObjectCreated:*) for direct uploads.
+    
+    Authenticated with MINIO_WEBHOOK_TOKEN; disabled when it is not set.
+    """
+    expected = config.MINIO_WEBHOOK_TOKEN
+    provided = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not expected or not hmac.compare_digest(provided, expected):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid webhook token"
+        )
+    
+    event = await request.json()
+    enqueued = 0
+    for record in event.get("Records", []):
+        if not record.get("eventName", "").startswith("s3:ObjectCreated:"):
+            continue
+        object_name = unquote_plus(record.get("s3", {}).get("object", {}).get("key", ""))
+        upload_id = upload_id_from_object(object_name)
+        if upload_id is None:
+            continue
+        
+        session = await get_upload_session(upload_id)
+        if session is None or session["object_name"] != object_name:
+            continue
+        if session["status"] == UploadStatus.PENDING:
+            await enqueue_upload_processing(session)
+            enqueued += 1
+    
+    return {"enqueued": enqueued}
+
+
 @router.get("/{file_id}")
 async def get_media(
     file_id: str = Path(..., description="File ID"),
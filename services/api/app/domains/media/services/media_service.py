@@ -19,6 +19,7 @@ from ..schemas.media_schemas import (
 from ..repositories.media_repository import MediaRepository
 from ..models.media import Media
 from app.storage import MinIOClient
+from app.media_blobs import cleanup_orphaned_media
 from app.config import config
 
 logger = logging.getLogger(__name__)
@@ -343,15 +344,18 @@ class MediaService:
     
     async def cleanup_orphaned_media(self) -> Tuple[bool, int, Optional[str]]:
         """
-        Clean up orphaned media records (media not associated with any report).
+        Clean up orphaned media records (media not associated with any report)
+        and garbage-collect content blobs no longer referenced, with their
+        originals and derivatives in MinIO (see app.media_blobs).
         
         Returns:
             Tuple of (success, cleaned_count, error_message)
         """
         try:
-            cleaned_count = await self.repository.cleanup_orphaned_media()
+            cleaned = await cleanup_orphaned_media(self.db)
+            cleaned_count = cleaned["orphaned_media"]
             
-            logger.info(f"Cleaned up {cleaned_count} orphaned media records")
+            logger.info(f"Cleaned up {cleaned_count} orphaned media records, {cleaned['blobs_deleted']} blobs")
             return True, cleaned_count, None
             
         except Exception as e:
@@ -5,7 +5,7 @@ FastAPI controller for the Reports domain.
 Handles HTTP requests and responses for report operations.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import logging
@@ -18,6 +18,7 @@ from ..schemas.report_schemas import (
 from ....infrastructure.database.session import get_async_db
 from ....infrastructure.monitoring.metrics import get_metrics_collector
 from ....dependencies import get_current_user
+from ....job_queue import schedule_fraud_scoring
 from ....models import User
 
 logger = logging.getLogger(__name__)
@@ -28,6 +29,7 @@ router = APIRouter(tags=["reports"])
 @router.post("/", response_model=ReportResponse, status_code=status.HTTP_201_CREATED)
 async def create_report(
     report_data: ReportCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_db),
     metrics = Depends(get_metrics_collector)
@@ -41,6 +43,7 @@ async def create_report(
     try:
         service = ReportDomainService(db, metrics)
         report = await service.create_report(report_data, str(current_user.id))
+        background_tasks.add_task(schedule_fraud_scoring, [report.id])
         
         logger.info(f"Report created successfully: {report.id}")
         return report
@@ -135,6 +138,7 @@ async def get_report(
 async def update_report(
     report_id: str = Path(..., description="Report ID"),
     update_data: ReportUpdate = None,
+    background_tasks: BackgroundTasks = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_db),
     metrics = Depends(get_metrics_collector)
@@ -154,6 +158,7 @@ async def update_report(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Report not found"
             )
+        background_tasks.add_task(schedule_fraud_scoring, [report.id])
         
         logger.info(f"Report updated successfully: {report_id}")
         return report
@@ -7,12 +7,12 @@ Following Domain-Driven Design principles.
 
 from sqlalchemy import Column, String, Integer, DateTime, Float, Boolean, ForeignKey, Text, Enum as SQLEnum, ARRAY
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from pgvector.sqlalchemy import Vector
 import enum
 import uuid as uuid_pkg
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, List
 
 from ....infrastructure.database.base import Base
@@ -81,6 +81,7 @@ class Report(Base):
     safety_status = Column(String)
     is_safe = Column(Boolean, default=True)
     is_resolved = Column(Boolean, default=False)
+    resolved_at = Column(DateTime(timezone=True), index=True)  # First resolution; buckets the resolved_reports rollup
     moderation_notes = Column(Text)
     
     # Media and Processing
@@ -101,6 +102,16 @@ class Report(Base):
     def __repr__(self):
         return f"<Report(id='{self.id}', type='{self.type}', title='{self.title}')>"
     
+    @validates("is_resolved")
+    def _stamp_resolution(self, key, value):
+        """
+        Record when the report was first resolved. Kept if it is reopened and
+        resolved again, so it stays counted on one day of the rollup.
+        """
+        if value and self.resolved_at is None:
+            self.resolved_at = datetime.now(timezone.utc)
+        return value
+    
     def is_active(self) -> bool:
         """Check if report is active (approved and not removed)."""
         return self.status == ReportStatus.APPROVED.value
@@ -6,7 +6,8 @@ Handles HTTP requests and responses for user operations with proper validation,
 error handling, and business logic separation.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query, Path, Body, BackgroundTasks
+from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_
 from typing import List, Optional, Dict, Any
@@ -18,6 +19,7 @@ from ....infrastructure.database.session import get_async_db
 from ....infrastructure.monitoring.metrics import get_metrics_collector
 from ....dependencies import get_current_user
 from ....models import User
+from ....exceptions import RateLimitError, ServiceUnavailableError
 from ..schemas.user_schemas import (
     UserCreate, UserUpdate, UserProfile, UserStats, 
     PrivacySettings, PasswordChange, UserSearch,
@@ -122,6 +124,7 @@ async def update_current_user_profile(
 @router.post("/me/change-password")
 async def change_password(
     password_data: PasswordChange,
+    request: Request,
     current_user: User = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service),
     metrics = Depends(get_metrics_collector)
@@ -137,7 +140,7 @@ async def change_password(
     """
     try:
         success, error = await user_service.change_password(
-            str(current_user.id), password_data
+            str(current_user.id), password_data, get_remote_address(request)
         )
         
         if not success:
@@ -151,7 +154,7 @@ async def change_password(
             "message": "Password changed successfully"
         }
         
-    except HTTPException:
+    except (HTTPException, RateLimitError, ServiceUnavailableError):
         raise
     except Exception as e:
         logger.error(f"Error changing password: {e}")
@@ -302,6 +305,7 @@ async def request_data_export(
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user_account(
     deletion_data: AccountDeletion,
+    request: Request,
     current_user: User = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service),
     metrics = Depends(get_metrics_collector)
@@ -318,7 +322,7 @@ async def delete_user_account(
     try:
         # Verify password before deletion
         success, user, error = await user_service.verify_user_credentials(
-            current_user.email, deletion_data.password
+            current_user.email, deletion_data.password, get_remote_address(request)
         )
         
         if not success:
@@ -339,7 +343,7 @@ async def delete_user_account(
         # Return 204 No Content
         return None
         
-    except HTTPException:
+    except (HTTPException, RateLimitError, ServiceUnavailableError):
         raise
     except Exception as e:
         logger.error(f"Error deleting user account: {e}")
@@ -13,6 +13,7 @@ import logging
 from datetime import datetime, timedelta
 import uuid
 
+from app.cache import invalidate_principal
 from app.models import User
 from ..schemas.user_schemas import (
     UserCreate, UserUpdate, UserProfile, UserStats, 
@@ -137,6 +138,7 @@ class UserRepository:
             
             await self.db.commit()
             await self.db.refresh(user)
+            await invalidate_principal(user_id)
             
             logger.info(f"User updated successfully: {user.email}")
             return user
@@ -225,6 +227,7 @@ class UserRepository:
             
             result = await self.db.execute(query)
             await self.db.commit()
+            await invalidate_principal(user_id)
             
             if result.rowcount > 0:
                 logger.info(f"User deactivated: {user_id}")
@@ -250,6 +253,7 @@ class UserRepository:
             query = delete(User).where(User.id == user_id)
             result = await self.db.execute(query)
             await self.db.commit()
+            await invalidate_principal(user_id)
             
             if result.rowcount > 0:
                 logger.info(f"User deleted permanently: {user_id}")
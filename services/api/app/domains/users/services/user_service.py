@@ -11,7 +11,6 @@ from datetime import datetime, timedelta
 import hashlib
 import secrets
 import uuid
-from passlib.context import CryptContext
 
 from ..schemas.user_schemas import (
     UserCreate, UserUpdate, UserProfile, UserStats, 
@@ -19,13 +18,12 @@ from ..schemas.user_schemas import (
     UserRole, UserStatus, PrivacyLevel
 )
 from ..repositories.user_repository import UserRepository
+from app.auth import get_password_hash_async, verify_and_update_password_async
+from app.exceptions import RateLimitError, ServiceUnavailableError
 from app.models import User
 
 logger = logging.getLogger(__name__)
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 class UserService:
     """Service layer for user business logic."""
@@ -34,24 +32,29 @@ class UserService:
         self.db = db
         self.repository = UserRepository(db)
     
-    def _hash_password(self, password: str) -> str:
-        """Hash password using bcrypt."""
-        return pwd_context.hash(password)
+    async def _hash_password(self, password: str, client_ip: Optional[str] = None) -> str:
+        """Hash password on the shared password hashing pool."""
+        return await get_password_hash_async(password, client_ip)
     
-    def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Verify password against hash."""
-        return pwd_context.verify(plain_password, hashed_password)
+    async def _verify_password(
+        self, plain_password: str, hashed_password: str, client_ip: Optional[str] = None
+    ) -> Tuple[bool, Optional[str]]:
+        """Verify password against hash, returning a replacement hash if it is outdated."""
+        return await verify_and_update_password_async(plain_password, hashed_password, client_ip)
     
     def _generate_api_key(self) -> str:
         """Generate a secure API key."""
         return secrets.token_urlsafe(32)
     
-    async def create_user(self, user_data: UserCreate) -> Tuple[bool, Optional[User], Optional[str]]:
+    async def create_user(
+        self, user_data: UserCreate, client_ip: Optional[str] = None
+    ) -> Tuple[bool, Optional[User], Optional[str]]:
         """
         Create a new user with comprehensive validation.
         
         Args:
             user_data: User creation data
+            client_ip: Requesting client, for the password hashing limits
             
         Returns:
             Tuple of (success, user_instance, error_message)
@@ -63,7 +66,7 @@ class UserService:
                 return False, None, "Email already exists"
             
             # Hash password
-            hashed_password = self._hash_password(user_data.password)
+            hashed_password = await self._hash_password(user_data.password, client_ip)
             
             # Create user
             user = await self.repository.create_user(user_data, hashed_password)
@@ -73,6 +76,8 @@ class UserService:
             
         except ValueError as e:
             return False, None, str(e)
+        except (RateLimitError, ServiceUnavailableError):
+            raise
         except Exception as e:
             logger.error(f"User creation failed: {e}")
             return False, None, "Failed to create user"
@@ -158,13 +163,16 @@ class UserService:
             logger.error(f"Error updating user profile {user_id}: {e}")
             return False, None, "Failed to update user profile"
     
-    async def change_password(self, user_id: str, password_data: PasswordChange) -> Tuple[bool, Optional[str]]:
+    async def change_password(
+        self, user_id: str, password_data: PasswordChange, client_ip: Optional[str] = None
+    ) -> Tuple[bool, Optional[str]]:
         """
         Change user password with proper validation.
         
         Args:
             user_id: User UUID string
             password_data: Password change data
+            client_ip: Requesting client, for the password hashing limits
             
         Returns:
             Tuple of (success, error_message)
@@ -176,11 +184,12 @@ class UserService:
                 return False, "User not found"
             
             # Verify current password
-            if not self._verify_password(password_data.current_password, user.password):
+            valid, _ = await self._verify_password(password_data.current_password, user.password, client_ip)
+            if not valid:
                 return False, "Current password is incorrect"
             
             # Hash new password
-            hashed_password = self._hash_password(password_data.new_password)
+            hashed_password = await self._hash_password(password_data.new_password, client_ip)
             
             # Update password
             success = await self.repository.update_password(user_id, hashed_password)
@@ -190,6 +199,8 @@ class UserService:
             logger.info(f"Password changed for user: {user.email}")
             return True, None
             
+        except (RateLimitError, ServiceUnavailableError):
+            raise
         except Exception as e:
             logger.error(f"Error changing password for {user_id}: {e}")
             return False, "Failed to change password"
@@ -321,13 +332,16 @@ class UserService:
             logger.error(f"Error deleting user account {user_id}: {e}")
             return False, "Failed to delete user account"
     
-    async def verify_user_credentials(self, email: str, password: str) -> Tuple[bool, Optional[User], Optional[str]]:
+    async def verify_user_credentials(
+        self, email: str, password: str, client_ip: Optional[str] = None
+    ) -> Tuple[bool, Optional[User], Optional[str]]:
         """
         Verify user credentials for authentication.
         
         Args:
             email: User email
             password: Plain text password
+            client_ip: Requesting client, for the password hashing limits
             
         Returns:
             Tuple of (success, user_instance, error_message)
@@ -343,14 +357,21 @@ class UserService:
                 return False, None, "Account is deactivated"
             
             # Verify password
-            if not self._verify_password(password, user.password):
+            valid, new_hash = await self._verify_password(password, user.password, client_ip)
+            if not valid:
                 return False, None, "Invalid credentials"
             
+            # Hash parameters changed since this password was stored
+            if new_hash:
+                await self.repository.update_password(str(user.id), new_hash)
+            
             # Update last login
             await self.repository.update_last_login(str(user.id))
             
             return True, user, None
             
+        except (RateLimitError, ServiceUnavailableError):
+            raise
         except Exception as e:
             logger.error(f"Error verifying credentials for {email}: {e}")
             return False, None, "Authentication failed"
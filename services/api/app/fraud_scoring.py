@@ -0,0 +1,223 @@
+"""
+Background fraud scoring
+========================
+Reports are scored by the worker shortly after they are created or edited,
+so moderators read stored results instead of waiting for an analysis run.
+
+app.job_queue.schedule_fraud_scoring adds report ids to a Redis set and
+enqueues one score_fraud_task job per FRAUD_SCORING_DELAY_SECONDS window (the
+window is the job id), so a burst of new reports is analyzed as one batch. The job
+drains the set FRAUD_SCORING_BATCH_SIZE ids at a time: reports are loaded
+with their photos' perceptual hashes in two queries, run through
+batch_analyze_reports and upserted into fraud_detection_results (one row per
+report; review status survives re-scoring) in one statement.
+
+The job also runs every few minutes to pick up recent reports whose result
+is missing or older than their last edit (ids lost while Redis was down).
+"""
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache import get_redis_client
+from .config import config
+from .domains.reports.models.report import Report
+from .job_queue import FRAUD_PENDING_KEY
+from .models import FraudDetectionLog, FraudDetectionResult, Media
+from .services.fraud_detection_service import FraudDetectionResult as AnalysisResult, fraud_detection_service
+
+logger = logging.getLogger(__name__)
+
+# Recently edited reports checked for a missing or outdated result
+SWEEP_WINDOW = timedelta(days=1)
+
+_models_mtime: Optional[float] = None
+
+
+def _report_uuids(report_ids: Iterable[Any]) -> List[uuid.UUID]:
+    ids = []
+    for report_id in report_ids:
+        try:
+            ids.append(uuid.UUID(str(report_id)))
+        except ValueError:
+            logger.warning(f"Skipping fraud scoring for invalid report id {report_id!r}")
+    return ids
+
+
+def report_analysis_data(report: Report, photo_hashes: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Input of FraudDetectionService for a report and its photos' perceptual hashes."""
+    return {
+        'id': report.id,
+        'owner_id': str(report.owner_id) if report.owner_id else None,
+        'title': report.title,
+        'description': report.description,
+        'type': report.type,
+        'category': report.category,
+        'is_urgent': report.is_urgent,
+        'reward_offered': report.reward_offered,
+        'reward_amount': report.reward_amount,
+        'contact_info': report.contact_info,
+        'location_city': report.location_city,
+        'location_address': report.location_address,
+        'latitude': report.latitude,
+        'longitude': report.longitude,
+        'images': report.images or [],
+        'image_hashes': (report.image_hashes or []) + (photo_hashes or []),
+        'created_at': report.created_at.isoformat() if report.created_at else None
+    }
+
+
+async def load_report_data(db: AsyncSession, report_ids: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Analysis input for the listed reports that exist, in two queries."""
+    ids = _report_uuids(report_ids)
+    if not ids:
+        return []
+
+    reports = (await db.scalars(select(Report).where(Report.id.in_(ids)))).all()
+
+    photo_hashes: Dict[str, List[str]] = {}
+    rows = await db.execute(
+        select(Media.report_id, Media.phash_hex).where(
+            Media.report_id.in_([str(report.id) for report in reports]),
+            Media.phash_hex.isnot(None)
+        )
+    )
+    for report_id, phash_hex in rows:
+        photo_hashes.setdefault(report_id, []).append(phash_hex)
+
+    return [report_analysis_data(report, photo_hashes.get(str(report.id))) for report in reports]
+
+
+async def store_fraud_results(db: AsyncSession, results: List[AnalysisResult], triggered_by: str = "system") -> int:
+    """
+    Upsert analysis results (one row per report) and log them, in one
+    statement each. Failed analyses are skipped rather than overwriting the
+    last good score. Does not commit.
+    """
+    results = [result for result in results if "analysis_error" not in result.flags]
+    if not results:
+        return 0
+
+    statement = pg_insert(FraudDetectionResult).values([
+        {
+            "id": uuid.uuid4(),
+            "report_id": result.report_id,
+            "fraud_score": result.fraud_score,
+            "risk_level": result.risk_level,
+            "confidence": result.confidence,
+            "flags": result.flags,
+            "details": result.details,
+            "model_version": result.model_version,
+            "detected_at": result.detected_at,
+        }
+        for result in results
+    ])
+    rescored = ("fraud_score", "risk_level", "confidence", "flags", "details", "model_version", "detected_at")
+    statement = statement.on_conflict_do_update(
+        index_elements=[FraudDetectionResult.report_id],
+        set_={**{name: statement.excluded[name] for name in rescored}, "updated_at": func.now()},
+    ).returning(FraudDetectionResult.report_id, FraudDetectionResult.id)
+    result_ids = {str(report_id): result_id for report_id, result_id in await db.execute(statement)}
+
+    await db.execute(insert(FraudDetectionLog), [
+        {
+            "id": uuid.uuid4(),
+            "report_id": result.report_id,
+            "detection_result_id": result_ids.get(str(result.report_id)),
+            "analysis_type": "automatic",
+            "action_type": "auto_detection",
+            "triggered_by": triggered_by,
+            "final_score": result.fraud_score,
+            "final_risk_level": result.risk_level,
+            "action_details": {
+                "fraud_score": result.fraud_score,
+                "risk_level": result.risk_level.value,
+                "flags_count": len(result.flags),
+                "model_version": result.model_version
+            },
+            "model_version": result.model_version,
+        }
+        for result in results
+    ])
+    return len(results)
+
+
+def refresh_models() -> None:
+    """Load the models last saved by publish_models, if they changed."""
+    global _models_mtime
+    if not config.FRAUD_MODEL_PATH:
+        return
+    try:
+        mtime = os.stat(config.FRAUD_MODEL_PATH).st_mtime
+    except FileNotFoundError:
+        return
+    if mtime != _models_mtime:
+        fraud_detection_service.load_models(config.FRAUD_MODEL_PATH)
+        _models_mtime = mtime
+
+
+def publish_models() -> None:
+    """Save the trained models where the worker loads them from (blocking; run in a thread)."""
+    if not config.FRAUD_MODEL_PATH:
+        return
+    # Written aside and renamed, so a loading worker never sees a partial file
+    staging = f"{config.FRAUD_MODEL_PATH}.tmp"
+    fraud_detection_service.save_models(staging)
+    os.replace(staging, config.FRAUD_MODEL_PATH)
+
+
+async def score_reports(db: AsyncSession, report_ids: Iterable[Any]) -> int:
+    """Analyze the listed reports as one batch and store the results. Commits."""
+    await asyncio.to_thread(refresh_models)
+
+    report_data = await load_report_data(db, report_ids)
+    if not report_data:
+        return 0
+
+    results = await fraud_detection_service.batch_analyze_reports(report_data)
+    stored = await store_fraud_results(db, results)
+    await db.commit()
+    return stored
+
+
+async def score_pending_reports(db: AsyncSession) -> Dict[str, int]:
+    """
+    Score queued reports in batches, then one batch of recent reports whose
+    result is missing or older than their last edit.
+    """
+    client = get_redis_client().client
+    queued = 0
+    while True:
+        report_ids = await client.spop(FRAUD_PENDING_KEY, config.FRAUD_SCORING_BATCH_SIZE)
+        if not report_ids:
+            break
+        try:
+            queued += await score_reports(db, report_ids)
+        except Exception:
+            await db.rollback()
+            await client.sadd(FRAUD_PENDING_KEY, *report_ids)
+            raise
+
+    since = datetime.now(timezone.utc) - SWEEP_WINDOW
+    stale_ids = (
+        await db.scalars(
+            select(Report.id)
+            .outerjoin(FraudDetectionResult, FraudDetectionResult.report_id == Report.id)
+            .where(
+                Report.updated_at >= since,
+                or_(FraudDetectionResult.id.is_(None), FraudDetectionResult.detected_at < Report.updated_at),
+            )
+            .limit(config.FRAUD_SCORING_BATCH_SIZE)
+        )
+    ).all()
+    swept = await score_reports(db, stale_ids) if stale_ids else 0
+
+    logger.info(f"Fraud scoring: {queued} queued and {swept} missed reports scored")
+    return {"queued": queued, "swept": swept}
@@ -1,10 +1,27 @@
 """Helper functions for audit logging."""
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+import asyncio
+import logging
+import threading
 import uuid
 
-from .models import AuditLog
+from .config import config
+from .models import AuditLog, User
+
+logger = logging.getLogger(__name__)
+
+
+def _actor_email_value(user_id: str, actor_email: str = None):
+    """Actor email to store, looked up inside the INSERT when the caller has none."""
+    if actor_email is not None:
+        return actor_email
+    return select(User.email).where(User.id == user_id).scalar_subquery()
 
 
 def create_audit_log(
@@ -13,7 +30,8 @@ def create_audit_log(
     action: str,
     resource_type: str = None,
     resource_id: str = None,
-    details: str = None
+    details: str = None,
+    actor_email: str = None
 ) -> AuditLog:
     """
     Create an audit log entry (synchronous version).
@@ -25,13 +43,18 @@ def create_audit_log(
         resource_type: Type of resource affected (e.g., "report", "match")
         resource_id: ID of affected resource
         details: Optional JSON string with additional details
+        actor_email: Email of the acting user; looked up from user_id if omitted
     
     Returns:
-        Created audit log entry
+        Created audit log entry (unsaved until the next flush when buffered)
     """
+    if audit_log_writer.running:
+        return audit_log_writer.enqueue(user_id, action, resource_type, resource_id, details, actor_email)
+    
     audit_log = AuditLog(
         id=str(uuid.uuid4()),
         user_id=user_id,
+        actor_email=_actor_email_value(user_id, actor_email),
         action=action,
         resource_type=resource_type,
         resource_id=resource_id,
@@ -51,7 +74,8 @@ async def create_audit_log_async(
     action: str,
     resource_type: str = None,
     resource_id: str = None,
-    details: str = None
+    details: str = None,
+    actor_email: str = None
 ) -> AuditLog:
     """
     Create an audit log entry (asynchronous version).
@@ -63,13 +87,18 @@ async def create_audit_log_async(
         resource_type: Type of resource affected (e.g., "report", "match")
         resource_id: ID of affected resource
         details: Optional JSON string with additional details
+        actor_email: Email of the acting user; looked up from user_id if omitted
     
     Returns:
-        Created audit log entry
+        Created audit log entry (unsaved until the next flush when buffered)
     """
+    if audit_log_writer.running:
+        return audit_log_writer.enqueue(user_id, action, resource_type, resource_id, details, actor_email)
+    
     audit_log = AuditLog(
         id=str(uuid.uuid4()),
         user_id=user_id,
+        actor_email=_actor_email_value(user_id, actor_email),
         action=action,
         resource_type=resource_type,
         resource_id=resource_id,
@@ -81,3 +110,213 @@ async def create_audit_log_async(
     await db.refresh(audit_log)
     
     return audit_log
+
+
+async def create_audit_logs_async(db: AsyncSession, entries: List[Dict[str, Any]]) -> None:
+    """
+    Create many audit log entries at once (asynchronous version).
+    
+    Entries take the keyword arguments of create_audit_log_async. They are
+    buffered when the audit log writer is running; otherwise they are added
+    to the caller's transaction as one multi-row INSERT, committed by the caller.
+    
+    Args:
+        db: Async database session
+        entries: Audit entries (user_id, action, resource_type, resource_id, details, actor_email)
+    """
+    if not entries:
+        return
+    
+    if audit_log_writer.running:
+        for entry in entries:
+            audit_log_writer.enqueue(**entry)
+        return
+    
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": entry["user_id"],
+            "actor_email": entry.get("actor_email"),
+            "action": entry["action"],
+            "resource_type": entry.get("resource_type"),
+            "resource_id": entry.get("resource_id"),
+            "details": entry.get("details"),
+            "created_at": now,
+        }
+        for entry in entries
+    ]
+    await db.execute(insert(AuditLog), rows)
+
+
+class AuditLogWriter:
+    """
+    Buffers audit log entries and writes them in batches off the request path.
+    
+    Entries are flushed with one multi-row INSERT when AUDIT_LOG_BATCH_SIZE
+    entries are waiting or every AUDIT_LOG_FLUSH_INTERVAL seconds, whichever
+    comes first. enqueue() is thread-safe so sync routes running in the
+    threadpool can use it too. stop() flushes everything still buffered.
+    
+    A batch that fails because the database is unreachable is retried on
+    the next flush. Any other failure means some entry can't be written:
+    the batch is retried row by row and the entries that still fail are
+    logged in full and dropped, so one bad entry can't stall the buffer.
+    A write interrupted by cancellation puts its batch back before the
+    CancelledError propagates.
+    """
+    
+    def __init__(self):
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+    
+    def enqueue(
+        self,
+        user_id: Any,
+        action: str,
+        resource_type: str = None,
+        resource_id: str = None,
+        details: str = None,
+        actor_email: str = None
+    ) -> AuditLog:
+        """Buffer an audit entry and return it as an unsaved AuditLog."""
+        entry = {
+            "id": str(uuid.uuid4()),
+            "user_id": uuid.UUID(str(user_id)) if user_id is not None else None,
+            "actor_email": actor_email,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": str(resource_id) if resource_id is not None else None,
+            "details": details,
+            "created_at": datetime.now(timezone.utc),
+        }
+        
+        with self._lock:
+            self._buffer.append(entry)
+            if len(self._buffer) > config.AUDIT_LOG_MAX_BUFFER:
+                dropped = self._buffer.popleft()
+                logger.error(f"Audit log buffer full, dropped entry: {dropped['action']} ({dropped['id']})")
+            should_flush = len(self._buffer) >= config.AUDIT_LOG_BATCH_SIZE
+        
+        if should_flush and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        
+        return AuditLog(**entry)
+    
+    async def start(self) -> None:
+        """Start the background flush loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+        logger.info("Audit log writer started")
+    
+    async def stop(self) -> None:
+        """Stop the flush loop and write out everything still buffered."""
+        if not self.running:
+            return
+        # Let the loop finish the flush it may be in rather than cancelling the write
+        self._stopping = True
+        self._wakeup.set()
+        task, self._task = self._task, None
+        try:
+            await task
+        except Exception as e:
+            logger.error(f"Audit log flush loop failed: {e}")
+        
+        while self._buffer:
+            if not await self.flush():
+                logger.error(f"Audit log writer stopped with {len(self._buffer)} unwritten entries")
+                break
+        self._loop = None
+        logger.info("Audit log writer stopped")
+    
+    async def flush(self) -> bool:
+        """Write up to AUDIT_LOG_BATCH_SIZE buffered entries; False if the write failed."""
+        async with self._flush_lock:
+            with self._lock:
+                batch = [self._buffer.popleft() for _ in range(min(len(self._buffer), config.AUDIT_LOG_BATCH_SIZE))]
+            if not batch:
+                return True
+            
+            try:
+                await self._write(batch)
+                return True
+            except asyncio.CancelledError:
+                self._requeue(batch)
+                raise
+            except Exception as e:
+                logger.error(f"Audit log flush of {len(batch)} entries failed: {e}")
+                if _is_unavailable(e):
+                    self._requeue(batch)
+                    return False
+            
+            for index, entry in enumerate(batch):
+                try:
+                    await self._write([entry])
+                except asyncio.CancelledError:
+                    self._requeue(batch[index:])
+                    raise
+                except Exception as e:
+                    if _is_unavailable(e):
+                        self._requeue(batch[index:])
+                        return False
+                    logger.error(f"Audit log entry dropped after failing to write ({e}): {entry}")
+            return True
+    
+    def _requeue(self, batch: List[Dict[str, Any]]) -> None:
+        # Put the entries back in order so the next flush retries them
+        with self._lock:
+            self._buffer.extendleft(reversed(batch))
+    
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=config.AUDIT_LOG_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            
+            # Drain full batches; stop early if the database is refusing writes
+            while self._buffer and not self._stopping:
+                if not await self.flush() or len(self._buffer) < config.AUDIT_LOG_BATCH_SIZE:
+                    break
+    
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        from .infrastructure.database.session import async_session_local
+        
+        async with async_session_local() as session:
+            # Fill in missing actor emails with one lookup for the whole batch
+            missing = {entry["user_id"] for entry in batch if entry["actor_email"] is None and entry["user_id"]}
+            if missing:
+                result = await session.execute(select(User.id, User.email).where(User.id.in_(missing)))
+                emails = {row[0]: row[1] for row in result.all()}
+                for entry in batch:
+                    if entry["actor_email"] is None:
+                        entry["actor_email"] = emails.get(entry["user_id"])
+            
+            await session.execute(insert(AuditLog), batch)
+            await session.commit()
+
+
+def _is_unavailable(error: Exception) -> bool:
+    """Whether a write failed because the database couldn't be reached, rather than on the data."""
+    if isinstance(error, (OperationalError, InterfaceError, OSError)):
+        return True
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+
+# Global audit log writer, started by the API lifespan when AUDIT_LOG_BUFFERED
+audit_log_writer = AuditLogWriter()
@@ -4,14 +4,98 @@ Infrastructure Monitoring and Metrics
 Monitoring and metrics collection for the infrastructure layer.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import re
 import time
 import logging
 from prometheus_client import Counter, Histogram, Gauge, CollectorRegistry
+from starlette.requests import Request
+
+from ...config import config
 
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# HTTP REQUEST METRICS
+# ============================================================================
+# Labelled by route template and a fixed method set so series count is bounded
+# by the number of routes, not by the ids that appear in URLs.
+
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+UNMATCHED_ROUTE = "unmatched"
+TRACEPARENT_PATTERN = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-[0-9a-f]{16}-[0-9a-f]{2}$")
+
+REQUEST_COUNT = Counter(
+    'http_requests_total',
+    'Total HTTP requests',
+    ['method', 'endpoint', 'status']
+)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency',
+    ['method', 'endpoint'],
+    buckets=config.HTTP_LATENCY_BUCKETS
+)
+
+
+def route_label(request: Request) -> str:
+    """Matched route template (e.g. /api/v1/reports/{report_id}); read after routing."""
+    route = request.scope.get("route")
+    if route is not None:
+        return getattr(route, "path_format", None) or route.path
+    if request.scope.get("endpoint") is not None:
+        # Mounted sub-application such as /metrics
+        return request.scope.get("root_path") or "/"
+    return UNMATCHED_ROUTE
+
+
+def method_label(method: str) -> str:
+    return method if method in HTTP_METHODS else "OTHER"
+
+
+def trace_exemplar(request: Request) -> Optional[Dict[str, str]]:
+    """Trace id from a W3C traceparent or X-Request-ID header, as a Prometheus exemplar."""
+    match = TRACEPARENT_PATTERN.match(request.headers.get("traceparent", ""))
+    if match:
+        return {"trace_id": match.group(1)}
+
+    request_id = request.headers.get("x-request-id")
+    if request_id and len(request_id) <= 64:
+        return {"trace_id": request_id}
+
+    return None
+
+
+def observe_request(method: str, endpoint: str, status_code: int, duration: float,
+                    exemplar: Optional[Dict[str, str]] = None):
+    """Record one request; endpoint must already be a route template."""
+    method = method_label(method)
+    REQUEST_COUNT.labels(method=method, endpoint=endpoint, status=str(status_code)).inc(exemplar=exemplar)
+    REQUEST_LATENCY.labels(method=method, endpoint=endpoint).observe(duration, exemplar=exemplar)
+
+
+def request_latency_summary() -> List[Dict[str, Any]]:
+    """Per-route request count and mean latency, read from the latency histogram."""
+    totals: Dict[tuple, Dict[str, float]] = {}
+    for metric in REQUEST_LATENCY.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count") or sample.name.endswith("_sum"):
+                key = (sample.labels["method"], sample.labels["endpoint"])
+                totals.setdefault(key, {})[sample.name.rsplit("_", 1)[1]] = sample.value
+
+    return [
+        {
+            "method": method,
+            "endpoint": endpoint,
+            "count": int(values.get("count", 0)),
+            "avg": values.get("sum", 0.0) / values["count"] if values.get("count") else 0.0,
+        }
+        for (method, endpoint), values in totals.items()
+    ]
+
+
 class MetricsCollector:
     """
     Metrics collector for application monitoring.
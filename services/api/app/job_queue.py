@@ -0,0 +1,60 @@
+"""
+ARQ job queue connection shared by the API and the worker for enqueueing.
+
+Kept apart from app.worker so enqueueing from a request doesn't import the
+worker module (its database engine and logging setup). Kept free of model
+imports too: routers import schedule_fraud_scoring from here, and
+app.fraud_scoring (imported by the worker) loads the reports domain, whose
+controller would otherwise import it back while it is half-initialised.
+"""
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from arq import create_pool
+from arq.connections import ArqRedis, RedisSettings
+
+from .cache import get_redis_client
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# Report ids waiting for score_fraud_task
+FRAUD_PENDING_KEY = "fraud:pending"
+
+# Global ARQ pool
+_redis_pool = None
+
+
+async def get_redis_pool() -> ArqRedis:
+    """Get or create Redis pool for job enqueueing."""
+    global _redis_pool
+    if _redis_pool is None:
+        _redis_pool = await create_pool(
+            RedisSettings.from_dsn(config.ARQ_REDIS_URL)
+        )
+    return _redis_pool
+
+
+async def schedule_fraud_scoring(report_ids: Iterable[Any]) -> None:
+    """
+    Queue reports for background scoring. Never raises: reports that can't be
+    queued are picked up by the periodic sweep.
+    """
+    report_ids = [str(report_id) for report_id in report_ids]
+    if not report_ids:
+        return
+    try:
+        await get_redis_client().client.sadd(FRAUD_PENDING_KEY, *report_ids)
+
+        delay = config.FRAUD_SCORING_DELAY_SECONDS
+        window = int(time.time() // delay) + 1
+        pool = await get_redis_pool()
+        await pool.enqueue_job(
+            "score_fraud_task",
+            _job_id=f"fraud-scoring:{window}",
+            _defer_until=datetime.fromtimestamp(window * delay, tz=timezone.utc),
+        )
+    except Exception as e:
+        logger.warning(f"Failed to schedule fraud scoring for {len(report_ids)} reports: {e}")
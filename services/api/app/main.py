@@ -31,27 +31,25 @@ from .infrastructure.database.session import (
     init_database,
     db_metrics
 )
+from .auth import shutdown_password_executor
 from .cache import get_redis_client
-from .storage import get_minio_client
-from .infrastructure.monitoring.metrics import get_metrics_collector
+from . import rate_limit  # noqa: F401  (registers the gcra+redis limits storage)
+from .helpers import audit_log_writer
+from .monitoring_system import monitoring_system
+from .storage import get_minio_client, shutdown_upload_executor
+from .services.fraud_detection_service import shutdown_inference_executor
+from .infrastructure.monitoring.metrics import (
+    get_metrics_collector,
+    observe_request,
+    route_label,
+    trace_exemplar,
+)
 
 # Setup logging
 logging.basicConfig(level=getattr(logging, optimized_config.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
-# Prometheus metrics
-REQUEST_COUNT = Counter(
-    'http_requests_total',
-    'Total HTTP requests',
-    ['method', 'endpoint', 'status']
-)
-
-REQUEST_LATENCY = Histogram(
-    'http_request_duration_seconds',
-    'HTTP request latency',
-    ['method', 'endpoint']
-)
-
+# Prometheus metrics (request count/latency live in infrastructure.monitoring.metrics)
 MATCH_LATENCY = Histogram(
     'matching_duration_seconds',
     'Matching pipeline duration'
@@ -183,6 +181,14 @@ async def lifespan(app: FastAPI):
         services["vision"] = "unavailable"
         logger.warning(f"⚠️ Vision service connection failed: {e}")
     
+    # Buffer audit log writes off the request path
+    if optimized_config.AUDIT_LOG_BUFFERED:
+        await audit_log_writer.start()
+    
+    # Periodic system metrics and health checks, on this event loop's pools
+    if optimized_config.ENABLE_MONITORING_LOOP:
+        await monitoring_system.start_monitoring()
+    
     logger.info("✅ Optimized API Service startup complete")
     
     yield
@@ -190,9 +196,18 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🛑 Shutting down Optimized Lost & Found API Service...")
     
+    await monitoring_system.stop_monitoring()
+    
+    # Write out buffered audit entries before the database goes away
+    await audit_log_writer.stop()
+    
     # Log final metrics
     db_stats = db_metrics.get_stats()
     logger.info(f"📊 Final database metrics: {db_stats}")
+    
+    shutdown_password_executor()
+    shutdown_upload_executor()
+    shutdown_inference_executor()
 
 
 app = FastAPI(
@@ -247,11 +262,13 @@ app = FastAPI(
 # Register exception handlers
 register_exception_handlers(app)
 
-# Rate limiter with optimized configuration
+# Rate limiter: with Redis, slowapi shares the GCRA Lua engine of check_rate_limit
+# (the gcra+ scheme is registered by app.rate_limit)
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=[],
-    storage_uri=optimized_config.REDIS_URL if optimized_config.ENABLE_RATE_LIMIT and optimized_config.RATE_LIMIT_STORAGE == "redis" else "memory://"
+    strategy="sliding-window-counter",
+    storage_uri=f"gcra+{optimized_config.REDIS_URL}" if optimized_config.ENABLE_RATE_LIMIT and optimized_config.RATE_LIMIT_STORAGE == "redis" else "memory://"
 )
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
@@ -294,17 +311,14 @@ async def optimized_metrics_middleware(request: Request, call_next):
     response = await call_next(request)
     duration = time.time() - start_time
     
-    # Record metrics
-    REQUEST_COUNT.labels(
-        method=request.method,
-        endpoint=request.url.path,
-        status=response.status_code
-    ).inc()
-    
-    REQUEST_LATENCY.labels(
-        method=request.method,
-        endpoint=request.url.path
-    ).observe(duration)
+    # Record metrics against the matched route template, not the raw path
+    observe_request(
+        request.method,
+        route_label(request),
+        response.status_code,
+        duration,
+        exemplar=trace_exemplar(request)
+    )
     
     # Note: Response caching requires intercepting the response before it's sent
     # This is complex with async generators, so we'll skip automatic response caching
@@ -356,7 +370,7 @@ async def clear_response_cache():
 # Optimized health check endpoint
 @app.get("/health")
 async def health_root():
-    """Optimized health check endpoint with caching."""
+    """Health check endpoint; dependency results are cached by the monitoring loop."""
     health_status = {
         "status": "ok",
         "service": "api-optimized",
@@ -372,55 +386,20 @@ async def health_root():
         }
     }
     
-    # Use cached database health check
-    db_health = await check_database_health()
-    health_status["database"] = db_health
-    if db_health["status"] != "healthy":
-        health_status["status"] = "degraded"
+    # Served from the monitoring loop's last run while it is fresh
+    checks = (await monitoring_system.health_checker.get_health_status())["checks"]
     
-    # Check Redis health
-    try:
-        redis_client = get_redis_client()
-        redis_health = await redis_client.health_check()
-        health_status["redis"] = redis_health
-        if redis_health["status"] != "healthy":
+    for name in ("database", "redis", "minio"):
+        result = checks.get(name, {"status": "unhealthy", "error": "Health check did not run"})
+        health_status[name] = result
+        if result.get("status") != "healthy":
             health_status["status"] = "degraded"
-    except Exception as e:
-        health_status["redis"] = {"status": "unhealthy", "error": str(e)}
-        health_status["status"] = "degraded"
     
-    # Check MinIO health
-    try:
-        minio_client = get_minio_client()
-        if minio_client:
-            minio_health = minio_client.health_check()
-            health_status["minio"] = minio_health
-            if minio_health["status"] != "healthy":
-                health_status["status"] = "degraded"
-        else:
-            health_status["minio"] = {"status": "unhealthy", "error": "MinIO client not available"}
-            health_status["status"] = "degraded"
-    except Exception as e:
-        health_status["minio"] = {"status": "unhealthy", "error": str(e)}
-        health_status["status"] = "degraded"
-    
-    # Check external services with optimized timeouts
+    # External services don't degrade the API's own status
     services = {}
-    try:
-        import httpx
-        async with httpx.AsyncClient(timeout=optimized_config.HTTP_TIMEOUT) as client:
-            response = await client.get(f"{optimized_config.NLP_SERVICE_URL}/health")
-            services["nlp"] = "healthy" if response.status_code == 200 else "unhealthy"
-    except Exception:
-        services["nlp"] = "unavailable"
-    
-    try:
-        import httpx
-        async with httpx.AsyncClient(timeout=optimized_config.HTTP_TIMEOUT) as client:
-            response = await client.get(f"{optimized_config.VISION_SERVICE_URL}/health")
-            services["vision"] = "healthy" if response.status_code == 200 else "unhealthy"
-    except Exception:
-        services["vision"] = "unavailable"
+    for name in ("nlp", "vision"):
+        result = checks.get(name, {})
+        services[name] = result.get("status") if result.get("status") in ("healthy", "unhealthy") else "unavailable"
     
     health_status["external_services"] = services
     
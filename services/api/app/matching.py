@@ -246,9 +246,9 @@ class EnhancedMatchingService:
             if not hashes1 or not hashes2:
                 return 0.0
             
-            # Calculate similarity using pHash (most reliable)
+            # Fuse all four hashes; pHash alone misses crops and re-encodes
             similarity_result = await self.vision_client.calculate_image_similarity(
-                hashes1["phash"], hashes2["phash"], algorithm="combined"
+                hashes1, hashes2, algorithm="fused"
             )
             
             if similarity_result:
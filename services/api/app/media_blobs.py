@@ -0,0 +1,256 @@
+"""
+Content-addressed media storage
+===============================
+Each distinct photo is stored once, under a key derived from the SHA-256 of
+its bytes, with one media_blobs row holding its derivatives and perceptual
+hashes. Media rows point at their blob through content_hash and the blob
+counts them (ref_count), so a photo re-uploaded to several reports (scam
+reposts, mostly) is stored, thumbnailed and hashed only the first time.
+
+Counts only change inside the transaction that adds or removes the Media
+row. Garbage collection (cleanup_orphaned_media, run daily by the worker)
+drops direct uploads never attached to a report, then deletes blobs that
+have had no references for MEDIA_BLOB_GC_GRACE_HOURS, objects first. It
+locks the rows it collects, so an upload reusing a blob either sees it
+before collection (and keeps it alive) or waits and stores a fresh copy.
+"""
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import case, column, delete, exists, func, select, true, update
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import config
+from .derivatives import DerivativeSet
+from .models import Media, MediaBlob
+from .storage import get_minio_client
+
+logger = logging.getLogger(__name__)
+
+# Blobs collected (and objects deleted) per transaction
+GC_BATCH_SIZE = 500
+
+# Fields a processed blob shares with every Media row that references it
+_SHARED_FIELDS = ("width", "height", "phash_hex", "dhash_hex", "hash_version", "derivatives")
+
+
+def blob_object_name(content_hash: str, extension: str = "") -> str:
+    """Content-addressed object key for an original."""
+    return f"originals/{content_hash[:2]}/{content_hash}{extension}"
+
+
+def blob_metadata(derived: DerivativeSet, hashes: Optional[dict]) -> Dict[str, Any]:
+    """Shared fields of a blob from its rendered derivatives and vision hashes."""
+    return {
+        "width": derived.width,
+        "height": derived.height,
+        "derivatives": derived.derivatives,
+        "phash_hex": (hashes or {}).get("phash"),
+        "dhash_hex": (hashes or {}).get("dhash"),
+        "hash_version": (hashes or {}).get("hash_version"),
+    }
+
+
+def apply_blob(media: Media, blob: MediaBlob) -> None:
+    """Copy a blob's shared fields onto a Media row."""
+    for name in _SHARED_FIELDS:
+        setattr(media, name, getattr(blob, name))
+
+
+async def acquire_blob(
+    db: AsyncSession,
+    content_hash: str,
+    object_name: str,
+    mime_type: str,
+    size_bytes: int,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> MediaBlob:
+    """
+    Take one reference on the blob for content_hash, creating it if needed.
+
+    metadata (from blob_metadata) marks the blob processed when it isn't yet.
+    A returned blob with processed_at unset has no stored derivatives: the
+    caller must store them (and the original) before relying on it. The row
+    stays locked until the caller's transaction ends; does not commit.
+    """
+    values = {
+        "content_hash": content_hash,
+        "object_name": object_name,
+        "mime_type": mime_type,
+        "size_bytes": size_bytes,
+        "ref_count": 1,
+    }
+    if metadata is not None:
+        values.update(metadata, processed_at=func.now())
+
+    statement = pg_insert(MediaBlob).values(**values)
+    unprocessed = MediaBlob.processed_at.is_(None)
+    fill = {}
+    if metadata is not None:
+        fill = {
+            name: case((unprocessed, statement.excluded[name]), else_=getattr(MediaBlob, name))
+            for name in _SHARED_FIELDS
+        }
+        fill["processed_at"] = func.coalesce(MediaBlob.processed_at, statement.excluded.processed_at)
+    statement = statement.on_conflict_do_update(
+        index_elements=[MediaBlob.content_hash],
+        set_={"ref_count": MediaBlob.ref_count + 1, "released_at": None, **fill},
+    ).returning(MediaBlob)
+
+    return (
+        await db.scalars(statement, execution_options={"populate_existing": True})
+    ).one()
+
+
+async def release_blobs(db: AsyncSession, content_hashes: Iterable[Optional[str]]) -> None:
+    """
+    Drop one reference per listed hash (repeat a hash to drop several).
+
+    Blobs reaching zero are stamped with released_at for the collector.
+    Does not commit.
+    """
+    counts = Counter(content_hash for content_hash in content_hashes if content_hash)
+    by_count: Dict[int, List[str]] = defaultdict(list)
+    for content_hash, count in counts.items():
+        by_count[count].append(content_hash)
+
+    for count, hashes in by_count.items():
+        await db.execute(
+            update(MediaBlob)
+            .where(MediaBlob.content_hash.in_(hashes))
+            .values(
+                ref_count=MediaBlob.ref_count - count,
+                released_at=case(
+                    (MediaBlob.ref_count - count <= 0, func.now()),
+                    else_=MediaBlob.released_at,
+                ),
+            )
+        )
+
+
+async def attach_media(db: AsyncSession, report_id: str, media_ids: List[str]) -> int:
+    """Attach unattached photos to a report, so the orphan cleanup keeps them. Does not commit."""
+    if not media_ids:
+        return 0
+    result = await db.execute(
+        update(Media)
+        .where(Media.id.in_(media_ids), Media.report_id.is_(None))
+        .values(report_id=report_id)
+    )
+    return result.rowcount
+
+
+async def delete_orphaned_media(db: AsyncSession) -> int:
+    """
+    Delete photos never attached to a report within MEDIA_ORPHAN_TTL_HOURS
+    and release their blobs. Does not commit.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=config.MEDIA_ORPHAN_TTL_HOURS)
+    result = await db.execute(
+        delete(Media)
+        .where(Media.report_id.is_(None), Media.created_at < cutoff)
+        .returning(Media.content_hash)
+    )
+    content_hashes = result.scalars().all()
+    await release_blobs(db, content_hashes)
+    return len(content_hashes)
+
+
+async def delete_report_media(db: AsyncSession, report_id: str) -> int:
+    """Delete a report's photos and release their blobs. Does not commit."""
+    result = await db.execute(
+        delete(Media).where(Media.report_id == str(report_id)).returning(Media.content_hash)
+    )
+    content_hashes = result.scalars().all()
+    await release_blobs(db, content_hashes)
+    return len(content_hashes)
+
+
+async def _referenced_derivative_keys(db: AsyncSession, keys: Set[str]) -> Set[str]:
+    """Keys still listed by a remaining blob or photo (identical renditions share a key)."""
+    referenced: Set[str] = set()
+    for model in (MediaBlob, Media):
+        element = (
+            func.jsonb_array_elements(model.derivatives)
+            .table_valued(column("value", JSONB))
+            .render_derived("element")
+        )
+        key = element.c.value["key"].astext
+        referenced.update(
+            (await db.execute(
+                select(key).select_from(model).join(element, true()).where(key.in_(keys)).distinct()
+            )).scalars()
+        )
+    return referenced
+
+
+async def collect_unreferenced_blobs(db: AsyncSession, limit: int = GC_BATCH_SIZE) -> Tuple[int, List[str]]:
+    """
+    Delete up to `limit` blob rows unreferenced for the grace period.
+
+    Rows being acquired concurrently are skipped (SKIP LOCKED) and the rest
+    stay locked until the caller's transaction ends.
+
+    Returns:
+        (blobs deleted, object keys they owned: originals and unshared derivatives)
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=config.MEDIA_BLOB_GC_GRACE_HOURS)
+    blobs = (
+        await db.scalars(
+            select(MediaBlob)
+            .where(
+                MediaBlob.ref_count <= 0,
+                MediaBlob.released_at < cutoff,
+                ~exists().where(Media.content_hash == MediaBlob.content_hash),
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+    ).all()
+    if not blobs:
+        return 0, []
+
+    await db.execute(
+        delete(MediaBlob).where(MediaBlob.content_hash.in_([blob.content_hash for blob in blobs]))
+    )
+
+    derivative_keys = {item["key"] for blob in blobs for item in blob.derivatives or []}
+    derivative_keys -= await _referenced_derivative_keys(db, derivative_keys)
+    return len(blobs), [blob.object_name for blob in blobs] + sorted(derivative_keys)
+
+
+async def cleanup_orphaned_media(db: AsyncSession) -> Dict[str, int]:
+    """
+    Delete orphaned photos, then garbage-collect unreferenced blobs and their
+    MinIO objects in batches. Commits as it goes; a batch whose objects can't
+    all be deleted is rolled back and retried on the next run.
+    """
+    orphans = await delete_orphaned_media(db)
+    await db.commit()
+
+    blobs = objects = 0
+    minio = get_minio_client()
+    while True:
+        collected, object_names = await collect_unreferenced_blobs(db)
+        if not collected:
+            await db.rollback()
+            break
+
+        # Objects go before the rows commit, so a concurrent upload that
+        # recreates the blob can never have its fresh objects deleted
+        failed = await asyncio.to_thread(minio.delete_files, object_names)
+        if failed:
+            await db.rollback()
+            logger.error(f"Media GC stopped: {len(failed)} objects could not be deleted")
+            break
+
+        await db.commit()
+        blobs += collected
+        objects += len(object_names)
+
+    logger.info(f"Media cleanup: {orphans} orphaned photos, {blobs} blobs, {objects} objects deleted")
+    return {"orphaned_media": orphans, "blobs_deleted": blobs, "objects_deleted": objects}
@@ -0,0 +1,157 @@
+"""
+Direct-to-storage media uploads
+===============================
+Clients upload image bytes straight to MinIO with a presigned PUT instead of
+sending them through the API:
+
+1. ``POST /v1/media/uploads`` validates the declared type/size, records an
+   upload session in Redis and returns a presigned PUT URL.
+2. The client PUTs the file to MinIO.
+3. Either the client calls ``POST /v1/media/uploads/{id}/complete`` or a MinIO
+   bucket notification hits ``POST /v1/media/uploads/events``; both enqueue
+   the same ARQ job (deduplicated by job id).
+4. The worker checks the stored object against the session (a presigned PUT
+   cannot enforce size or type), then records it against its content blob
+   (app.media_blobs), hashing and thumbnailing only content not seen before.
+5. Ready uploads are attached to the report they are submitted with; the
+   rest are garbage-collected after MEDIA_ORPHAN_TTL_HOURS.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from pathlib import PurePosixPath
+from typing import Any, Dict, List, Optional
+
+from .cache import get_redis_client
+from .config import config
+from .job_queue import get_redis_pool
+from .storage import get_minio_client
+
+logger = logging.getLogger(__name__)
+
+# How long finished sessions stay readable for status polling
+_SESSION_TTL_AFTER_UPLOAD = 24 * 3600
+
+_EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp"}
+
+
+class UploadStatus:
+    PENDING = "pending"  # URL issued, object not seen yet
+    PROCESSING = "processing"  # Object uploaded, worker job enqueued
+    READY = "ready"
+    REJECTED = "rejected"
+
+
+def _session_key(upload_id: str) -> str:
+    return f"media_upload:{upload_id}"
+
+
+def upload_job_id(upload_id: str) -> str:
+    """ARQ job id, so the completion call and the bucket event enqueue one job."""
+    return f"media-upload:{upload_id}"
+
+
+def upload_id_from_object(object_name: str) -> Optional[str]:
+    """Upload id encoded in an object key issued by create_upload_session, if any."""
+    path = PurePosixPath(object_name)
+    if f"{path.parent}/" != config.MEDIA_UPLOAD_PREFIX:
+        return None
+    try:
+        return str(uuid.UUID(path.stem))
+    except ValueError:
+        return None
+
+
+async def get_upload_session(upload_id: str) -> Optional[Dict[str, Any]]:
+    return await get_redis_client().get(_session_key(upload_id))
+
+
+async def save_upload_session(session: Dict[str, Any], ttl: int = _SESSION_TTL_AFTER_UPLOAD) -> None:
+    session["updated_at"] = datetime.utcnow().isoformat()
+    await get_redis_client().set(_session_key(session["upload_id"]), session, ttl)
+
+
+async def create_upload_session(owner_id: str, content_type: str, size: int, filename: Optional[str]) -> Dict[str, Any]:
+    """
+    Record an upload session and presign a PUT URL for it.
+
+    The caller validates content_type and size against the configured limits.
+
+    Returns:
+        The session, including upload_url
+    """
+    upload_id = str(uuid.uuid4())
+    object_name = f"{config.MEDIA_UPLOAD_PREFIX}{upload_id}{_EXTENSIONS.get(content_type, '')}"
+
+    upload_url = await asyncio.to_thread(
+        get_minio_client().get_presigned_url,
+        object_name,
+        expires_in=config.MEDIA_UPLOAD_URL_TTL,
+        method="PUT"
+    )
+    if not upload_url:
+        raise RuntimeError("Failed to presign upload URL")
+
+    session = {
+        "upload_id": upload_id,
+        "owner_id": owner_id,
+        "object_name": object_name,
+        "filename": filename,
+        "content_type": content_type,
+        "declared_size": size,
+        "status": UploadStatus.PENDING,
+        "created_at": datetime.utcnow().isoformat(),
+    }
+    # Unused sessions expire with their URL (plus time for a slow upload to finish)
+    await save_upload_session(session, ttl=config.MEDIA_UPLOAD_URL_TTL * 2)
+
+    return {**session, "upload_url": upload_url}
+
+
+async def enqueue_upload_processing(session: Dict[str, Any]) -> Optional[str]:
+    """Mark a session as uploaded and enqueue its worker job (idempotent)."""
+    if session["status"] == UploadStatus.PENDING:
+        session["status"] = UploadStatus.PROCESSING
+        await save_upload_session(session)
+
+    pool = await get_redis_pool()
+    job = await pool.enqueue_job(
+        "process_media_upload",
+        session["upload_id"],
+        _job_id=upload_job_id(session["upload_id"])
+    )
+    # None when the job was already enqueued or ran
+    return job.job_id if job else None
+
+
+def check_uploaded_object(session: Dict[str, Any]) -> Optional[str]:
+    """
+    Compare the stored object with its session (blocking; run in a thread).
+
+    Returns:
+        Rejection reason, or None if the object is acceptable
+    """
+    info = get_minio_client().get_file_info(session["object_name"])
+    if info is None:
+        return "Object not found in storage"
+    if info["size"] > config.MAX_FILE_SIZE or info["size"] != session["declared_size"]:
+        return f"Uploaded size {info['size']} does not match the declared size"
+    if info["content_type"] != session["content_type"]:
+        return f"Uploaded content type {info['content_type']} does not match the declared type"
+    return None
+
+
+async def resolve_uploads(owner_id: str, upload_ids: List[str]) -> Dict[str, str]:
+    """
+    Media ids and object names of the owner's processed direct uploads.
+
+    Unknown, foreign and unfinished ids are skipped: until processing
+    finishes the photo has no media row and no content-addressed key.
+    """
+    uploads = {}
+    for upload_id in upload_ids:
+        session = await get_upload_session(str(upload_id))
+        if session and session["owner_id"] == owner_id and session["status"] == UploadStatus.READY:
+            uploads[session["media_id"]] = session["object_name"]
+    return uploads
@@ -5,8 +5,8 @@ These are temporary models to maintain backward compatibility
 while the full domain migration is completed.
 """
 
-from sqlalchemy import Column, String, Boolean, DateTime, Enum as SQLEnum, Text, ForeignKey, Integer, Float, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, Date, DateTime, Enum as SQLEnum, Text, ForeignKey, Index, Integer, Float, JSON
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -66,6 +66,7 @@ class AuditLog(Base):
     
     # Audit Information
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    actor_email = Column(String, index=True)  # Denormalized from users.email at write time
     action = Column(String, nullable=False, index=True)
     resource_type = Column(String, index=True)
     resource_id = Column(String, index=True)
@@ -78,6 +79,114 @@ class AuditLog(Base):
         return f"<AuditLog(id='{self.id}', action='{self.action}', user_id='{self.user_id}')>"
 
 
+
+class DailyRollup(Base):
+    """
+    Per-day counters for admin analytics, one row per metric/day/dimension/value.
+    The "total" dimension has a single empty value holding the day's row count.
+    Maintained by app.rollups.refresh_rollup.
+    """
+    __tablename__ = "daily_rollups"
+
+    metric = Column(String, primary_key=True)  # reports, resolved_reports, matches, users, fraud_results, audit_logs
+    day = Column(Date, primary_key=True)
+    dimension = Column(String, primary_key=True)  # total, status, type, category, city, ...
+    value = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_daily_rollups_metric_dimension_day", "metric", "dimension", "day"),
+    )
+
+    def __repr__(self):
+        return f"<DailyRollup(metric='{self.metric}', day='{self.day}', {self.dimension}='{self.value}', count={self.count})>"
+
+
+class RollupWatermark(Base):
+    """
+    Change-column high-water mark per rollup metric; rows changed after it
+    mark their days for recomputation on the next refresh.
+    """
+    __tablename__ = "rollup_watermarks"
+
+    metric = Column(String, primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=False)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<RollupWatermark(metric='{self.metric}', watermark='{self.watermark}')>"
+
+
+class MediaBlob(Base):
+    """
+    One stored original per distinct photo content, keyed by its SHA-256.
+    Media rows with the same content_hash share the object, its derivatives
+    and its perceptual hashes; ref_count counts them. Blobs whose count
+    dropped to zero are deleted, with their objects, by app.media_blobs.
+    """
+    __tablename__ = "media_blobs"
+
+    content_hash = Column(String(64), primary_key=True)
+    object_name = Column(String, nullable=False)  # originals/<aa>/<sha256><ext>
+    mime_type = Column(String)
+    size_bytes = Column(Integer)
+    width = Column(Integer)
+    height = Column(Integer)
+    phash_hex = Column(String)
+    dhash_hex = Column(String)
+    hash_version = Column(Integer)  # Vision HASH_VERSION of the hashes (NULL: before versioning)
+    derivatives = Column(JSONB, nullable=False, default=list)
+    ref_count = Column(Integer, nullable=False, default=0)
+    processed_at = Column(DateTime(timezone=True))  # Derivatives and hashes stored
+    released_at = Column(DateTime(timezone=True))  # Last time ref_count reached zero
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_media_blobs_unreferenced", "released_at", postgresql_where=(ref_count <= 0)),
+    )
+
+    def __repr__(self):
+        return f"<MediaBlob(content_hash='{self.content_hash}', ref_count={self.ref_count})>"
+
+
+class Media(Base):
+    """
+    Uploaded photo. filename is the original's object key in MinIO; derivatives
+    lists the resized renditions from app.derivatives (size, format, key, ...).
+    report_id stays empty for direct uploads until they are attached to a report.
+    Photos with the same content share one MediaBlob (see content_hash).
+    """
+    __tablename__ = "media"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid_pkg.uuid4()))
+    report_id = Column(String, ForeignKey("reports.id"), nullable=True, index=True)
+    filename = Column(String, nullable=False)
+    url = Column(String, nullable=False)
+    media_type = Column(String, default="image")
+    mime_type = Column(String)
+    size_bytes = Column(Integer)
+    width = Column(Integer)
+    height = Column(Integer)
+    phash_hex = Column(String)
+    dhash_hex = Column(String)
+    hash_version = Column(Integer)  # Vision HASH_VERSION of the hashes (NULL: before versioning)
+    content_hash = Column(String(64), ForeignKey("media_blobs.content_hash"), index=True)  # SHA-256 of the original
+    derivatives = Column(JSONB, nullable=False, default=list)
+
+    # Audit Fields
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def thumbnail_key(self) -> Optional[str]:
+        """Object key of the smallest rendition, if derivatives were generated."""
+        if not self.derivatives:
+            return None
+        from .derivatives import pick_thumbnail
+        return pick_thumbnail(self.derivatives)["key"]
+
+    def __repr__(self):
+        return f"<Media(id='{self.id}', filename='{self.filename}')>"
+
+
 # Fraud Detection Models
 class FraudRiskLevel(str, enum.Enum):
     """Fraud risk levels."""
@@ -97,7 +206,7 @@ class FraudDetectionResult(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid_pkg.uuid4)
     
     # Foreign Keys
-    report_id = Column(UUID(as_uuid=True), ForeignKey("reports.id"), nullable=False, index=True)
+    report_id = Column(UUID(as_uuid=True), ForeignKey("reports.id"), nullable=False, unique=True, index=True)  # Latest result only
     
     # Analysis Results
     fraud_score = Column(Float, nullable=False, index=True)
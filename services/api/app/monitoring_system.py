@@ -6,18 +6,25 @@ Advanced monitoring, metrics collection, and alerting for the Lost & Found Appli
 
 import time
 import json
+import random
 import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
+import httpx
 import psutil
-import threading
 from collections import defaultdict, deque
 
+from .config import config
+from .cache import get_redis_client
+from .storage import get_minio_client
+from .infrastructure.database.session import check_database_health
+
 try:
     from prometheus_client import Counter, Histogram, Gauge, Summary, CollectorRegistry, generate_latest
+    from .infrastructure.monitoring.metrics import observe_request, request_latency_summary
     PROMETHEUS_AVAILABLE = True
 except ImportError:
     PROMETHEUS_AVAILABLE = False
@@ -82,20 +89,7 @@ class MetricsCollector:
     
     def _init_prometheus_metrics(self):
         """Initialize Prometheus metrics."""
-        # HTTP metrics
-        self.http_requests_total = Counter(
-            'http_requests_total',
-            'Total HTTP requests',
-            ['method', 'endpoint', 'status'],
-            registry=self.registry
-        )
-        
-        self.http_request_duration = Histogram(
-            'http_request_duration_seconds',
-            'HTTP request duration',
-            ['method', 'endpoint'],
-            registry=self.registry
-        )
+        # HTTP metrics are the app-wide ones in infrastructure.monitoring.metrics
         
         # Database metrics
         self.db_queries_total = Counter(
@@ -189,18 +183,14 @@ class MetricsCollector:
         )
     
     def record_http_request(self, method: str, endpoint: str, status_code: int, duration: float):
-        """Record HTTP request metrics."""
-        if self.registry:
-            self.http_requests_total.labels(method=method, endpoint=endpoint, status=str(status_code)).inc()
-            self.http_request_duration.labels(method=method, endpoint=endpoint).observe(duration)
+        """
+        Record HTTP request metrics.
         
-        # Store in custom metrics
-        self._store_metric('http_requests', {
-            'method': method,
-            'endpoint': endpoint,
-            'status': status_code,
-            'duration': duration
-        })
+        endpoint must be a route template. Requests go straight to the shared
+        Prometheus series; no per-request history is kept here.
+        """
+        if self.registry:
+            observe_request(method, endpoint, status_code, duration)
     
     def record_db_query(self, operation: str, table: str, duration: float):
         """Record database query metrics."""
@@ -302,6 +292,16 @@ class MetricsCollector:
             'prometheus_available': PROMETHEUS_AVAILABLE
         }
         
+        # Request averages come from the shared latency histogram
+        if self.registry:
+            routes = request_latency_summary()
+            request_count = sum(route['count'] for route in routes)
+            if request_count:
+                summary['http_requests_count'] = request_count
+                summary['http_requests_avg'] = sum(
+                    route['avg'] * route['count'] for route in routes
+                ) / request_count
+        
         # Calculate rates and averages
         for metric_name, history in self.metric_history.items():
             if history:
@@ -406,41 +406,68 @@ class HealthChecker:
         self.alert_manager = alert_manager
         self.health_checks: Dict[str, Callable] = {}
         self.last_health_status: Dict[str, Any] = {}
+        self.last_checked_at: Optional[float] = None  # time.monotonic() of last run
+        self._refresh: Optional[asyncio.Task] = None
     
     def add_health_check(self, name: str, check_func: Callable):
         """Add health check."""
         self.health_checks[name] = check_func
     
     async def run_health_checks(self) -> Dict[str, Any]:
-        """Run all health checks."""
+        """Run all health checks concurrently, each bounded by HEALTH_CHECK_TIMEOUT."""
+        names = list(self.health_checks)
+        results = await asyncio.gather(*(self._timed_check(self.health_checks[name]) for name in names))
+        
         health_status = {
             'overall_status': 'healthy',
             'timestamp': datetime.now().isoformat(),
-            'checks': {}
+            'checks': dict(zip(names, results))
         }
-        
-        for check_name, check_func in self.health_checks.items():
-            try:
-                if asyncio.iscoroutinefunction(check_func):
-                    result = await check_func()
-                else:
-                    result = check_func()
-                
-                health_status['checks'][check_name] = result
-                
-                # Update overall status
-                if result.get('status') != 'healthy':
-                    health_status['overall_status'] = 'unhealthy'
-                    
-            except Exception as e:
-                health_status['checks'][check_name] = {
-                    'status': 'error',
-                    'error': str(e)
-                }
-                health_status['overall_status'] = 'unhealthy'
+        if any(result.get('status') != 'healthy' for result in results):
+            health_status['overall_status'] = 'unhealthy'
         
         self.last_health_status = health_status
+        self.last_checked_at = time.monotonic()
         return health_status
+    
+    async def _timed_check(self, check_func: Callable) -> Dict[str, Any]:
+        """Run one check, adding its response time; failures become an error result."""
+        start_time = time.monotonic()
+        try:
+            if asyncio.iscoroutinefunction(check_func):
+                result = await asyncio.wait_for(check_func(), timeout=config.HEALTH_CHECK_TIMEOUT)
+            else:
+                result = check_func()
+        except asyncio.TimeoutError:
+            return {'status': 'error', 'error': f"Timed out after {config.HEALTH_CHECK_TIMEOUT}s", 'response_time_ms': None}
+        except Exception as e:
+            return {'status': 'error', 'error': str(e), 'response_time_ms': None}
+        return {'response_time_ms': (time.monotonic() - start_time) * 1000, **result}
+    
+    def cached_health_status(self, max_age: float) -> Optional[Dict[str, Any]]:
+        """Last health result if it is at most max_age seconds old."""
+        if self.last_checked_at is None or time.monotonic() - self.last_checked_at > max_age:
+            return None
+        return self.last_health_status
+    
+    async def get_health_status(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Health result for HTTP endpoints: the monitoring loop's last run while
+        it is fresh, otherwise a new run (which refreshes the cache).
+        
+        Concurrent callers share one run, so frequent probes never fan out
+        to every backend per request.
+        """
+        if max_age is None:
+            max_age = max(config.HEALTH_CHECK_CACHE_TTL, 2 * config.MONITORING_INTERVAL)
+        cached = self.cached_health_status(max_age)
+        if cached is not None:
+            return cached
+        
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self.run_health_checks())
+        # Shielded so a disconnecting caller doesn't cancel the run for the others
+        return await asyncio.shield(self._refresh)
 
 
 class MonitoringDashboard:
@@ -476,21 +503,13 @@ class MonitoringDashboard:
             'cache_hit_rate': []
         }
         
+        # Per-route request totals and mean latency
+        if self.metrics_collector.registry:
+            performance_data['http_requests'] = request_latency_summary()
+
         # Get recent metrics
         for metric_name, history in self.metrics_collector.metric_history.items():
-            if metric_name == 'http_requests' and history:
-                recent_requests = list(history)[-100:]  # Last 100 requests
-                performance_data['http_requests'] = [
-                    {
-                        'timestamp': m.timestamp.isoformat(),
-                        'method': m.labels.get('method'),
-                        'endpoint': m.labels.get('endpoint'),
-                        'status': m.labels.get('status')
-                    }
-                    for m in recent_requests
-                ]
-            
-            elif metric_name == 'system' and history:
+            if metric_name == 'system' and history:
                 recent_system = list(history)[-60:]  # Last 60 measurements
                 performance_data['cpu_usage'] = [
                     {
@@ -520,7 +539,9 @@ class MonitoringSystem:
         self.dashboard = MonitoringDashboard(self.metrics_collector, self.alert_manager, self.health_checker)
         
         self.running = False
-        self.monitoring_thread: Optional[threading.Thread] = None
+        self.monitoring_task: Optional[asyncio.Task] = None
+        # Kept open across cycles so service checks reuse connections
+        self.http_client: Optional[httpx.AsyncClient] = None
         
         # Setup default alert rules
         self._setup_default_alert_rules()
@@ -577,73 +598,98 @@ class MonitoringSystem:
         self.alert_manager.add_alert_rule('slow_response_time', slow_response_time_rule)
     
     def _setup_default_health_checks(self):
-        """Setup default health checks."""
-        
-        def database_health_check():
-            """Check database health."""
-            try:
-                # This would check database connectivity
-                return {'status': 'healthy', 'message': 'Database connection OK'}
-            except Exception as e:
-                return {'status': 'unhealthy', 'message': f'Database error: {e}'}
-        
-        def redis_health_check():
-            """Check Redis health."""
-            try:
-                # This would check Redis connectivity
-                return {'status': 'healthy', 'message': 'Redis connection OK'}
-            except Exception as e:
-                return {'status': 'unhealthy', 'message': f'Redis error: {e}'}
-        
-        def external_services_health_check():
-            """Check external services health."""
-            try:
-                # This would check NLP and Vision services
-                return {'status': 'healthy', 'message': 'External services OK'}
-            except Exception as e:
-                return {'status': 'unhealthy', 'message': f'External services error: {e}'}
+        """Setup default health checks against the app's shared pools."""
+        
+        async def database_health_check():
+            """Check database health through the app engine."""
+            return await check_database_health()
+        
+        async def redis_health_check():
+            """Check Redis health through the shared client."""
+            return await get_redis_client().health_check()
+        
+        async def minio_health_check():
+            """Check MinIO health; the SDK is blocking, so run it in a thread."""
+            minio_client = get_minio_client()
+            if not minio_client:
+                return {'status': 'unhealthy', 'error': 'MinIO client not available'}
+            return await asyncio.to_thread(minio_client.health_check)
+        
+        def service_health_check(base_url: str):
+            async def check():
+                client = self.http_client
+                if client is None:
+                    async with httpx.AsyncClient(timeout=config.HTTP_TIMEOUT) as client:
+                        response = await client.get(f"{base_url}/health")
+                else:
+                    response = await client.get(f"{base_url}/health")
+                if response.status_code != 200:
+                    return {'status': 'unhealthy', 'error': f"HTTP {response.status_code}"}
+                return {'status': 'healthy', 'version': response.json().get('version', 'unknown')}
+            return check
         
         self.health_checker.add_health_check('database', database_health_check)
         self.health_checker.add_health_check('redis', redis_health_check)
-        self.health_checker.add_health_check('external_services', external_services_health_check)
+        self.health_checker.add_health_check('minio', minio_health_check)
+        self.health_checker.add_health_check('nlp', service_health_check(config.NLP_SERVICE_URL))
+        self.health_checker.add_health_check('vision', service_health_check(config.VISION_SERVICE_URL))
     
-    def start_monitoring(self):
-        """Start monitoring system."""
+    async def start_monitoring(self):
+        """Start the monitoring loop as a task on the running event loop."""
         if self.running:
             return
         
         self.running = True
-        self.monitoring_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
-        self.monitoring_thread.start()
+        self.http_client = httpx.AsyncClient(timeout=config.HTTP_TIMEOUT)
+        self.monitoring_task = asyncio.create_task(self._monitoring_loop())
         logger.info("Monitoring system started")
     
-    def stop_monitoring(self):
-        """Stop monitoring system."""
+    async def stop_monitoring(self):
+        """Stop the monitoring loop and release its HTTP client."""
         self.running = False
-        if self.monitoring_thread:
-            self.monitoring_thread.join()
+        if self.monitoring_task:
+            self.monitoring_task.cancel()
+            try:
+                await self.monitoring_task
+            except asyncio.CancelledError:
+                pass
+            self.monitoring_task = None
+        if self.http_client:
+            await self.http_client.aclose()
+            self.http_client = None
         logger.info("Monitoring system stopped")
     
-    def _monitoring_loop(self):
+    def _next_delay(self, interval: float) -> float:
+        """Interval with +/- MONITORING_JITTER so workers don't check in lockstep."""
+        jitter = config.MONITORING_JITTER
+        return interval * random.uniform(1 - jitter, 1 + jitter)
+    
+    async def _monitoring_loop(self):
         """Main monitoring loop."""
+        # Random initial offset spreads workers started together across the interval
+        await asyncio.sleep(random.uniform(0, config.MONITORING_INTERVAL))
+        
         while self.running:
             try:
-                # Update system metrics
-                self.metrics_collector.update_system_metrics()
+                # Update system metrics (psutil samples CPU for a second)
+                await asyncio.to_thread(self.metrics_collector.update_system_metrics)
                 
                 # Check alert rules
                 metrics_summary = self.metrics_collector.get_metrics_summary()
                 self.alert_manager.check_alert_rules(metrics_summary)
                 
-                # Run health checks
-                asyncio.run(self.health_checker.run_health_checks())
+                # Run health checks; results are served by get_health_status()
+                await self.health_checker.run_health_checks()
                 
-                # Sleep for 30 seconds
-                time.sleep(30)
+                delay = self._next_delay(config.MONITORING_INTERVAL)
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"Monitoring loop error: {e}")
-                time.sleep(60)  # Wait longer on error
+                delay = self._next_delay(2 * config.MONITORING_INTERVAL)  # Wait longer on error
+            
+            await asyncio.sleep(delay)
     
     def get_status(self) -> Dict[str, Any]:
         """Get monitoring system status."""
@@ -676,13 +722,13 @@ def get_monitoring_dashboard() -> MonitoringDashboard:
     """Get the global monitoring dashboard."""
     return monitoring_system.dashboard
 
-def start_monitoring():
+async def start_monitoring():
     """Start the global monitoring system."""
-    monitoring_system.start_monitoring()
+    await monitoring_system.start_monitoring()
 
-def stop_monitoring():
+async def stop_monitoring():
     """Stop the global monitoring system."""
-    monitoring_system.stop_monitoring()
+    await monitoring_system.stop_monitoring()
 
 def get_monitoring_status() -> Dict[str, Any]:
     """Get the global monitoring system status."""
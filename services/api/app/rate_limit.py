@@ -0,0 +1,305 @@
+"""
+Rate Limiting
+=============
+One rate-limit engine for the whole API: a GCRA (generic cell rate
+algorithm) check implemented as a single Redis Lua script.
+
+Each key stores one hash (theoretical arrival time plus emission interval)
+with a TTL that always matches the time until the limit is fully replenished,
+so a check is one atomic round-trip and no key is ever left without expiry.
+It is used both by slowapi (through the ``gcra+redis://`` storage registered
+below) and by ``app.cache.check_rate_limit``.
+
+Hot keys pre-allocate tokens: once a key has had a batch worth of hits
+(RATE_LIMIT_LOCAL_BATCH, at most a tenth of the limit) within one
+RATE_LIMIT_LOCAL_LEASE period, a process reserves the next batch in one call
+and serves the following hits from memory until the lease expires. Keys hit
+less often than that go to Redis on every hit and are counted exactly. Tokens
+left when a lease expires are forfeited, which only happens when a hot key
+suddenly goes quiet: a client is never let through beyond its limit.
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+from limits.storage import RedisStorage
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1]: rate limit key
+# ARGV[1]: emission interval in ms (period / limit)
+# ARGV[2]: capacity (the limit)
+# ARGV[3]: cost; 0 only reads the state
+# Returns {allowed, remaining, retry_after_ms, reset_after_ms}
+GCRA_SCRIPT = """
+if redis.replicate_commands then
+    redis.replicate_commands()
+end
+
+local key = KEYS[1]
+local interval = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local period = interval * capacity
+
+local tat = tonumber(redis.call('HGET', key, 'tat') or now)
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + interval * cost
+local allow_at = new_tat - period
+if allow_at > now then
+    local remaining = math.floor((period - (tat - now)) / interval)
+    return {0, remaining, math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+
+if cost > 0 then
+    redis.call('HSET', key, 'tat', new_tat, 'interval', interval)
+    redis.call('PEXPIRE', key, math.ceil(new_tat - now))
+end
+
+local remaining = math.floor((period - (new_tat - now)) / interval)
+return {1, remaining, 0, math.ceil(new_tat - now)}
+"""
+
+# Bound on locally leased keys per process
+_MAX_LEASES = 10000
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of one rate limit hit."""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # Seconds until the hit would be allowed (0 when allowed)
+    reset_after: float  # Seconds until the limit is fully replenished
+
+    @classmethod
+    def from_script(cls, limit: int, reply) -> "RateLimitResult":
+        allowed, remaining, retry_after_ms, reset_after_ms = (int(value) for value in reply)
+        return cls(
+            allowed=bool(allowed),
+            limit=limit,
+            remaining=max(0, remaining),
+            retry_after=retry_after_ms / 1000,
+            reset_after=reset_after_ms / 1000,
+        )
+
+
+def lease_batch(limit: int) -> int:
+    """Tokens to reserve per Redis call for a limit; 1 disables leasing."""
+    return max(1, min(config.RATE_LIMIT_LOCAL_BATCH, limit // 10))
+
+
+def script_args(limit: int, period: float, cost: int) -> Tuple[float, int, int]:
+    return (period * 1000 / limit, limit, cost)
+
+
+@dataclass
+class _KeyLease:
+    window_start: float  # Start of the lease period hits are counted in
+    hits: int = 0
+    tokens: int = 0  # Leased tokens left
+    remote_remaining: int = 0  # Remaining in Redis after the reservation
+    expires_at: float = 0.0
+
+
+class TokenLeases:
+    """
+    Tokens reserved in Redis but not spent yet, and recent hits, per key
+    (thread-safe, LRU-bounded).
+    """
+
+    def __init__(self, max_keys: int = _MAX_LEASES):
+        self.max_keys = max_keys
+        self._leases: "OrderedDict[str, _KeyLease]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str) -> Optional[int]:
+        """
+        Count a hit and spend one leased token; returns the estimated
+        remaining count, or None if the hit must go to Redis.
+        """
+        now = time.monotonic()
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is None:
+                lease = self._leases[key] = _KeyLease(window_start=now)
+                while len(self._leases) > self.max_keys:
+                    self._leases.popitem(last=False)
+            self._leases.move_to_end(key)
+
+            if now - lease.window_start >= config.RATE_LIMIT_LOCAL_LEASE:
+                lease.window_start, lease.hits = now, 0
+            lease.hits += 1
+
+            if lease.tokens <= 0 or lease.expires_at <= now:
+                lease.tokens = 0
+                return None
+            lease.tokens -= 1
+            return lease.remote_remaining + lease.tokens
+
+    def batch(self, key: str, limit: int) -> int:
+        """
+        Tokens to reserve on a key's next Redis call: a lease batch once the
+        key had that many hits within one lease period, otherwise just 1.
+        """
+        batch = lease_batch(limit)
+        with self._lock:
+            lease = self._leases.get(key)
+            return batch if lease is not None and lease.hits >= batch else 1
+
+    def grant(self, key: str, tokens: int, remote_remaining: int) -> None:
+        """Record tokens reserved by the last Redis call."""
+        if tokens <= 0:
+            return
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is None:
+                return  # Evicted meanwhile; the tokens are forfeited
+            lease.tokens = tokens
+            lease.remote_remaining = remote_remaining
+            lease.expires_at = time.monotonic() + config.RATE_LIMIT_LOCAL_LEASE
+
+
+def _leased_hit(
+    leases: TokenLeases,
+    key: str,
+    limit: int,
+    run: Callable[[int], RateLimitResult],
+) -> RateLimitResult:
+    """
+    One hit of cost 1, served from a local lease when possible.
+
+    Otherwise goes to Redis, reserving a batch in the same call if the key is
+    hot; if the full batch doesn't fit, retries with whatever Redis reported
+    as remaining (if anything).
+    """
+    remaining = leases.take(key)
+    if remaining is not None:
+        return RateLimitResult(True, limit, remaining, 0.0, 0.0)
+
+    batch = leases.batch(key, limit)
+    result = run(batch)
+    if not result.allowed and batch > 1 and result.remaining > 0:
+        batch = min(batch, result.remaining)
+        result = run(batch)
+    if result.allowed:
+        leases.grant(key, batch - 1, result.remaining)
+        result.remaining += batch - 1
+    return result
+
+
+class RateLimiter:
+    """Async rate limiter on the shared Redis client (used by check_rate_limit)."""
+
+    def __init__(self):
+        self.leases = TokenLeases()
+        self._script = None
+
+    def _get_script(self):
+        if self._script is None:
+            from .cache import get_redis_client
+            self._script = get_redis_client().client.register_script(GCRA_SCRIPT)
+        return self._script
+
+    async def _run(self, key: str, limit: int, period: float, cost: int) -> RateLimitResult:
+        reply = await self._get_script()(keys=[key], args=script_args(limit, period, cost))
+        return RateLimitResult.from_script(limit, reply)
+
+    async def hit(self, key: str, limit: int, period: float, cost: int = 1) -> RateLimitResult:
+        """
+        Consume cost tokens from key's limit of `limit` per `period` seconds.
+
+        Fails open (allowed) if Redis is unavailable, like the rest of the cache layer.
+        """
+        try:
+            if cost != 1 or lease_batch(limit) == 1:
+                return await self._run(key, limit, period, cost)
+
+            lease_key = f"{key}:{limit}:{period}"
+            remaining = self.leases.take(lease_key)
+            if remaining is not None:
+                return RateLimitResult(True, limit, remaining, 0.0, 0.0)
+
+            # Same flow as _leased_hit, awaiting each script call
+            batch = self.leases.batch(lease_key, limit)
+            result = await self._run(key, limit, period, batch)
+            if not result.allowed and batch > 1 and result.remaining > 0:
+                batch = min(batch, result.remaining)
+                result = await self._run(key, limit, period, batch)
+            if result.allowed:
+                self.leases.grant(lease_key, batch - 1, result.remaining)
+                result.remaining += batch - 1
+            return result
+        except Exception as e:
+            logger.error(f"Rate limit check failed for {key}: {e}")
+            return RateLimitResult(True, limit, limit, 0.0, 0.0)
+
+
+rate_limiter = RateLimiter()
+
+
+class GCRARedisStorage(RedisStorage):
+    """
+    limits storage backing slowapi with the GCRA script.
+
+    Registered for ``gcra+redis://`` and ``gcra+rediss://`` URIs and used
+    with slowapi's ``sliding-window-counter`` strategy: hits go through the
+    script (with local leases), window reads map the GCRA state onto the
+    (previous, current) window tuple the strategy expects.
+    """
+
+    STORAGE_SCHEME = ["gcra+redis", "gcra+rediss"]
+
+    def __init__(self, uri: str, **options: Any) -> None:
+        self.leases = TokenLeases()
+        super().__init__(uri.replace("gcra+", "", 1), **options)
+
+    def initialize_storage(self, uri: str) -> None:
+        super().initialize_storage(uri)
+        self.lua_gcra = self.get_connection().register_script(GCRA_SCRIPT)
+
+    def _gcra(self, key: str, limit: int, expiry: int, cost: int) -> RateLimitResult:
+        reply = self.lua_gcra([self.prefixed_key(key)], script_args(limit, expiry, cost))
+        return RateLimitResult.from_script(limit, reply)
+
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        if amount != 1 or lease_batch(limit) == 1:
+            return self._gcra(key, limit, expiry, amount).allowed
+        return _leased_hit(
+            self.leases,
+            f"{key}:{limit}:{expiry}",
+            limit,
+            lambda cost: self._gcra(key, limit, expiry, cost),
+        ).allowed
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        # GCRA has no windows: report the used tokens as the current window
+        pipeline = self.get_connection().pipeline(transaction=False)
+        pipeline.time()
+        pipeline.hmget(self.prefixed_key(key), "tat", "interval")
+        (seconds, microseconds), (tat, interval) = pipeline.execute()
+        if tat is None or interval is None:
+            return 0, 0.0, 0, 0.0
+
+        now = int(seconds) * 1000 + int(microseconds) // 1000
+        reset_after = max(0.0, float(tat) - now)
+        used = math.ceil(reset_after / float(interval))
+        return 0, 0.0, used, reset_after / 1000
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        self.clear(key)
@@ -0,0 +1,279 @@
+"""
+Daily rollups for admin analytics.
+
+Counts are kept per UTC day so dashboard widgets read a handful of rollup
+rows instead of scanning the raw tables. Refreshes recompute whole days
+with grouped INSERT ... SELECT statements, so running them repeatedly is
+safe. The ARQ worker refreshes everything every ROLLUP_REFRESH_MINUTES
+(see app.worker.refresh_rollups_task).
+"""
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Union
+import logging
+
+from sqlalchemy import (
+    Date, DateTime, String, and_, case, cast, delete, distinct, func, insert,
+    literal, literal_column, select, union_all,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import config
+from .models import (
+    AuditLog, DailyRollup, FraudDetectionResult, RollupWatermark, User,
+)
+from .domains.matches.models.match import Match
+from .domains.reports.models.report import Report
+
+logger = logging.getLogger(__name__)
+
+TOTAL = "total"
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def utc_day(column):
+    """SQL expression for the UTC calendar day of a timestamptz column."""
+    # Inline literal, so GROUP BY matches the select expression under bind params
+    return cast(func.timezone(literal_column("'UTC'"), column), Date)
+
+
+def day_series(start: date, end: date, name: str = "days"):
+    """Subquery with one row per day from start to end inclusive (generate_series)."""
+    return select(
+        cast(
+            func.generate_series(
+                cast(literal(start, Date), DateTime),
+                cast(literal(end, Date), DateTime),
+                literal_column("interval '1 day'"),
+            ),
+            Date,
+        ).label("day")
+    ).subquery(name)
+
+
+# ============================================================================
+# GENERIC DAILY ROLLUPS
+# ============================================================================
+
+@dataclass(frozen=True)
+class RollupSource:
+    """How one metric is bucketed: rows are counted on the UTC day of day_column."""
+    model: Any
+    day_column: Any
+    change_column: Any  # Bumped on every write; rows past the watermark are re-rolled
+    dimensions: Dict[str, Any] = field(default_factory=dict)
+    condition: Any = None  # Only rows matching it are counted
+
+
+ROLLUP_SOURCES: Dict[str, RollupSource] = {
+    "reports": RollupSource(
+        Report, Report.created_at, Report.updated_at,
+        {
+            "status": Report.status,
+            "type": Report.type,
+            "category": Report.category,
+            "city": Report.location_city,
+        },
+    ),
+    # Bucketed by first resolution day, which never moves, so a report is
+    # counted once however often it is edited, reopened or resolved again
+    "resolved_reports": RollupSource(
+        Report, Report.resolved_at, Report.updated_at, condition=Report.is_resolved.is_(True),
+    ),
+    "matches": RollupSource(
+        Match, Match.created_at, Match.updated_at,
+        {"status": Match.status},
+    ),
+    "users": RollupSource(
+        User, User.created_at, User.updated_at,
+        {"active": User.is_active, "role": User.role},
+    ),
+    "fraud_results": RollupSource(
+        FraudDetectionResult, FraudDetectionResult.created_at, FraudDetectionResult.updated_at,
+        {
+            "risk_level": func.lower(cast(FraudDetectionResult.risk_level, String)),
+            "review": case(
+                (FraudDetectionResult.is_confirmed_fraud.is_(True), literal_column("'confirmed'")),
+                (FraudDetectionResult.is_reviewed.is_(True), literal_column("'false_positive'")),
+                else_=literal_column("'pending'"),
+            ),
+        },
+    ),
+    # Append-only, so the creation time doubles as the change column
+    "audit_logs": RollupSource(
+        AuditLog, AuditLog.created_at, AuditLog.created_at,
+        {"action": AuditLog.action, "actor": AuditLog.actor_email},
+    ),
+}
+
+
+async def refresh_rollup(db: AsyncSession, metric: str) -> int:
+    """
+    Bring daily_rollups up to date for one metric.
+
+    Finds the days of rows changed since the watermark (minus
+    ROLLUP_WATERMARK_OVERLAP, to catch transactions that committed late),
+    replaces those days with one grouped INSERT ... SELECT and moves the
+    watermark to the transaction start. Without a watermark every day is
+    rebuilt. Serialized per metric with an advisory lock; does not commit.
+
+    Returns:
+        Number of days recomputed
+    """
+    source = ROLLUP_SOURCES[metric]
+    await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"rollup:{metric}"))))
+
+    started = (await db.execute(select(func.now()))).scalar()
+    mark = await db.get(RollupWatermark, metric)
+
+    changed = select(distinct(utc_day(source.day_column))).where(source.day_column.isnot(None))
+    if mark is not None:
+        overlap = timedelta(seconds=config.ROLLUP_WATERMARK_OVERLAP)
+        changed = changed.where(source.change_column >= mark.watermark - overlap)
+    dirty = sorted(day for (day,) in await db.execute(changed))
+
+    if dirty:
+        await db.execute(
+            delete(DailyRollup).where(DailyRollup.metric == metric, DailyRollup.day.in_(dirty))
+        )
+
+        in_dirty_days = and_(
+            source.day_column >= datetime.combine(dirty[0], time.min, tzinfo=timezone.utc),
+            utc_day(source.day_column).in_(dirty),
+        )
+        if source.condition is not None:
+            in_dirty_days = and_(in_dirty_days, source.condition)
+        dimensions = {TOTAL: literal_column("''"), **source.dimensions}
+        selects = []
+        for name, expression in dimensions.items():
+            rows = (
+                select(
+                    utc_day(source.day_column).label("day"),
+                    func.coalesce(cast(expression, String), literal_column("''")).label("value"),
+                )
+                .where(in_dirty_days)
+                .subquery()
+            )
+            selects.append(
+                select(
+                    literal(metric, String).label("metric"),
+                    rows.c.day,
+                    literal(name, String).label("dimension"),
+                    rows.c.value,
+                    func.count().label("count"),
+                ).group_by(rows.c.day, rows.c.value)
+            )
+
+        await db.execute(
+            insert(DailyRollup).from_select(
+                ["metric", "day", "dimension", "value", "count"], union_all(*selects)
+            )
+        )
+
+    statement = pg_insert(RollupWatermark).values(metric=metric, watermark=started)
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[RollupWatermark.metric],
+            set_={"watermark": statement.excluded.watermark, "refreshed_at": func.now()},
+        )
+    )
+
+    return len(dirty)
+
+
+async def ensure_rollups(db: AsyncSession, *metrics: str) -> None:
+    """Build any of the given metrics that have never been rolled up, so readers don't see zeros."""
+    present = set(
+        (await db.execute(
+            select(RollupWatermark.metric).where(RollupWatermark.metric.in_(metrics))
+        )).scalars()
+    )
+    missing = [metric for metric in metrics if metric not in present]
+    if not missing:
+        return
+
+    for metric in missing:
+        days = await refresh_rollup(db, metric)
+        logger.info(f"Built {metric} rollup inline ({days} days)")
+    await db.commit()
+
+
+async def rollup_counts(
+    db: AsyncSession,
+    metric: str,
+    dimension: str = TOTAL,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> Dict[str, int]:
+    """
+    Row counts per dimension value for days in [start, end] (open-ended if omitted).
+
+    Bucketing is by the metric's day column, so values reflect each row's
+    current state. Reads O(days x values) rollup rows.
+    """
+    query = (
+        select(DailyRollup.value, func.sum(DailyRollup.count))
+        .where(DailyRollup.metric == metric, DailyRollup.dimension == dimension)
+        .group_by(DailyRollup.value)
+    )
+    if start is not None:
+        query = query.where(DailyRollup.day >= start)
+    if end is not None:
+        query = query.where(DailyRollup.day <= end)
+
+    return {value: int(total) for value, total in await db.execute(query)}
+
+
+async def rollup_total(
+    db: AsyncSession,
+    metric: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> int:
+    """Row count for days in [start, end]."""
+    return (await rollup_counts(db, metric, TOTAL, start, end)).get("", 0)
+
+
+async def get_report_daily_counts(db: AsyncSession, days: int) -> List[Dict[str, Union[str, int]]]:
+    """
+    Daily created/resolved report counts for the last `days` days, read
+    from the reports and resolved_reports rollups.
+    """
+    today = utc_today()
+    start = today - timedelta(days=days - 1)
+    await ensure_rollups(db, "reports", "resolved_reports")
+
+    def daily_totals(metric: str):
+        return (
+            select(DailyRollup.day, DailyRollup.count)
+            .where(DailyRollup.metric == metric, DailyRollup.dimension == TOTAL, DailyRollup.day >= start)
+            .subquery(metric)
+        )
+
+    series = day_series(start, today)
+    created = daily_totals("reports")
+    resolved = daily_totals("resolved_reports")
+    result = await db.execute(
+        select(
+            series.c.day,
+            func.coalesce(created.c.count, 0).label("created"),
+            func.coalesce(resolved.c.count, 0).label("resolved"),
+        )
+        .select_from(series)
+        .outerjoin(created, created.c.day == series.c.day)
+        .outerjoin(resolved, resolved.c.day == series.c.day)
+        .order_by(series.c.day)
+    )
+
+    return [
+        {
+            "date": row.day.strftime("%Y-%m-%d"),
+            "created": row.created,
+            "resolved": row.resolved,
+        }
+        for row in result
+    ]
@@ -12,6 +12,7 @@ from ...infrastructure.database.session import get_async_db
 from app.models import User, AuditLog
 from .auth import require_admin
 from app.dependencies import get_current_admin
+from app.rollups import ensure_rollups, rollup_counts, rollup_total
 
 router = APIRouter()
 templates = Jinja2Templates(directory="templates")
@@ -21,57 +22,35 @@ templates = Jinja2Templates(directory="templates")
 async def get_audit_logs_stats(
     db: AsyncSession = Depends(get_async_db)
 ):
-    """Get audit logs statistics for dashboard."""
-    from sqlalchemy import select, func, and_
+    """Get audit logs statistics for dashboard, read from the daily rollups."""
     from datetime import datetime, timedelta, timezone
     
     now = datetime.now(timezone.utc)
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_ago = now - timedelta(days=7)
-    month_ago = now - timedelta(days=30)
+    today = now.date()
+    await ensure_rollups(db, "audit_logs")
     
     # Total logs
-    total_logs = (await db.execute(select(func.count()).select_from(AuditLog))).scalar() or 0
-    
-    # Logs today
-    logs_today = (
-        await db.execute(
-            select(func.count()).select_from(AuditLog).where(AuditLog.created_at >= today_start)
-        )
-    ).scalar() or 0
-    
-    # Logs this week
-    logs_this_week = (
-        await db.execute(
-            select(func.count()).select_from(AuditLog).where(AuditLog.created_at >= week_ago)
-        )
-    ).scalar() or 0
-    
-    # Logs this month
-    logs_this_month = (
-        await db.execute(
-            select(func.count()).select_from(AuditLog).where(AuditLog.created_at >= month_ago)
-        )
-    ).scalar() or 0
+    total_logs = await rollup_total(db, "audit_logs")
+    
+    # Logs today, this week and this month (whole UTC days)
+    logs_today = await rollup_total(db, "audit_logs", start=today)
+    logs_this_week = await rollup_total(db, "audit_logs", start=today - timedelta(days=7))
+    logs_this_month = await rollup_total(db, "audit_logs", start=today - timedelta(days=30))
     
     # Top actions
-    top_actions_result = await db.execute(
-        select(AuditLog.action, func.count().label('count'))
-        .group_by(AuditLog.action)
-        .order_by(func.count().desc())
-        .limit(5)
-    )
-    top_actions = [{"action": row[0], "count": row[1]} for row in top_actions_result.fetchall()]
+    actions = await rollup_counts(db, "audit_logs", "action")
+    top_actions = [
+        {"action": action, "count": count}
+        for action, count in sorted(actions.items(), key=lambda item: item[1], reverse=True)[:5]
+    ]
     
     # Top actors (users who performed most actions)
-    top_actors_result = await db.execute(
-        select(User.email, func.count().label('count'))
-        .join(AuditLog, User.id == AuditLog.user_id)
-        .group_by(User.email)
-        .order_by(func.count().desc())
-        .limit(5)
-    )
-    top_actors = [{"actor_email": row[0], "count": row[1]} for row in top_actors_result.fetchall()]
+    actors = await rollup_counts(db, "audit_logs", "actor")
+    top_actors = [
+        {"actor_email": actor, "count": count}
+        for actor, count in sorted(actors.items(), key=lambda item: item[1], reverse=True)
+        if actor
+    ][:5]
     
     return {
         "total_logs": total_logs,
@@ -84,30 +63,28 @@ async def get_audit_logs_stats(
     }
 
 
-@router.get("")
-async def list_audit_logs(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(25, ge=1, le=100),
+def _audit_log_query(
     action: Optional[str] = None,
     actor_email: Optional[str] = None,
     date_from: Optional[str] = None,
-    date_to: Optional[str] = None,
-    db: AsyncSession = Depends(get_async_db)
+    date_to: Optional[str] = None
 ):
-    """List audit logs with pagination and filters."""
+    """
+    Build the filtered audit log query and its count query.
+    
+    Actors are outer-joined so each row carries its email in the same query;
+    rows written before actor_email existed fall back to users.email.
+    """
     from sqlalchemy import select, func, and_
     
+    actor_email_column = func.coalesce(AuditLog.actor_email, User.email).label("resolved_actor_email")
+    
     # Build query conditions
     conditions = []
     if action:
         conditions.append(AuditLog.action == action)
     if actor_email:
-        # Find users with matching email
-        user_query = select(User.id).where(User.email.ilike(f"%{actor_email}%"))
-        user_result = await db.execute(user_query)
-        user_ids = [row[0] for row in user_result.fetchall()]
-        if user_ids:
-            conditions.append(AuditLog.user_id.in_(user_ids))
+        conditions.append(actor_email_column.ilike(f"%{actor_email}%"))
     if date_from:
         date_from_dt = datetime.fromisoformat(date_from)
         conditions.append(AuditLog.created_at >= date_from_dt)
@@ -115,38 +92,46 @@ async def list_audit_logs(
         date_to_dt = datetime.fromisoformat(date_to)
         conditions.append(AuditLog.created_at <= date_to_dt)
     
-    # Get total count
+    query = select(AuditLog, actor_email_column).outerjoin(User, User.id == AuditLog.user_id)
     count_query = select(func.count()).select_from(AuditLog)
+    if actor_email:
+        count_query = count_query.outerjoin(User, User.id == AuditLog.user_id)
     if conditions:
+        query = query.where(and_(*conditions))
         count_query = count_query.where(and_(*conditions))
+    
+    return query.order_by(AuditLog.created_at.desc()), count_query
+
+
+@router.get("")
+async def list_audit_logs(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(25, ge=1, le=100),
+    action: Optional[str] = None,
+    actor_email: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """List audit logs with pagination and filters."""
+    query, count_query = _audit_log_query(action, actor_email, date_from, date_to)
+    
+    # Get total count
     total_result = await db.execute(count_query)
     total = total_result.scalar() or 0
     
-    # Get paginated results
-    query = select(AuditLog)
-    if conditions:
-        query = query.where(and_(*conditions))
-    query = query.order_by(AuditLog.created_at.desc()).offset(skip).limit(limit)
+    # Get paginated results with actor emails
+    result = await db.execute(query.offset(skip).limit(limit))
     
-    result = await db.execute(query)
-    logs = result.scalars().all()
-    
-    # Format response with actor details
     log_list = []
-    for log in logs:
-        actor = None
-        if log.user_id:
-            actor_query = select(User).where(User.id == log.user_id)
-            actor_result = await db.execute(actor_query)
-            actor = actor_result.scalar_one_or_none()
-        
+    for log, log_actor_email in result.all():
         log_list.append({
             "id": str(log.id),
             "action": log.action,
             "resource_type": log.resource_type,
             "resource_id": str(log.resource_id) if log.resource_id else None,
             "user_id": str(log.user_id) if log.user_id else None,
-            "actor_email": actor.email if actor else "System",
+            "actor_email": log_actor_email or "System",
             "details": log.details,
             "created_at": log.created_at.isoformat()
         })
@@ -174,37 +159,22 @@ async def audit_log(
 ):
     """Display audit log with filters."""
     page_size = 50
-    query = db.query(AuditLog)
-    
-    # Apply filters
-    if action:
-        query = query.filter(AuditLog.action == action)
-    if admin_email:
-        admin_users = db.query(User.id).filter(User.email.ilike(f"%{admin_email}%")).all()
-        admin_ids = [u[0] for u in admin_users]
-        query = query.filter(AuditLog.admin_id.in_(admin_ids))
-    if date_from:
-        date_from_dt = datetime.fromisoformat(date_from)
-        query = query.filter(AuditLog.created_at >= date_from_dt)
-    if date_to:
-        date_to_dt = datetime.fromisoformat(date_to)
-        query = query.filter(AuditLog.created_at <= date_to_dt)
+    query, count_query = _audit_log_query(action, admin_email, date_from, date_to)
     
-    total_count = query.count()
+    total_count = (await db.execute(count_query)).scalar() or 0
     total_pages = ceil(total_count / page_size)
     
-    logs = (
+    result = await db.execute(
         query
-        .order_by(AuditLog.created_at.desc())
         .offset((page - 1) * page_size)
         .limit(page_size)
-        .all()
     )
     
     # Add admin email to each log entry
-    for log in logs:
-        admin = db.query(User).filter(User.id == log.admin_id).first()
-        log.admin_email = admin.email if admin else "Unknown"
+    logs = []
+    for log, log_actor_email in result.all():
+        log.admin_email = log_actor_email or "Unknown"
+        logs.append(log)
     
     return templates.TemplateResponse(
         "admin/audit_log.html",
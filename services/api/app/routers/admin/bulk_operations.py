@@ -1,196 +1,192 @@
 """Admin bulk operations router."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends
+from sqlalchemy import any_, bindparam, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 import json
+import uuid
 
+from ...config import config
 from ...infrastructure.database.session import get_async_db
 from ...models import User
 from ...domains.reports.models.report import Report, ReportStatus
 from ...domains.matches.models.match import Match, MatchStatus
 from ...schemas import BulkOperationRequest, BulkOperationResult, BulkOperationError
 from ...dependencies import get_current_admin
-from ...helpers import create_audit_log
+from ...helpers import create_audit_logs_async
+from ...cache import invalidate_principals
 
 router = APIRouter()
 
 
+async def _bulk_update(
+    db: AsyncSession,
+    model,
+    ids: List[str],
+    values: Dict[str, Any],
+    not_found_error: str,
+    old_columns: Tuple[str, ...] = (),
+    returning: Tuple = (),
+    excluded: Optional[Dict[str, str]] = None
+) -> Tuple[List[Any], List[BulkOperationError]]:
+    """
+    Apply one UPDATE to every id, in chunks of BULK_OPERATION_CHUNK_SIZE.
+
+    Each chunk is a single UPDATE ... FROM (SELECT ... WHERE id = ANY(:ids))
+    RETURNING statement, so pre-update values of old_columns come back as
+    old_<column> alongside the returning columns. Ids missing from the
+    returned rows are reported as not found. Nothing is committed.
+
+    Args:
+        db: Async database session
+        model: Mapped class to update
+        ids: Requested ids, as sent by the client
+        values: Column values to set
+        not_found_error: Error reported for unknown or malformed ids
+        old_columns: Columns whose previous values should be returned
+        returning: Extra columns to return from the updated rows
+        excluded: Ids to skip, mapped to the error to report for them
+
+    Returns:
+        Tuple of (updated rows, errors)
+    """
+    errors: List[BulkOperationError] = []
+    requested: Dict[uuid.UUID, str] = {}
+
+    for raw_id in dict.fromkeys(ids):
+        if excluded and raw_id in excluded:
+            errors.append(BulkOperationError(id=raw_id, error=excluded[raw_id]))
+            continue
+        try:
+            requested[uuid.UUID(raw_id)] = raw_id
+        except ValueError:
+            errors.append(BulkOperationError(id=raw_id, error=not_found_error))
+
+    rows: List[Any] = []
+    id_list = list(requested)
+    chunk_size = config.BULK_OPERATION_CHUNK_SIZE
+
+    for start in range(0, len(id_list), chunk_size):
+        chunk = id_list[start:start + chunk_size]
+        previous = (
+            select(model.id, *[getattr(model, column).label(f"old_{column}") for column in old_columns])
+            .where(model.id == any_(bindparam("ids", chunk, type_=ARRAY(UUID(as_uuid=True)))))
+            .subquery()
+        )
+        statement = (
+            update(model)
+            .where(model.id == previous.c.id)
+            .values(**values)
+            .returning(model.id, *[previous.c[f"old_{column}"] for column in old_columns], *returning)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(statement)
+        rows.extend(result.all())
+
+    updated_ids = {row.id for row in rows}
+    errors.extend(
+        BulkOperationError(id=raw_id, error=not_found_error)
+        for requested_id, raw_id in requested.items()
+        if requested_id not in updated_ids
+    )
+
+    return rows, errors
+
+
+def _audit_entries(
+    current_user: User,
+    action: str,
+    resource_type: str,
+    rows: List[Any],
+    details
+) -> List[Dict[str, Any]]:
+    """Build one audit entry per updated row; details(row) returns its details dict."""
+    return [
+        {
+            "user_id": current_user.id,
+            "actor_email": current_user.email,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": str(row.id),
+            "details": json.dumps({
+                "admin": current_user.email,
+                "bulk_operation": True,
+                **details(row)
+            })
+        }
+        for row in rows
+    ]
+
+
 # ============================================================================
 # REPORTS BULK OPERATIONS
 # ============================================================================
 
+async def _bulk_set_report_status(
+    db: AsyncSession,
+    current_user: User,
+    ids: List[str],
+    new_status: ReportStatus,
+    action: str,
+    include_title: bool = False
+) -> BulkOperationResult:
+    rows, errors = await _bulk_update(
+        db,
+        Report,
+        ids,
+        {"status": new_status.value},
+        "Report not found",
+        old_columns=("status",),
+        returning=(Report.title,) if include_title else ()
+    )
+
+    def details(row):
+        entry = {"old_status": str(row.old_status), "new_status": new_status.value}
+        if include_title:
+            entry["report_title"] = row.title
+        return entry
+
+    await create_audit_logs_async(db, _audit_entries(current_user, action, "report", rows, details))
+    await db.commit()
+
+    return BulkOperationResult(success=len(rows), failed=len(errors), errors=errors)
+
+
 @router.post("/reports/bulk/approve", response_model=BulkOperationResult)
-def bulk_approve_reports(
+async def bulk_approve_reports(
     bulk_request: BulkOperationRequest,
     current_user: User = Depends(get_current_admin),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Approve multiple reports at once."""
-    success_count = 0
-    errors = []
-    
-    for report_id in bulk_request.ids:
-        try:
-            report = db.query(Report).filter(Report.id == report_id).first()
-            
-            if not report:
-                errors.append(BulkOperationError(
-                    id=report_id,
-                    error="Report not found"
-                ))
-                continue
-            
-            # Update status
-            old_status = report.status
-            report.status = ReportStatus.APPROVED
-            
-            # Create audit log
-            create_audit_log(
-                db=db,
-                user_id=current_user.id,
-                action="report_bulk_approved",
-                resource_type="report",
-                resource_id=report_id,
-                details=json.dumps({
-                    "admin": current_user.email,
-                    "old_status": str(old_status),
-                    "new_status": "approved",
-                    "bulk_operation": True
-                })
-            )
-            
-            success_count += 1
-            
-        except Exception as e:
-            errors.append(BulkOperationError(
-                id=report_id,
-                error=str(e)
-            ))
-    
-    # Commit all changes
-    db.commit()
-    
-    return BulkOperationResult(
-        success=success_count,
-        failed=len(errors),
-        errors=errors
+    return await _bulk_set_report_status(
+        db, current_user, bulk_request.ids, ReportStatus.APPROVED, "report_bulk_approved"
     )
 
 
 @router.post("/reports/bulk/reject", response_model=BulkOperationResult)
-def bulk_reject_reports(
+async def bulk_reject_reports(
     bulk_request: BulkOperationRequest,
     current_user: User = Depends(get_current_admin),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Reject (hide) multiple reports at once."""
-    success_count = 0
-    errors = []
-    
-    for report_id in bulk_request.ids:
-        try:
-            report = db.query(Report).filter(Report.id == report_id).first()
-            
-            if not report:
-                errors.append(BulkOperationError(
-                    id=report_id,
-                    error="Report not found"
-                ))
-                continue
-            
-            # Update status
-            old_status = report.status
-            report.status = ReportStatus.HIDDEN
-            
-            # Create audit log
-            create_audit_log(
-                db=db,
-                user_id=current_user.id,
-                action="report_bulk_rejected",
-                resource_type="report",
-                resource_id=report_id,
-                details=json.dumps({
-                    "admin": current_user.email,
-                    "old_status": str(old_status),
-                    "new_status": "hidden",
-                    "bulk_operation": True
-                })
-            )
-            
-            success_count += 1
-            
-        except Exception as e:
-            errors.append(BulkOperationError(
-                id=report_id,
-                error=str(e)
-            ))
-    
-    # Commit all changes
-    db.commit()
-    
-    return BulkOperationResult(
-        success=success_count,
-        failed=len(errors),
-        errors=errors
+    return await _bulk_set_report_status(
+        db, current_user, bulk_request.ids, ReportStatus.HIDDEN, "report_bulk_rejected"
     )
 
 
 @router.post("/reports/bulk/delete", response_model=BulkOperationResult)
-def bulk_delete_reports(
+async def bulk_delete_reports(
     bulk_request: BulkOperationRequest,
     current_user: User = Depends(get_current_admin),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Delete multiple reports at once (soft delete by setting status to REMOVED)."""
-    success_count = 0
-    errors = []
-    
-    for report_id in bulk_request.ids:
-        try:
-            report = db.query(Report).filter(Report.id == report_id).first()
-            
-            if not report:
-                errors.append(BulkOperationError(
-                    id=report_id,
-                    error="Report not found"
-                ))
-                continue
-            
-            # Soft delete by setting status to REMOVED
-            old_status = report.status
-            report.status = ReportStatus.REMOVED
-            
-            # Create audit log
-            create_audit_log(
-                db=db,
-                user_id=current_user.id,
-                action="report_bulk_deleted",
-                resource_type="report",
-                resource_id=report_id,
-                details=json.dumps({
-                    "admin": current_user.email,
-                    "old_status": str(old_status),
-                    "new_status": "removed",
-                    "bulk_operation": True,
-                    "report_title": report.title
-                })
-            )
-            
-            success_count += 1
-            
-        except Exception as e:
-            errors.append(BulkOperationError(
-                id=report_id,
-                error=str(e)
-            ))
-    
-    # Commit all changes
-    db.commit()
-    
-    return BulkOperationResult(
-        success=success_count,
-        failed=len(errors),
-        errors=errors
+    return await _bulk_set_report_status(
+        db, current_user, bulk_request.ids, ReportStatus.REMOVED, "report_bulk_deleted",
+        include_title=True
     )
 
 
@@ -198,202 +194,84 @@ def bulk_delete_reports(
 # USERS BULK OPERATIONS
 # ============================================================================
 
+async def _bulk_set_user_active(
+    db: AsyncSession,
+    current_user: User,
+    ids: List[str],
+    is_active: bool,
+    action: str,
+    self_error: str,
+    details
+) -> BulkOperationResult:
+    # Admins can't change their own account status
+    rows, errors = await _bulk_update(
+        db,
+        User,
+        ids,
+        {"is_active": is_active},
+        "User not found",
+        old_columns=("is_active",),
+        returning=(User.email, User.display_name),
+        excluded={str(current_user.id): self_error}
+    )
+
+    await create_audit_logs_async(db, _audit_entries(current_user, action, "user", rows, details))
+    await db.commit()
+    await invalidate_principals([row.id for row in rows])
+
+    return BulkOperationResult(success=len(rows), failed=len(errors), errors=errors)
+
+
 @router.post("/users/bulk/activate", response_model=BulkOperationResult)
-def bulk_activate_users(
+async def bulk_activate_users(
     bulk_request: BulkOperationRequest,
     current_user: User = Depends(get_current_admin),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Activate multiple users at once."""
-    success_count = 0
-    errors = []
-    
-    for user_id in bulk_request.ids:
-        try:
-            user = db.query(User).filter(User.id == user_id).first()
-            
-            if not user:
-                errors.append(BulkOperationError(
-                    id=user_id,
-                    error="User not found"
-                ))
-                continue
-            
-            # Don't allow deactivating yourself
-            if user.id == current_user.id:
-                errors.append(BulkOperationError(
-                    id=user_id,
-                    error="Cannot modify your own account status"
-                ))
-                continue
-            
-            # Update status
-            old_status = user.is_active
-            user.is_active = True
-            
-            # Create audit log
-            create_audit_log(
-                db=db,
-                user_id=current_user.id,
-                action="user_bulk_activated",
-                resource_type="user",
-                resource_id=user_id,
-                details=json.dumps({
-                    "admin": current_user.email,
-                    "old_status": "inactive" if not old_status else "active",
-                    "new_status": "active",
-                    "bulk_operation": True,
-                    "user_email": user.email
-                })
-            )
-            
-            success_count += 1
-            
-        except Exception as e:
-            errors.append(BulkOperationError(
-                id=user_id,
-                error=str(e)
-            ))
-    
-    # Commit all changes
-    db.commit()
-    
-    return BulkOperationResult(
-        success=success_count,
-        failed=len(errors),
-        errors=errors
+    return await _bulk_set_user_active(
+        db, current_user, bulk_request.ids, True, "user_bulk_activated",
+        "Cannot modify your own account status",
+        lambda row: {
+            "old_status": "active" if row.old_is_active else "inactive",
+            "new_status": "active",
+            "user_email": row.email
+        }
     )
 
 
 @router.post("/users/bulk/deactivate", response_model=BulkOperationResult)
-def bulk_deactivate_users(
+async def bulk_deactivate_users(
     bulk_request: BulkOperationRequest,
     current_user: User = Depends(get_current_admin),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Deactivate multiple users at once."""
-    success_count = 0
-    errors = []
-    
-    for user_id in bulk_request.ids:
-        try:
-            user = db.query(User).filter(User.id == user_id).first()
-            
-            if not user:
-                errors.append(BulkOperationError(
-                    id=user_id,
-                    error="User not found"
-                ))
-                continue
-            
-            # Don't allow deactivating yourself
-            if user.id == current_user.id:
-                errors.append(BulkOperationError(
-                    id=user_id,
-                    error="Cannot modify your own account status"
-                ))
-                continue
-            
-            # Update status
-            old_status = user.is_active
-            user.is_active = False
-            
-            # Create audit log
-            create_audit_log(
-                db=db,
-                user_id=current_user.id,
-                action="user_bulk_deactivated",
-                resource_type="user",
-                resource_id=user_id,
-                details=json.dumps({
-                    "admin": current_user.email,
-                    "old_status": "active" if old_status else "inactive",
-                    "new_status": "inactive",
-                    "bulk_operation": True,
-                    "user_email": user.email
-                })
-            )
-            
-            success_count += 1
-            
-        except Exception as e:
-            errors.append(BulkOperationError(
-                id=user_id,
-                error=str(e)
-            ))
-    
-    # Commit all changes
-    db.commit()
-    
-    return BulkOperationResult(
-        success=success_count,
-        failed=len(errors),
-        errors=errors
+    return await _bulk_set_user_active(
+        db, current_user, bulk_request.ids, False, "user_bulk_deactivated",
+        "Cannot modify your own account status",
+        lambda row: {
+            "old_status": "active" if row.old_is_active else "inactive",
+            "new_status": "inactive",
+            "user_email": row.email
+        }
     )
 
 
 @router.post("/users/bulk/delete", response_model=BulkOperationResult)
-def bulk_delete_users(
+async def bulk_delete_users(
     bulk_request: BulkOperationRequest,
     current_user: User = Depends(get_current_admin),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Delete multiple users at once (soft delete by deactivating)."""
-    success_count = 0
-    errors = []
-    
-    for user_id in bulk_request.ids:
-        try:
-            user = db.query(User).filter(User.id == user_id).first()
-            
-            if not user:
-                errors.append(BulkOperationError(
-                    id=user_id,
-                    error="User not found"
-                ))
-                continue
-            
-            # Don't allow deleting yourself
-            if user.id == current_user.id:
-                errors.append(BulkOperationError(
-                    id=user_id,
-                    error="Cannot delete your own account"
-                ))
-                continue
-            
-            # Soft delete by deactivating
-            user.is_active = False
-            
-            # Create audit log
-            create_audit_log(
-                db=db,
-                user_id=current_user.id,
-                action="user_bulk_deleted",
-                resource_type="user",
-                resource_id=user_id,
-                details=json.dumps({
-                    "admin": current_user.email,
-                    "bulk_operation": True,
-                    "user_email": user.email,
-                    "user_display_name": user.display_name
-                })
-            )
-            
-            success_count += 1
-            
-        except Exception as e:
-            errors.append(BulkOperationError(
-                id=user_id,
-                error=str(e)
-            ))
-    
-    # Commit all changes
-    db.commit()
-    
-    return BulkOperationResult(
-        success=success_count,
-        failed=len(errors),
-        errors=errors
+    return await _bulk_set_user_active(
+        db, current_user, bulk_request.ids, False, "user_bulk_deleted",
+        "Cannot delete your own account",
+        lambda row: {
+            "user_email": row.email,
+            "user_display_name": row.display_name
+        }
     )
 
 
@@ -401,120 +279,56 @@ def bulk_delete_users(
 # MATCHES BULK OPERATIONS
 # ============================================================================
 
+async def _bulk_set_match_status(
+    db: AsyncSession,
+    current_user: User,
+    ids: List[str],
+    new_status: MatchStatus,
+    action: str,
+    include_score: bool = False
+) -> BulkOperationResult:
+    rows, errors = await _bulk_update(
+        db,
+        Match,
+        ids,
+        {"status": new_status.value},
+        "Match not found",
+        old_columns=("status",),
+        returning=(Match.score_total,) if include_score else ()
+    )
+
+    def details(row):
+        entry = {"old_status": str(row.old_status), "new_status": new_status.value}
+        if include_score:
+            entry["score"] = row.score_total
+        return entry
+
+    await create_audit_logs_async(db, _audit_entries(current_user, action, "match", rows, details))
+    await db.commit()
+
+    return BulkOperationResult(success=len(rows), failed=len(errors), errors=errors)
+
+
 @router.post("/matches/bulk/approve", response_model=BulkOperationResult)
-def bulk_approve_matches(
+async def bulk_approve_matches(
     bulk_request: BulkOperationRequest,
     current_user: User = Depends(get_current_admin),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Approve multiple matches at once (promote them)."""
-    success_count = 0
-    errors = []
-    
-    for match_id in bulk_request.ids:
-        try:
-            match = db.query(Match).filter(Match.id == match_id).first()
-            
-            if not match:
-                errors.append(BulkOperationError(
-                    id=match_id,
-                    error="Match not found"
-                ))
-                continue
-            
-            # Update status
-            old_status = match.status
-            match.status = MatchStatus.PROMOTED
-            
-            # Create audit log
-            create_audit_log(
-                db=db,
-                user_id=current_user.id,
-                action="match_bulk_approved",
-                resource_type="match",
-                resource_id=match_id,
-                details=json.dumps({
-                    "admin": current_user.email,
-                    "old_status": str(old_status),
-                    "new_status": "promoted",
-                    "bulk_operation": True,
-                    "score": match.score_total
-                })
-            )
-            
-            success_count += 1
-            
-        except Exception as e:
-            errors.append(BulkOperationError(
-                id=match_id,
-                error=str(e)
-            ))
-    
-    # Commit all changes
-    db.commit()
-    
-    return BulkOperationResult(
-        success=success_count,
-        failed=len(errors),
-        errors=errors
+    return await _bulk_set_match_status(
+        db, current_user, bulk_request.ids, MatchStatus.PROMOTED, "match_bulk_approved",
+        include_score=True
     )
 
 
 @router.post("/matches/bulk/reject", response_model=BulkOperationResult)
-def bulk_reject_matches(
+async def bulk_reject_matches(
     bulk_request: BulkOperationRequest,
     current_user: User = Depends(get_current_admin),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Reject multiple matches at once (suppress them)."""
-    success_count = 0
-    errors = []
-    
-    for match_id in bulk_request.ids:
-        try:
-            match = db.query(Match).filter(Match.id == match_id).first()
-            
-            if not match:
-                errors.append(BulkOperationError(
-                    id=match_id,
-                    error="Match not found"
-                ))
-                continue
-            
-            # Update status
-            old_status = match.status
-            match.status = MatchStatus.SUPPRESSED
-            
-            # Create audit log
-            create_audit_log(
-                db=db,
-                user_id=current_user.id,
-                action="match_bulk_rejected",
-                resource_type="match",
-                resource_id=match_id,
-                details=json.dumps({
-                    "admin": current_user.email,
-                    "old_status": str(old_status),
-                    "new_status": "suppressed",
-                    "bulk_operation": True
-                })
-            )
-            
-            success_count += 1
-            
-        except Exception as e:
-            errors.append(BulkOperationError(
-                id=match_id,
-                error=str(e)
-            ))
-    
-    # Commit all changes
-    db.commit()
-    
-    return BulkOperationResult(
-        success=success_count,
-        failed=len(errors),
-        errors=errors
+    return await _bulk_set_match_status(
+        db, current_user, bulk_request.ids, MatchStatus.SUPPRESSED, "match_bulk_rejected"
     )
-
-
@@ -7,8 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ...infrastructure.database.session import get_async_db
 from ...dependencies import get_current_admin
 from ...models import User
-from ...csrf import get_csrf_token, verify_csrf_token, csrf_protection
-from ...exceptions import AuthenticationError
+from ...csrf import verify_csrf_token, csrf_protection
 
 router = APIRouter()
 
@@ -34,7 +33,7 @@ async def get_csrf_token_endpoint(
             content={
                 "csrf_token": csrf_token,
                 "session_id": session_id,
-                "expires_in": csrf_protection.token_expiry_minutes * 60  # seconds
+                "expires_in": csrf_protection.token_ttl  # seconds
             }
         )
         
@@ -45,7 +44,7 @@ async def get_csrf_token_endpoint(
             httponly=True,
             secure=True,
             samesite="strict",
-            max_age=csrf_protection.token_expiry_minutes * 60
+            max_age=csrf_protection.token_ttl
         )
         
         return response
@@ -72,7 +71,7 @@ async def verify_csrf_token_endpoint(
                 detail="CSRF token not provided"
             )
         
-        is_valid = verify_csrf_token(request, csrf_token)
+        is_valid = await verify_csrf_token(request, csrf_token)
         
         return {
             "valid": is_valid,
@@ -98,7 +97,7 @@ async def refresh_csrf_token_endpoint(
     try:
         # Verify current token before refreshing
         csrf_token = request.headers.get("X-CSRF-Token")
-        if not csrf_token or not verify_csrf_token(request, csrf_token):
+        if not csrf_token or not await verify_csrf_token(request, csrf_token):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Invalid CSRF token"
@@ -112,12 +111,14 @@ async def refresh_csrf_token_endpoint(
                 detail="No active session found"
             )
         
-        # Refresh token
-        new_csrf_token = csrf_protection.refresh_token(session_id, str(current_user.id))
+        # Refresh token (the old one is revoked)
+        new_csrf_token = await csrf_protection.refresh_token(
+            session_id, str(current_user.id), old_token=csrf_token
+        )
         
         return {
             "csrf_token": new_csrf_token,
-            "expires_in": csrf_protection.token_expiry_minutes * 60,
+            "expires_in": csrf_protection.token_ttl,
             "message": "CSRF token refreshed successfully"
         }
         
@@ -140,7 +141,7 @@ async def revoke_csrf_token_endpoint(
     try:
         # Verify current token before revoking
         csrf_token = request.headers.get("X-CSRF-Token")
-        if not csrf_token or not verify_csrf_token(request, csrf_token):
+        if not csrf_token or not await verify_csrf_token(request, csrf_token):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Invalid CSRF token"
@@ -154,8 +155,8 @@ async def revoke_csrf_token_endpoint(
                 detail="No active session found"
             )
         
-        # Revoke token
-        revoked = csrf_protection.revoke_token(session_id)
+        # Revoke token; clearing the session cookie below invalidates the rest
+        revoked = await csrf_protection.revoke_token(csrf_token)
         
         response = JSONResponse(
             content={
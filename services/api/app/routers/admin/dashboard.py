@@ -4,17 +4,23 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
-from uuid import UUID
 
 from fastapi import APIRouter, Depends
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...cache import cache_get, cache_set
+from ...config import config
 from ...infrastructure.database.session import get_async_db
 from ...dependencies import get_current_admin, get_current_admin_dev
 from ...models import User, AuditLog
-from ...domains.matches.models.match import Match
-from ...domains.reports.models.report import Report
+from ...rollups import (
+    ensure_rollups,
+    get_report_daily_counts,
+    rollup_counts,
+    rollup_total,
+    utc_today,
+)
 
 router = APIRouter()
 
@@ -23,75 +29,30 @@ router = APIRouter()
 async def get_dashboard_stats(
     db: AsyncSession = Depends(get_async_db),
 ):
-    """Aggregate statistics for dashboard cards."""
-    total_users = (
-        await db.execute(select(func.count()).select_from(User))
-    ).scalar() or 0
-    active_users = (
-        await db.execute(
-            select(func.count()).select_from(User).where(User.is_active.is_(True))
-        )
-    ).scalar() or 0
-    new_users_30d = (
-        await db.execute(
-            select(func.count())
-            .select_from(User)
-            .where(
-                User.created_at
-                >= datetime.now(timezone.utc) - timedelta(days=30)
-            )
-        )
-    ).scalar() or 0
+    """Aggregate statistics for dashboard cards, read from the daily rollups."""
+    await ensure_rollups(db, "users", "reports", "matches")
+    today = utc_today()
+    month_start = today - timedelta(days=30)
+    week_start = today - timedelta(days=7)
 
-    total_reports = (
-        await db.execute(select(func.count()).select_from(Report))
-    ).scalar() or 0
-    pending_reports = (
-        await db.execute(
-            select(func.count()).select_from(Report).where(Report.status == "pending")
-        )
-    ).scalar() or 0
-    approved_reports = (
-        await db.execute(
-            select(func.count()).select_from(Report).where(Report.status == "approved")
-        )
-    ).scalar() or 0
+    total_users = await rollup_total(db, "users")
+    active_users = (await rollup_counts(db, "users", "active")).get("true", 0)
+    new_users_30d = await rollup_total(db, "users", start=month_start)
 
-    lost_reports = (
-        await db.execute(
-            select(func.count()).select_from(Report).where(Report.type == "lost")
-        )
-    ).scalar() or 0
-    found_reports = (
-        await db.execute(
-            select(func.count()).select_from(Report).where(Report.type == "found")
-        )
-    ).scalar() or 0
+    total_reports = await rollup_total(db, "reports")
+    report_statuses = await rollup_counts(db, "reports", "status")
+    pending_reports = report_statuses.get("pending", 0)
+    approved_reports = report_statuses.get("approved", 0)
 
-    total_matches = (
-        await db.execute(select(func.count()).select_from(Match))
-    ).scalar() or 0
-    promoted_matches = (
-        await db.execute(
-            select(func.count()).select_from(Match).where(Match.status == "promoted")
-        )
-    ).scalar() or 0
+    report_types = await rollup_counts(db, "reports", "type")
+    lost_reports = report_types.get("lost", 0)
+    found_reports = report_types.get("found", 0)
 
-    week_ago = datetime.now(timezone.utc) - timedelta(days=7)
-    reports_last_week = (
-        await db.execute(
-            select(func.count())
-            .select_from(Report)
-            .where(Report.created_at >= week_ago)
-        )
-    ).scalar() or 0
-    matches_last_week = (
-        await db.execute(
-            select(func.count())
-            .select_from(Match)
-            .where(Match.created_at >= week_ago)
-        )
-    ).scalar() or 0
+    total_matches = await rollup_total(db, "matches")
+    promoted_matches = (await rollup_counts(db, "matches", "status")).get("promoted", 0)
+
+    reports_last_week = await rollup_total(db, "reports", start=week_start)
+    matches_last_week = await rollup_total(db, "matches", start=week_start)
 
     return {
         "users": {
@@ -124,48 +85,14 @@ async def get_reports_chart(
 ):
     """Return daily counts of created and resolved reports."""
     days = max(1, min(90, days))
-    today = datetime.now(timezone.utc).date()
-    data: List[Dict[str, int]] = []
+    cache_key = f"dashboard:reports_chart:{days}:{utc_today().isoformat()}"
 
-    for offset in range(days):
-        day = today - timedelta(days=days - offset - 1)
-        start_of_day = datetime.combine(day, datetime.min.time()).replace(
-            tzinfo=timezone.utc
-        )
-        end_of_day = datetime.combine(day, datetime.max.time()).replace(
-            tzinfo=timezone.utc
-        )
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
 
-        created = (
-            await db.execute(
-                select(func.count())
-                .select_from(Report)
-                .where(
-                    Report.created_at >= start_of_day,
-                    Report.created_at <= end_of_day,
-                )
-            )
-        ).scalar() or 0
-
-        resolved = (
-            await db.execute(
-                select(func.count())
-                .select_from(Report)
-                .where(
-                    Report.updated_at >= start_of_day,
-                    Report.updated_at <= end_of_day,
-                    Report.is_resolved.is_(True),
-                )
-            )
-        ).scalar() or 0
-
-        data.append(
-            {
-                "date": day.strftime("%Y-%m-%d"),
-                "created": created,
-                "resolved": resolved,
-            }
-        )
+    data = await get_report_daily_counts(db, days)
+    await cache_set(cache_key, data, ttl=config.DASHBOARD_CHART_CACHE_TTL)
 
     return data
 
@@ -180,28 +107,19 @@ async def get_recent_activity(
     try:
         limit = max(1, min(100, limit))
         logs_result = await db.execute(
-            select(AuditLog).order_by(AuditLog.created_at.desc()).limit(limit)
+            select(AuditLog, User)
+            .outerjoin(User, User.id == AuditLog.user_id)
+            .order_by(AuditLog.created_at.desc())
+            .limit(limit)
         )
-        logs = logs_result.scalars().all()
+        rows = logs_result.all()
 
         # Handle case when no logs exist
-        if not logs:
+        if not rows:
             return {"activity": [], "count": 0}
 
-        user_ids = [
-            UUID(str(log.user_id))
-            for log in logs
-            if getattr(log, "user_id", None) is not None
-        ]
-        users_by_id: Dict[str, User] = {}
-        if user_ids:
-            users_result = await db.execute(select(User).where(User.id.in_(user_ids)))
-            users = users_result.scalars().all()
-            users_by_id = {str(u.id): u for u in users}
-
         activity: List[Dict[str, Optional[str]]] = []
-        for log in logs:
-            actor = users_by_id.get(str(getattr(log, "user_id", "")))
+        for log, actor in rows:
             activity.append(
                 {
                     "id": str(log.id),
@@ -214,7 +132,7 @@ async def get_recent_activity(
                     else None,
                     "actor": {
                         "id": str(actor.id) if actor else None,
-                        "email": actor.email if actor else None,
+                        "email": actor.email if actor else log.actor_email,
                         "display_name": actor.display_name if actor else None,
                     },
                 }
@@ -6,6 +6,7 @@ API endpoints for fraud detection management and analysis.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import uuid
 from typing import Dict, List, Optional
@@ -21,7 +22,10 @@ from ...dependencies import get_current_admin
 from ...models import User, FraudDetectionResult, FraudPattern, FraudDetectionLog
 from ...domains.reports.models.report import Report
 from ...services.fraud_detection_service import fraud_detection_service, FraudDetectionResult as ServiceResult
+from ...fraud_scoring import publish_models
+from ...job_queue import schedule_fraud_scoring
 from ...helpers import create_audit_log_async
+from ...rollups import ensure_rollups, rollup_counts, rollup_total
 
 router = APIRouter()
 
@@ -142,103 +146,37 @@ async def analyze_reports_for_fraud(
     current_user: User = Depends(get_current_admin),
     db: AsyncSession = Depends(get_async_db),
 ):
-    """Analyze reports for fraud detection."""
+    """
+    Fraud scores of reports.
+    
+    Reports are scored in the background when created or updated; this
+    returns the stored results and queues reports without one (or all of
+    them, with force_reanalysis) for scoring.
+    """
     try:
         if request.report_ids:
             # Analyze specific reports
-            reports_query = select(Report).where(Report.id.in_(request.report_ids))
-            result = await db.execute(reports_query)
-            reports = result.scalars().all()
+            report_ids = list(dict.fromkeys(request.report_ids))
         else:
             # Analyze recent pending reports
             recent_time = datetime.utcnow() - timedelta(hours=24)
-            reports_query = select(Report).where(
+            reports_query = select(Report.id).where(
                 Report.status == "pending",
                 Report.created_at >= recent_time
             ).limit(100)
-            result = await db.execute(reports_query)
-            reports = result.scalars().all()
+            report_ids = [str(report_id) for report_id in (await db.execute(reports_query)).scalars()]
         
-        if not reports:
+        if not report_ids:
             return {"message": "No reports found for analysis", "analyzed": 0}
         
-        # Convert reports to dict format for analysis
-        report_data = []
-        for report in reports:
-            report_dict = {
-                'id': report.id,
-                'title': report.title,
-                'description': report.description,
-                'type': report.type,
-                'category': report.category,
-                'is_urgent': report.is_urgent,
-                'reward_offered': report.reward_offered,
-                'reward_amount': report.reward_amount,
-                'contact_info': report.contact_info,
-                'location_city': report.location_city,
-                'location_address': report.location_address,
-                'latitude': report.latitude,
-                'longitude': report.longitude,
-                'images': report.images or [],
-                'image_hashes': report.image_hashes or [],
-                'created_at': report.created_at.isoformat() if report.created_at else None
-            }
-            report_data.append(report_dict)
-        
-        # Perform fraud analysis
-        analysis_results = await fraud_detection_service.batch_analyze_reports(report_data)
-        
-        # Store results in database
-        stored_results = []
-        for result in analysis_results:
-            # Check if result already exists and force_reanalysis is False
-            if not request.force_reanalysis:
-                existing_query = select(FraudDetectionResult).where(
-                    FraudDetectionResult.report_id == result.report_id
-                ).order_by(desc(FraudDetectionResult.created_at)).limit(1)
-                existing_result = await db.execute(existing_query)
-                existing = existing_result.scalar_one_or_none()
-                
-                if existing:
-                    continue
-            
-            # Create new fraud detection result
-            fraud_result = FraudDetectionResult(
-                id=str(uuid.uuid4()),
-                report_id=result.report_id,
-                risk_level=result.risk_level.value,
-                fraud_score=result.fraud_score,
-                confidence=result.confidence,
-                flags=result.flags,
-                details=result.details,
-                model_version=result.model_version,
-                detected_at=result.detected_at
-            )
-            
-            db.add(fraud_result)
-            stored_results.append(fraud_result)
-            
-            # Log the detection
-            log_entry = FraudDetectionLog(
-                id=str(uuid.uuid4()),
-                report_id=result.report_id,
-                detection_result_id=fraud_result.id,
-                analysis_type="automatic",
-                action_type="auto_detection",
-                triggered_by="system",
-                final_score=result.fraud_score,
-                final_risk_level=result.risk_level.value,
-                action_details={
-                    "fraud_score": result.fraud_score,
-                    "risk_level": result.risk_level.value,
-                    "flags_count": len(result.flags),
-                    "model_version": result.model_version
-                },
-                model_version=result.model_version
-            )
-            db.add(log_entry)
+        results_query = select(FraudDetectionResult).where(FraudDetectionResult.report_id.in_(report_ids))
+        stored_results = (await db.execute(results_query)).scalars().all()
         
-        await db.commit()
+        scored = {str(fraud_result.report_id) for fraud_result in stored_results}
+        queued = report_ids if request.force_reanalysis else [
+            report_id for report_id in report_ids if report_id not in scored
+        ]
+        await schedule_fraud_scoring(queued)
         
         # Create audit log
         await create_audit_log_async(
@@ -250,23 +188,26 @@ async def analyze_reports_for_fraud(
             details=json.dumps({
                 "admin": current_user.email,
                 "reports_analyzed": len(stored_results),
-                "total_reports": len(reports),
+                "reports_queued": len(queued),
+                "total_reports": len(report_ids),
                 "force_reanalysis": request.force_reanalysis
             }),
         )
         
         return {
-            "message": f"Analyzed {len(stored_results)} reports",
+            "message": f"{len(stored_results)} reports scored, {len(queued)} queued for scoring",
             "analyzed": len(stored_results),
-            "total_reports": len(reports),
+            "queued": len(queued),
+            "total_reports": len(report_ids),
             "results": [
                 {
-                    "report_id": result.report_id,
-                    "risk_level": result.risk_level.value,
-                    "fraud_score": result.fraud_score,
-                    "flags": result.flags
+                    "report_id": fraud_result.report_id,
+                    "risk_level": fraud_result.risk_level,
+                    "fraud_score": fraud_result.fraud_score,
+                    "flags": fraud_result.flags or [],
+                    "detected_at": fraud_result.detected_at.isoformat() if fraud_result.detected_at else None
                 }
-                for result in analysis_results
+                for fraud_result in stored_results
             ]
         }
         
@@ -411,16 +352,15 @@ async def get_flagged_reports(
 async def get_fraud_detection_stats(
     db: AsyncSession = Depends(get_async_db),
 ):
-    """Get fraud detection statistics."""
+    """Get fraud detection statistics, read from the daily rollups."""
     try:
         # Check if fraud detection tables exist
         try:
-            # Total detections
-            total_detections = (await db.execute(
-                select(func.count()).select_from(FraudDetectionResult)
-            )).scalar() or 0
+            await ensure_rollups(db, "fraud_results", "reports")
+            total_detections = await rollup_total(db, "fraud_results")
         except Exception:
             # Tables don't exist yet, return empty stats
+            await db.rollback()
             return FraudStatsResponse(
                 total_detections=0,
                 pending_review=0,
@@ -431,42 +371,17 @@ async def get_fraud_detection_stats(
                 accuracy_rate=0.0
             )
         
-        # Pending review
-        pending_review = (await db.execute(
-            select(func.count()).select_from(FraudDetectionResult)
-            .where(FraudDetectionResult.is_reviewed == False)
-        )).scalar() or 0
-        
-        # Confirmed fraud
-        confirmed_fraud = (await db.execute(
-            select(func.count()).select_from(FraudDetectionResult)
-            .where(FraudDetectionResult.is_confirmed_fraud == True)
-        )).scalar() or 0
-        
-        # False positives
-        false_positives = (await db.execute(
-            select(func.count()).select_from(FraudDetectionResult)
-            .where(
-                FraudDetectionResult.is_reviewed == True,
-                FraudDetectionResult.is_confirmed_fraud == False
-            )
-        )).scalar() or 0
+        # Pending review, confirmed fraud and false positives
+        review = await rollup_counts(db, "fraud_results", "review")
+        pending_review = review.get("pending", 0)
+        confirmed_fraud = review.get("confirmed", 0)
+        false_positives = review.get("false_positive", 0)
         
         # By risk level
-        risk_level_query = select(
-            FraudDetectionResult.risk_level,
-            func.count().label('count')
-        ).group_by(FraudDetectionResult.risk_level)
-        
-        risk_result = await db.execute(risk_level_query)
-        risk_levels = risk_result.fetchall()
-        
-        by_risk_level = {row.risk_level: row.count for row in risk_levels}
+        by_risk_level = await rollup_counts(db, "fraud_results", "risk_level")
         
         # Detection rate (detections per total reports)
-        total_reports = (await db.execute(
-            select(func.count()).select_from(Report)
-        )).scalar() or 0
+        total_reports = await rollup_total(db, "reports")
         
         detection_rate = (total_detections / total_reports * 100) if total_reports > 0 else 0
         
@@ -634,6 +549,7 @@ async def train_fraud_detection_models(
         
         # Train models
         await fraud_detection_service.train_models(training_data)
+        await asyncio.to_thread(publish_models)
         
         # Log training activity
         log_entry = FraudDetectionLog(
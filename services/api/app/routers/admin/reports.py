@@ -16,6 +16,7 @@ from ...dependencies import get_current_admin
 from ...helpers import create_audit_log_async
 from ...models import User
 from ...domains.reports.models.report import Report, ReportStatus
+from ...rollups import ensure_rollups, rollup_counts
 
 router = APIRouter()
 
@@ -162,38 +163,18 @@ async def list_reports(
 async def get_report_stats(
     db: AsyncSession = Depends(get_async_db),
 ):
-    """Aggregate report statistics by status and type."""
-    pending = (
-        await db.execute(
-            select(func.count()).select_from(Report).where(Report.status == "pending")
-        )
-    ).scalar() or 0
-    approved = (
-        await db.execute(
-            select(func.count()).select_from(Report).where(Report.status == "approved")
-        )
-    ).scalar() or 0
-    hidden = (
-        await db.execute(
-            select(func.count()).select_from(Report).where(Report.status == "hidden")
-        )
-    ).scalar() or 0
-    removed = (
-        await db.execute(
-            select(func.count()).select_from(Report).where(Report.status == "removed")
-        )
-    ).scalar() or 0
+    """Aggregate report statistics by status, type, category and city."""
+    await ensure_rollups(db, "reports")
 
-    lost = (
-        await db.execute(
-            select(func.count()).select_from(Report).where(Report.type == "lost")
-        )
-    ).scalar() or 0
-    found = (
-        await db.execute(
-            select(func.count()).select_from(Report).where(Report.type == "found")
-        )
-    ).scalar() or 0
+    statuses = await rollup_counts(db, "reports", "status")
+    pending = statuses.get("pending", 0)
+    approved = statuses.get("approved", 0)
+    hidden = statuses.get("hidden", 0)
+    removed = statuses.get("removed", 0)
+
+    types = await rollup_counts(db, "reports", "type")
+    lost = types.get("lost", 0)
+    found = types.get("found", 0)
 
     total = pending + approved + hidden + removed
 
@@ -215,6 +196,12 @@ async def get_report_stats(
             "lost": lost,
             "found": found,
         },
+        "by_category": await rollup_counts(db, "reports", "category"),
+        "by_city": {
+            city: count
+            for city, count in (await rollup_counts(db, "reports", "city")).items()
+            if city
+        },
     }
 
 
@@ -6,18 +6,20 @@ import json
 from typing import Optional
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, status
+from slowapi.util import get_remote_address
 from pydantic import BaseModel, EmailStr
 from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...infrastructure.database.session import get_async_db
 from ...dependencies import get_current_admin
+from ...cache import invalidate_principal
 from ...helpers import create_audit_log_async
 from ...models import User
 from ...domains.matches.models.match import Match
 from ...domains.reports.models.report import Report
-from ...auth import get_password_hash
+from ...auth import get_password_hash_async
 
 router = APIRouter()
 
@@ -180,6 +182,7 @@ async def list_users(
 @router.post("", status_code=status.HTTP_201_CREATED)
 async def create_user(
     payload: UserCreateRequest,
+    request: Request,
     current_user: User = Depends(get_current_admin),
     db: AsyncSession = Depends(get_async_db),
 ):
@@ -194,7 +197,7 @@ async def create_user(
     user = User(
         id=uuid4(),
         email=payload.email,
-        password=get_password_hash(payload.password),
+        password=await get_password_hash_async(payload.password, get_remote_address(request)),
         display_name=payload.display_name or payload.email.split("@")[0],
         phone_number=payload.phone_number,
         role=payload.role,
@@ -345,6 +348,7 @@ async def update_user(
 
     await db.commit()
     await db.refresh(user)
+    await invalidate_principal(user.id)
 
     await create_audit_log_async(
         db=db,
@@ -374,6 +378,7 @@ async def update_user_role(
     user.role = payload.role
     await db.commit()
     await db.refresh(user)
+    await invalidate_principal(user.id)
 
     await create_audit_log_async(
         db=db,
@@ -425,6 +430,7 @@ async def update_user_status(
     
     await db.commit()
     await db.refresh(user)
+    await invalidate_principal(user.id)
 
     await create_audit_log_async(
         db=db,
@@ -458,6 +464,7 @@ async def ban_user(
     user.status = "banned"
     await db.commit()
     await db.refresh(user)
+    await invalidate_principal(user.id)
 
     await create_audit_log_async(
         db=db,
@@ -486,6 +493,7 @@ async def unban_user(
     user.status = "active"
     await db.commit()
     await db.refresh(user)
+    await invalidate_principal(user.id)
 
     await create_audit_log_async(
         db=db,
@@ -513,6 +521,7 @@ async def suspend_user(
     user.status = "suspended"
     await db.commit()
     await db.refresh(user)
+    await invalidate_principal(user.id)
 
     await create_audit_log_async(
         db=db,
@@ -539,6 +548,7 @@ async def activate_user(
     user.status = "active"
     await db.commit()
     await db.refresh(user)
+    await invalidate_principal(user.id)
 
     await create_audit_log_async(
         db=db,
@@ -566,6 +576,7 @@ async def delete_user(
     user.status = "deleted"
     await db.commit()
     await db.refresh(user)
+    await invalidate_principal(user.id)
 
     await create_audit_log_async(
         db=db,
@@ -1,12 +1,19 @@
 """Simple authentication routes."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from slowapi.util import get_remote_address
 from sqlalchemy.orm import Session
 
 from ..models import User
 from ..schemas import UserRegister, UserLogin, Token, UserResponse
-from ..auth import get_password_hash, verify_password, create_access_token, decode_token
+from ..auth import (
+    get_password_hash, verify_password, verify_and_update_password,
+    create_access_token, decode_token
+)
 from ..dependencies import get_current_user
-from ..exceptions import ValidationError, ConflictError, AuthenticationError
+from ..exceptions import (
+    ValidationError, ConflictError, AuthenticationError,
+    RateLimitError, ServiceUnavailableError
+)
 from ..validation import UserValidationMixin
 
 router = APIRouter()
@@ -30,7 +37,7 @@ def get_sync_db():
         db.close()
 
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserRegister, db: Session = Depends(get_sync_db)):
+def register(user_data: UserRegister, request: Request, db: Session = Depends(get_sync_db)):
     """Register a new user."""
     try:
         # Validate input data
@@ -52,9 +59,10 @@ def register(user_data: UserRegister, db: Session = Depends(get_sync_db)):
             raise ConflictError("Email already registered")
         
         # Create new user
+        hashed_password = get_password_hash(validated_password, get_remote_address(request))
         user = User(
             email=validated_email,
-            password=get_password_hash(validated_password),
+            password=hashed_password,
             display_name=validated_display_name,
             role="user"
         )
@@ -84,6 +92,8 @@ def register(user_data: UserRegister, db: Session = Depends(get_sync_db)):
     except ConflictError:
         # Re-raise conflict errors as-is
         raise
+    except (RateLimitError, ServiceUnavailableError):
+        raise
     except Exception as e:
         # Handle unexpected errors
         print(f"Registration error: {e}")
@@ -97,7 +107,7 @@ def register(user_data: UserRegister, db: Session = Depends(get_sync_db)):
 
 
 @router.post("/login", response_model=Token)
-def login(credentials: UserLogin, db: Session = Depends(get_sync_db)):
+def login(credentials: UserLogin, request: Request, db: Session = Depends(get_sync_db)):
     """Login and get access token."""
     try:
         # Validate email format
@@ -107,12 +117,23 @@ def login(credentials: UserLogin, db: Session = Depends(get_sync_db)):
         # Find user
         user = db.query(User).filter(User.email == validated_email).first()
         
-        if not user or not verify_password(credentials.password, user.password):
+        if not user:
+            raise AuthenticationError("Incorrect email or password")
+        
+        valid, new_hash = verify_and_update_password(
+            credentials.password, user.password, get_remote_address(request)
+        )
+        if not valid:
             raise AuthenticationError("Incorrect email or password")
         
         if not user.is_active:
             raise AuthenticationError("User account is disabled")
         
+        # Hash parameters changed since this password was stored
+        if new_hash:
+            user.password = new_hash
+            db.commit()
+        
         # Create audit log for user login
         from ..helpers import create_audit_log
         create_audit_log(
@@ -135,6 +156,8 @@ def login(credentials: UserLogin, db: Session = Depends(get_sync_db)):
     except AuthenticationError:
         # Re-raise authentication errors as-is
         raise
+    except (RateLimitError, ServiceUnavailableError):
+        raise
     except Exception as e:
         # Handle unexpected errors
         print(f"Login error: {e}")
@@ -210,13 +233,22 @@ def reset_password(token: str, password: str, db: Session = Depends(get_sync_db)
 def change_password(
     current_password: str,
     new_password: str,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_sync_db)
 ):
     """Change user password."""
     try:
+        # The authenticated user may come from the principal cache, which
+        # carries no password hash, so load the row being updated
+        user = db.get(User, current_user.id)
+        if user is None:
+            raise AuthenticationError("User not found")
+        
+        client_ip = get_remote_address(request)
+        
         # Verify current password
-        if not verify_password(current_password, current_user.password):
+        if not verify_password(current_password, user.password, client_ip):
             raise AuthenticationError("Current password is incorrect")
         
         # Validate new password
@@ -224,7 +256,7 @@ def change_password(
         validator.validate_password(new_password)
         
         # Update password
-        current_user.password = get_password_hash(new_password)
+        user.password = get_password_hash(new_password, client_ip)
         db.commit()
         
         return {"message": "Password changed successfully"}
@@ -233,6 +265,8 @@ def change_password(
         raise
     except AuthenticationError:
         raise
+    except (RateLimitError, ServiceUnavailableError):
+        raise
     except Exception as e:
         print(f"Change password error: {e}")
         raise HTTPException(
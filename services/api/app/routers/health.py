@@ -8,15 +8,13 @@ from pydantic import BaseModel
 from typing import Dict, Any, Optional
 import asyncio
 import time
+import httpx
 import psutil
 import os
 from datetime import datetime, timezone
 
 from ..config import config
-from ..clients import get_nlp_client, get_vision_client
-from ..cache import get_redis_client
-from ..storage import get_minio_client
-from ..infrastructure.database.session import check_database_health
+from ..monitoring_system import monitoring_system
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -68,9 +66,7 @@ async def health_check():
     # Determine overall status
     overall_status = "healthy"
     for dep_name, dep_health in dependencies.items():
-        if dep_health.get("status") == "unhealthy":
-            overall_status = "degraded"
-        elif dep_health.get("status") == "unavailable":
+        if dep_health.get("status") != "healthy":
             overall_status = "degraded"
     
     return HealthStatus(
@@ -125,110 +121,13 @@ async def metrics_endpoint():
     }
 
 async def check_all_dependencies() -> Dict[str, Any]:
-    """Check health of all service dependencies"""
-    dependencies = {}
-    
-    # Database health
-    try:
-        db_health = await check_database_health()
-        dependencies["database"] = db_health
-    except Exception as e:
-        dependencies["database"] = {
-            "status": "unhealthy",
-            "error": str(e),
-            "response_time_ms": None
-        }
-    
-    # Redis health
-    try:
-        redis_client = get_redis_client()
-        start_time = time.time()
-        redis_health = await redis_client.health_check()
-        response_time = (time.time() - start_time) * 1000
-        
-        dependencies["redis"] = {
-            **redis_health,
-            "response_time_ms": response_time
-        }
-    except Exception as e:
-        dependencies["redis"] = {
-            "status": "unhealthy",
-            "error": str(e),
-            "response_time_ms": None
-        }
-    
-    # MinIO health
-    try:
-        minio_client = get_minio_client()
-        if minio_client:
-            start_time = time.time()
-            minio_health = minio_client.health_check()
-            response_time = (time.time() - start_time) * 1000
-            
-            dependencies["minio"] = {
-                **minio_health,
-                "response_time_ms": response_time
-            }
-        else:
-            dependencies["minio"] = {
-                "status": "unavailable",
-                "error": "MinIO client not available",
-                "response_time_ms": None
-            }
-    except Exception as e:
-        dependencies["minio"] = {
-            "status": "unhealthy",
-            "error": str(e),
-            "response_time_ms": None
-        }
-    
-    # NLP Service health
-    try:
-        start_time = time.time()
-        nlp_client = get_nlp_client()
-        # Test direct HTTP call
-        import httpx
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{config.NLP_SERVICE_URL}/health", timeout=5.0)
-            response_time = (time.time() - start_time) * 1000
-            
-            dependencies["nlp"] = {
-                "status": "healthy" if response.status_code == 200 else "unhealthy",
-                "response_time_ms": response_time,
-                "version": response.json().get("version", "unknown") if response.status_code == 200 else None,
-                "error": None if response.status_code == 200 else f"HTTP {response.status_code}"
-            }
-    except Exception as e:
-        dependencies["nlp"] = {
-            "status": "unavailable",
-            "error": str(e),
-            "response_time_ms": None
-        }
-    
-    # Vision Service health
-    try:
-        start_time = time.time()
-        vision_client = get_vision_client()
-        # Test direct HTTP call
-        import httpx
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{config.VISION_SERVICE_URL}/health", timeout=5.0)
-            response_time = (time.time() - start_time) * 1000
-            
-            dependencies["vision"] = {
-                "status": "healthy" if response.status_code == 200 else "unhealthy",
-                "response_time_ms": response_time,
-                "version": response.json().get("version", "unknown") if response.status_code == 200 else None,
-                "error": None if response.status_code == 200 else f"HTTP {response.status_code}"
-            }
-    except Exception as e:
-        dependencies["vision"] = {
-            "status": "unavailable",
-            "error": str(e),
-            "response_time_ms": None
-        }
-    
-    return dependencies
+    """
+    Health of all service dependencies, from the monitoring system's shared
+    health cache (the monitoring loop's last run while it is fresh). With
+    ENABLE_HEALTH_CACHE off, every call runs the checks.
+    """
+    max_age = None if config.ENABLE_HEALTH_CACHE else 0
+    return (await monitoring_system.health_checker.get_health_status(max_age))["checks"]
 
 def get_system_metrics() -> Dict[str, Any]:
     """Get system resource metrics"""
@@ -312,7 +211,6 @@ async def external_service_health(service_name: str):
         raise HTTPException(status_code=404, detail=f"Service {service_name} not found")
     
     try:
-        import httpx
         async with httpx.AsyncClient() as client:
             start_time = time.time()
             response = await client.get(f"{service_urls[service_name]}/health", timeout=10.0)
@@ -7,14 +7,14 @@ and mobile-specific features.
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, BackgroundTasks
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func, desc
+from sqlalchemy import select, and_, or_, func, desc, delete
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 import logging
 import uuid
 
 from ..infrastructure.database.session import get_async_db
-from ..models import User
+from ..models import User, FraudDetectionLog, FraudDetectionResult
 from ..domains.reports.models.report import Report, ReportType, ReportStatus
 from ..domains.matches.models.match import Match, MatchStatus
 from ..schemas import UserResponse
@@ -23,6 +23,9 @@ from ..domains.matches.schemas.match_schemas import MatchResponse
 from ..dependencies import get_current_user
 from ..cache import cache_get, cache_set, cache_delete
 from ..storage import get_minio_client, generate_object_name, validate_file_type
+from ..media_uploads import resolve_uploads
+from ..media_blobs import attach_media, delete_report_media
+from ..job_queue import schedule_fraud_scoring
 from ..clients import get_nlp_client, get_vision_client
 from ..config import config
 
@@ -153,6 +156,7 @@ async def create_quick_report(
     """
     try:
         logger.info(f"Creating quick report for user {user.id}")
+        uploads = {}  # Direct uploads to attach: media id -> object name
         
         # Check content type
         content_type = request.headers.get("content-type", "")
@@ -178,6 +182,16 @@ async def create_quick_report(
                 "images": []
             }
             
+            # Images uploaded directly to storage (POST /v1/media/uploads)
+            if form_data.get("upload_ids"):
+                try:
+                    import json
+                    upload_ids = json.loads(form_data.get("upload_ids"))
+                except (TypeError, ValueError):
+                    upload_ids = []
+                uploads = await resolve_uploads(str(user.id), upload_ids)
+                report_data["images"] = list(uploads.values())
+            
             # Parse colors if it's a JSON string
             if isinstance(report_data["colors"], str):
                 try:
@@ -222,6 +236,9 @@ async def create_quick_report(
             # Handle JSON data
             json_data = await request.json()
             report_data = json_data
+            if report_data.get("upload_ids"):
+                uploads = await resolve_uploads(str(user.id), report_data["upload_ids"])
+                report_data["images"] = (report_data.get("images") or []) + list(uploads.values())
             logger.info(f"JSON report data: {report_data}")
         
         # Create report
@@ -249,6 +266,9 @@ async def create_quick_report(
         )
         
         db.add(report)
+        if uploads:
+            await db.flush()
+            await attach_media(db, report.id, list(uploads))
         await db.commit()
         await db.refresh(report)
         
@@ -258,6 +278,7 @@ async def create_quick_report(
         
         background_tasks.add_task(generate_report_embeddings, report.id)
         background_tasks.add_task(find_initial_matches, report.id)
+        background_tasks.add_task(schedule_fraud_scoring, [report.id])
         
         logger.info(f"Quick report created: {report.id}")
         
@@ -726,6 +747,7 @@ async def get_report(
 async def update_report(
     report_id: str,
     request: Request,
+    background_tasks: BackgroundTasks,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_db)
 ):
@@ -774,6 +796,7 @@ async def update_report(
         
         await db.commit()
         await db.refresh(report)
+        background_tasks.add_task(schedule_fraud_scoring, [report.id])
         
         return ReportResponse.from_orm(report)
         
@@ -814,6 +837,16 @@ async def delete_report(
                 detail="Report not found"
             )
         
+        # Rows referencing the report go in the same transaction; its
+        # photos' blobs are released for the collector
+        await delete_report_media(db, report.id)
+        await db.execute(delete(FraudDetectionLog).where(FraudDetectionLog.report_id == report.id))
+        await db.execute(delete(FraudDetectionResult).where(FraudDetectionResult.report_id == report.id))
+        await db.execute(
+            delete(Match).where(
+                or_(Match.source_report_id == report.id, Match.candidate_report_id == report.id)
+            )
+        )
         await db.delete(report)
         await db.commit()
         
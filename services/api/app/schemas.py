@@ -5,10 +5,12 @@ These are temporary schemas to maintain backward compatibility
 while the full domain migration is completed.
 """
 
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import BaseModel, EmailStr, Field, validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
+from .config import config
+
 
 class UserRegister(BaseModel):
     email: EmailStr
@@ -47,17 +49,30 @@ class UserResponse(BaseModel):
 
 
 class BulkOperationRequest(BaseModel):
-    operation: str
-    resource_ids: List[str]
-    parameters: Optional[Dict[str, Any]] = None
+    ids: List[str] = Field(..., min_length=1, max_length=config.BULK_OPERATION_MAX_IDS)
+
+
+class BulkOperationError(BaseModel):
+    id: str
+    error: str
 
 
 class BulkOperationResult(BaseModel):
-    success_count: int
-    failed_count: int
-    errors: List[str] = []
+    success: int
+    failed: int
+    errors: List[BulkOperationError] = []
 
 
-class BulkOperationError(BaseModel):
-    resource_id: str
-    error: str
+class DirectUploadRequest(BaseModel):
+    content_type: str
+    size: int = Field(..., gt=0, le=config.MAX_FILE_SIZE)
+    filename: Optional[str] = None
+
+
+class DirectUploadResponse(BaseModel):
+    upload_id: str
+    upload_url: str
+    method: str = "PUT"
+    headers: Dict[str, str]
+    object_name: str
+    expires_in: int
@@ -0,0 +1,223 @@
+"""
+Near-Duplicate Report Index
+===========================
+Finds earlier reports whose text or photos are near-copies of a report, for
+the duplicate_content fraud pattern (the same scam post reposted from
+several accounts).
+
+Text: MinHash signatures over word 3-gram shingles of the title and
+description, split into bands for locality-sensitive hashing. Two reports
+whose shingle sets have Jaccard similarity 0.8 share a band bucket ~95% of
+the time (~60% at 0.7); candidates from the buckets are then confirmed by
+comparing full signatures against FRAUD_DUPLICATE_THRESHOLD.
+
+Photos: 64-bit perceptual hashes split into four 16-bit chunks. By
+pigeonhole, hashes within Hamming distance 3 share at least one chunk, so
+chunk buckets find them without comparing against every photo.
+
+Buckets are Redis sets shared by the API and the worker, updated as reports
+are analyzed. Every key expires FRAUD_DUPLICATE_WINDOW_DAYS after its last
+update, so a lookup costs a few bucket reads however many reports exist.
+"""
+import hashlib
+import logging
+import re
+import zlib
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3  # Words per shingle
+MIN_SHINGLES = 5  # Shorter texts ("lost black wallet") are too generic to compare
+
+PHASH_CHUNKS = 4
+PHASH_MAX_DISTANCE = PHASH_CHUNKS - 1  # Largest distance the chunk buckets are guaranteed to find
+
+MAX_CANDIDATES = 200  # Verified per lookup; the rest of an oversized bucket is ignored
+
+_WORD_RE = re.compile(r"\w+")
+
+# Universal hashing (a * h + b) mod p, truncated to 32 bits. The seed is
+# fixed: signatures must agree across processes and restarts.
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_PERMUTATIONS = np.random.RandomState(1).randint(
+    1, int(_MERSENNE_PRIME), size=(2, NUM_PERM), dtype=np.uint64
+)
+
+
+def shingles(text: str) -> Set[str]:
+    """Word 3-grams of a normalized (lowercase, punctuation-free) text."""
+    words = _WORD_RE.findall(text.lower())
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(items: Set[str]) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint32 values) of a non-empty set of shingles."""
+    hashes = np.fromiter(
+        (zlib.crc32(item.encode()) for item in items), dtype=np.uint64, count=len(items)
+    )
+    a, b = _PERMUTATIONS
+    with np.errstate(over="ignore"):
+        permuted = ((np.outer(hashes, a) + b) % _MERSENNE_PRIME) & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def signature_similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.count_nonzero(first == second)) / NUM_PERM
+
+
+def _band_keys(signature: np.ndarray) -> List[str]:
+    return [
+        f"fraud:lsh:{band}:{hashlib.blake2b(signature[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).hexdigest()}"
+        for band in range(BANDS)
+    ]
+
+
+def _phash_keys(phashes: List[str]) -> List[str]:
+    width = 16 // PHASH_CHUNKS
+    return [
+        f"fraud:phash:{chunk}:{phash[chunk * width:(chunk + 1) * width]}"
+        for phash in phashes
+        for chunk in range(PHASH_CHUNKS)
+    ]
+
+
+def _normalize_phashes(values: List[Any]) -> List[str]:
+    """64-bit perceptual hashes as 16 lowercase hex digits; anything else is dropped."""
+    phashes = []
+    for value in values or []:
+        value = str(value).lower()
+        if len(value) == 16:
+            try:
+                int(value, 16)
+            except ValueError:
+                continue
+            phashes.append(value)
+    return sorted(set(phashes))
+
+
+def _entry_key(report_id: str) -> str:
+    return f"fraud:dup:{report_id}"
+
+
+class DuplicateIndex:
+    """LSH (text) and chunk (photo) bucket index of analyzed reports in Redis."""
+
+    def __init__(self):
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from ..cache import get_redis_client
+            self._client = get_redis_client().client
+        return self._client
+
+    async def check(self, report_data: Dict[str, Any], index: bool = True) -> List[Dict[str, Any]]:
+        """
+        Near-duplicates of a report posted by other users, then (by default)
+        add or update the report in the index.
+
+        Fails open: returns no matches if Redis is unavailable.
+
+        Returns:
+            Matches as {"report_id", "kind" ("text" or "image"), "similarity"}
+        """
+        report_id = str(report_data["id"]) if report_data.get("id") else None
+        owner_id = str(report_data.get("owner_id") or "")
+        text = f"{report_data.get('title') or ''} {report_data.get('description') or ''}"
+        items = shingles(text)
+        signature = minhash(items) if len(items) >= MIN_SHINGLES else None
+        phashes = _normalize_phashes(report_data.get("image_hashes"))
+
+        try:
+            matches = await self._find(report_id, owner_id, signature, phashes)
+            if index and report_id and report_id != "unknown":
+                await self._index(report_id, owner_id, signature, phashes)
+            return matches
+        except Exception as e:
+            logger.warning(f"Duplicate index unavailable for report {report_id}: {e}")
+            return []
+
+    async def _find(self, report_id: Optional[str], owner_id: str, signature: Optional[np.ndarray],
+                    phashes: List[str]) -> List[Dict[str, Any]]:
+        keys = (_band_keys(signature) if signature is not None else []) + _phash_keys(phashes)
+        if not keys:
+            return []
+
+        pipeline = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.srandmember(key, MAX_CANDIDATES)
+        candidates: Set[str] = set()
+        for members in await pipeline.execute():
+            candidates.update(members or [])
+        candidates.discard(report_id)
+        candidates = sorted(candidates)[:MAX_CANDIDATES]
+        if not candidates:
+            return []
+
+        pipeline = self.client.pipeline(transaction=False)
+        for candidate in candidates:
+            pipeline.hgetall(_entry_key(candidate))
+        entries = await pipeline.execute()
+
+        matches = []
+        for candidate, entry in zip(candidates, entries):
+            if not entry or (owner_id and entry.get("owner") == owner_id):
+                continue  # Expired, or the same user reposting their own report
+
+            if signature is not None and entry.get("minhash"):
+                other = np.frombuffer(bytes.fromhex(entry["minhash"]), dtype=np.uint32)
+                similarity = signature_similarity(signature, other)
+                if similarity >= config.FRAUD_DUPLICATE_THRESHOLD:
+                    matches.append({"report_id": candidate, "kind": "text", "similarity": round(similarity, 3)})
+                    continue
+
+            other_phashes = [value for value in (entry.get("phashes") or "").split(",") if value]
+            distance = min(
+                (bin(int(mine, 16) ^ int(theirs, 16)).count("1") for mine in phashes for theirs in other_phashes),
+                default=None,
+            )
+            if distance is not None and distance <= PHASH_MAX_DISTANCE:
+                matches.append({"report_id": candidate, "kind": "image", "similarity": round(1 - distance / 64, 3)})
+
+        return matches
+
+    async def _index(self, report_id: str, owner_id: str, signature: Optional[np.ndarray],
+                     phashes: List[str]) -> None:
+        """Add or update a report, leaving the buckets of its previous version."""
+        entry_key = _entry_key(report_id)
+        previous = await self.client.hgetall(entry_key)
+
+        keys = (_band_keys(signature) if signature is not None else []) + _phash_keys(phashes)
+        stale: List[str] = []
+        if previous:
+            old_keys = _phash_keys([value for value in (previous.get("phashes") or "").split(",") if value])
+            if previous.get("minhash"):
+                old_keys += _band_keys(np.frombuffer(bytes.fromhex(previous["minhash"]), dtype=np.uint32))
+            stale = sorted(set(old_keys) - set(keys))
+
+        ttl = config.FRAUD_DUPLICATE_WINDOW_DAYS * 86400
+        pipeline = self.client.pipeline(transaction=False)
+        for key in stale:
+            pipeline.srem(key, report_id)
+        for key in keys:
+            pipeline.sadd(key, report_id)
+            pipeline.expire(key, ttl)
+        pipeline.delete(entry_key)
+        pipeline.hset(entry_key, mapping={
+            "owner": owner_id,
+            "minhash": signature.tobytes().hex() if signature is not None else "",
+            "phashes": ",".join(phashes),
+        })
+        pipeline.expire(entry_key, ttl)
+        await pipeline.execute()
@@ -7,11 +7,17 @@ and heuristics to identify potentially fraudulent or suspicious reports.
 
 import asyncio
 import logging
+import multiprocessing
+import pickle
 import re
 import json
-from typing import Dict, List, Optional, Tuple, Any
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Set, Tuple, Any
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -21,10 +27,30 @@ from sklearn.preprocessing import StandardScaler
 import joblib
 import hashlib
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
+from ..config import config
 from ..models import FraudRiskLevel
+from .duplicate_index import DuplicateIndex
 
 logger = logging.getLogger(__name__)
 
+# Contact details that are placeholders rather than a way to reach someone
+FAKE_CONTACT_RE = re.compile(r'(123-456-7890|000-000-0000|test@test\.com)')
+
+CAPS_RATIO_THRESHOLD = 0.3
+REPEATED_WORD_MIN_COUNT = 4  # Occurrences before a word counts as repeated
+
+ML_FEATURE_COLUMNS = [
+    "title_length", "description_length", "reward_amount", "is_urgent", "reward_offered",
+    "has_latitude", "has_longitude", "image_count", "location_city_length", "location_address_length",
+]
+
 
 @dataclass
 class FraudDetectionResult:
@@ -49,6 +75,158 @@ class FraudPattern:
     keywords: Optional[List[str]] = None
 
 
+def _trie_regex(words: List[str]) -> str:
+    """Alternation of words factored into a prefix trie, so the regex engine tries one branch per character."""
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if "" in node else group
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Finds which of many keywords occur in a text in one pass.
+
+    Equivalent to testing ``keyword in text`` for every keyword, overlaps
+    included. Uses an Aho-Corasick automaton when pyahocorasick is
+    installed; otherwise a trie-factored regex tried at every position
+    through a zero-width lookahead, which reports the longest keyword
+    starting there, plus every keyword contained in it (e.g. "instant" in
+    "instant reward").
+    """
+
+    def __init__(self, keywords: List[str]):
+        ordered = sorted({keyword.lower() for keyword in keywords}, key=len, reverse=True)
+        self.automaton = None
+        self.regex = None
+        if not ordered:
+            return
+
+        if AHOCORASICK_AVAILABLE:
+            self.automaton = ahocorasick.Automaton()
+            for keyword in ordered:
+                self.automaton.add_word(keyword, keyword)
+            self.automaton.make_automaton()
+        else:
+            self.regex = re.compile("(?=(%s))" % _trie_regex(ordered))
+            self.contained = {keyword: [other for other in ordered if other in keyword] for keyword in ordered}
+
+    def find(self, text: str) -> Set[str]:
+        """Keywords occurring in text (which must already be lowercase)."""
+        if self.automaton is not None:
+            return {keyword for _, keyword in self.automaton.iter(text)}
+
+        found: Set[str] = set()
+        if self.regex is not None:
+            for keyword in set(self.regex.findall(text)):
+                found.update(self.contained[keyword])
+        return found
+
+
+@dataclass
+class TextFeatures:
+    """
+    Text features of a batch of reports, one matrix row per report.
+
+    Columns: matched keyword count per keyword pattern, a 0/1 hit per regex
+    pattern, then the caps ratio and the number of repeated words. The
+    matched keywords and repeated words themselves are kept per report for
+    flags and details.
+    """
+    matrix: np.ndarray
+    columns: List[str]
+    keyword_matches: List[Set[str]] = field(default_factory=list)
+    repeated_words: List[List[str]] = field(default_factory=list)
+
+
+@dataclass
+class MLScores:
+    """Model outputs for a batch, one entry per report (None when the model isn't trained)."""
+    anomaly_scores: Optional[np.ndarray] = None
+    fraud_probabilities: Optional[np.ndarray] = None
+    error: Optional[str] = None
+
+
+def _parse_reward(reward_amount: Any) -> float:
+    try:
+        return float(str(reward_amount).replace('$', '').replace(',', '')) if reward_amount else 0.0
+    except ValueError:
+        return 0.0
+
+
+def _score_features(models: Tuple[Any, Any, Any], features: np.ndarray) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """Run each model once over a feature matrix, scaled like the training data."""
+    scaler, isolation_model, classification_model = models
+    if hasattr(scaler, "mean_"):
+        features = scaler.transform(features)
+    
+    anomaly_scores = isolation_model.decision_function(features) if isolation_model is not None else None
+    
+    fraud_probabilities = None
+    if classification_model is not None:
+        classes = list(classification_model.classes_)
+        if 1.0 in classes:
+            fraud_probabilities = classification_model.predict_proba(features)[:, classes.index(1.0)]
+        else:
+            # Trained without any confirmed fraud
+            fraud_probabilities = np.zeros(len(features))
+    
+    return anomaly_scores, fraud_probabilities
+
+
+# Models held by an inference process: (generation, (scaler, isolation_model, classification_model))
+_process_models: Optional[Tuple[str, Tuple[Any, Any, Any]]] = None
+
+
+def _score_in_process(generation: str, payload: Optional[bytes], features: np.ndarray):
+    """
+    Inference pool entry point. Models are sent (pickled) only when a process
+    doesn't hold the current generation yet: it returns None and the caller
+    retries with the payload.
+    """
+    global _process_models
+    if payload is not None:
+        _process_models = (generation, pickle.loads(payload))
+    if _process_models is None or _process_models[0] != generation:
+        return None
+    return _score_features(_process_models[1], features)
+
+
+_inference_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_inference_executor() -> ProcessPoolExecutor:
+    global _inference_executor
+    if _inference_executor is None:
+        # spawn: don't fork the event loop, sockets and threads of the parent
+        _inference_executor = ProcessPoolExecutor(
+            max_workers=config.FRAUD_ML_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _inference_executor
+
+
+def shutdown_inference_executor() -> None:
+    """Stop the ML inference pool."""
+    global _inference_executor
+    if _inference_executor is not None:
+        _inference_executor.shutdown(wait=False, cancel_futures=True)
+        _inference_executor = None
+
+
 class FraudDetectionService:
     """
     Advanced fraud detection service using multiple ML algorithms and heuristics.
@@ -57,9 +235,36 @@ class FraudDetectionService:
     def __init__(self):
         self.models = {}
         self.patterns = self._initialize_fraud_patterns()
+        self.keyword_patterns = [pattern for pattern in self.patterns if pattern.keywords]
+        self.regex_patterns = [
+            (pattern, re.compile(pattern.regex_pattern)) for pattern in self.patterns if pattern.regex_pattern
+        ]
+        self.keyword_matcher = KeywordMatcher(
+            [keyword for pattern in self.keyword_patterns for keyword in pattern.keywords]
+        )
+        self.text_columns = (
+            [f"keywords_{pattern.pattern_type}" for pattern in self.keyword_patterns]
+            + [f"regex_{pattern.pattern_type}" for pattern, _ in self.regex_patterns]
+            + ["caps_ratio", "repeated_words"]
+        )
+        # Matrix columns each keyword counts towards (a keyword may be listed by several patterns)
+        self.keyword_columns: Dict[str, List[int]] = {}
+        for column, pattern in enumerate(self.keyword_patterns):
+            for keyword in pattern.keywords:
+                self.keyword_columns.setdefault(keyword.lower(), []).append(column)
+        self.text_weights = np.array(
+            [pattern.weight for pattern in self.keyword_patterns]
+            + [pattern.weight for pattern, _ in self.regex_patterns]
+        )
         self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
         self.scaler = StandardScaler()
+        self.isolation_model = None
+        self.classification_model = None
         self.model_version = "1.0.0"
+        # Changes whenever the models do, so inference processes know to reload them
+        self.model_generation = uuid.uuid4().hex
+        self._model_payload: Optional[bytes] = None
+        self.duplicate_index = DuplicateIndex()
         
     def _initialize_fraud_patterns(self) -> List[FraudPattern]:
         """Initialize known fraud patterns and indicators."""
@@ -143,6 +348,11 @@ class FraudDetectionService:
         Returns:
             FraudDetectionResult with analysis details
         """
+        return (await self.batch_analyze_reports([report_data]))[0]
+    
+    async def _analyze(self, report_data: Dict[str, Any], text_features: TextFeatures, index: int,
+                       text_score: float, ml_scores: MLScores) -> FraudDetectionResult:
+        """Analysis of one report of a batch, given the batch's text features and model outputs."""
         try:
             report_id = report_data.get('id', 'unknown')
             flags = []
@@ -150,7 +360,7 @@ class FraudDetectionService:
             total_score = 0.0
             
             # Text analysis
-            text_score, text_flags, text_details = await self._analyze_text_content(report_data)
+            text_score, text_flags, text_details = self._analyze_text_content(text_features, index, text_score)
             total_score += text_score
             flags.extend(text_flags)
             details.update(text_details)
@@ -173,8 +383,14 @@ class FraudDetectionService:
             flags.extend(image_flags)
             details.update(image_details)
             
+            # Cross-report duplicate analysis
+            duplicate_score, duplicate_flags, duplicate_details = await self._analyze_duplicates(report_data)
+            total_score += duplicate_score
+            flags.extend(duplicate_flags)
+            details.update(duplicate_details)
+            
             # ML-based analysis
-            ml_score, ml_flags, ml_details = await self._ml_analysis(report_data)
+            ml_score, ml_flags, ml_details = self._ml_analysis(ml_scores, index)
             total_score += ml_score
             flags.extend(ml_flags)
             details.update(ml_details)
@@ -212,52 +428,102 @@ class FraudDetectionService:
                 model_version=self.model_version
             )
     
-    async def _analyze_text_content(self, report_data: Dict[str, Any]) -> Tuple[float, List[str], Dict[str, Any]]:
-        """Analyze text content for fraud indicators."""
-        score = 0.0
+    def extract_text_features(self, reports: List[Dict[str, Any]]) -> TextFeatures:
+        """
+        Text features for a batch of reports (see TextFeatures for the columns).
+        
+        Each column is filled for the whole batch at once: one keyword pass
+        and one search per precompiled regex per report, C-level word
+        counting, and capitals counted over the concatenated texts in NumPy.
+        Cost is linear in the total text length.
+        """
+        raw_texts = [f"{report.get('title') or ''} {report.get('description') or ''}" for report in reports]
+        texts = [text.lower() for text in raw_texts]
+        keyword_count = len(self.keyword_patterns)
+        matrix = np.zeros((len(reports), len(self.text_columns)))
+        
+        keyword_matches = [self.keyword_matcher.find(text) for text in texts]
+        for row, found in enumerate(keyword_matches):
+            for keyword in found:
+                for column in self.keyword_columns[keyword]:
+                    matrix[row, column] += 1
+        
+        for offset, (_, regex) in enumerate(self.regex_patterns):
+            matrix[:, keyword_count + offset] = [regex.search(text) is not None for text in texts]
+        
+        matrix[:, -2] = self._caps_ratios(raw_texts, texts)
+        
+        repeated_words = [
+            [word for word, count in Counter(text.split()).items() if count >= REPEATED_WORD_MIN_COUNT]
+            for text in texts
+        ]
+        matrix[:, -1] = [len(words) for words in repeated_words]
+        
+        return TextFeatures(
+            matrix=matrix,
+            columns=self.text_columns,
+            keyword_matches=keyword_matches,
+            repeated_words=repeated_words,
+        )
+    
+    @staticmethod
+    def _caps_ratios(raw_texts: List[str], texts: List[str]) -> np.ndarray:
+        """Share of capital letters per text (characters that lowercasing changes); texts are non-empty."""
+        lengths = np.fromiter(map(len, raw_texts), dtype=np.int64, count=len(raw_texts))
+        joined_raw, joined = "".join(raw_texts), "".join(texts)
+        if len(joined_raw) != len(joined):
+            # A few characters (e.g. dotted I) lowercase to two; count them one text at a time
+            return np.array([sum(map(str.isupper, text)) for text in raw_texts]) / lengths
+        
+        changed = (
+            np.frombuffer(joined_raw.encode("utf-32-le"), dtype=np.uint32)
+            != np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32)
+        )
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        return np.add.reduceat(changed, starts) / lengths
+    
+    def score_text_features(self, features: TextFeatures) -> np.ndarray:
+        """Text score of every report in the batch, from the feature matrix."""
+        matrix = features.matrix
+        weighted = len(self.text_weights)
+        return (
+            matrix[:, :weighted] @ self.text_weights
+            + 0.2 * (matrix[:, -2] > CAPS_RATIO_THRESHOLD)
+            + 0.3 * (matrix[:, -1] > 0)
+        )
+    
+    def _analyze_text_content(self, features: TextFeatures, index: int,
+                              score: float) -> Tuple[float, List[str], Dict[str, Any]]:
+        """Flags and details for one report's text features (score from score_text_features)."""
         flags = []
         details = {}
-        
-        title = report_data.get('title', '')
-        description = report_data.get('description', '')
-        text_content = f"{title} {description}".lower()
-        
-        # Check for suspicious keywords
-        for pattern in self.patterns:
-            if pattern.keywords:
-                matches = [kw for kw in pattern.keywords if kw.lower() in text_content]
-                if matches:
-                    score += pattern.weight * len(matches)
-                    flags.append(f"suspicious_keywords: {', '.join(matches)}")
-                    details[f"keyword_matches_{pattern.pattern_type}"] = matches
-            
-            # Check regex patterns
-            if pattern.regex_pattern:
-                if re.search(pattern.regex_pattern, text_content):
-                    score += pattern.weight
-                    flags.append(pattern.description)
-                    details[f"regex_match_{pattern.pattern_type}"] = True
-        
-        # Check for excessive capitalization
-        caps_ratio = sum(1 for c in text_content if c.isupper()) / max(len(text_content), 1)
-        if caps_ratio > 0.3:
-            score += 0.2
+        row = features.matrix[index]
+        
+        # Suspicious keywords, listed in each pattern's order
+        found = features.keyword_matches[index]
+        for column, pattern in enumerate(self.keyword_patterns):
+            if row[column]:
+                matches = [kw for kw in pattern.keywords if kw.lower() in found]
+                flags.append(f"suspicious_keywords: {', '.join(matches)}")
+                details[f"keyword_matches_{pattern.pattern_type}"] = matches
+        
+        # Regex patterns
+        for offset, (pattern, _) in enumerate(self.regex_patterns):
+            if row[len(self.keyword_patterns) + offset]:
+                flags.append(pattern.description)
+                details[f"regex_match_{pattern.pattern_type}"] = True
+        
+        # Excessive capitalization
+        if row[-2] > CAPS_RATIO_THRESHOLD:
             flags.append("excessive_capitalization")
-            details["caps_ratio"] = caps_ratio
-        
-        # Check for repeated words
-        words = text_content.split()
-        word_counts = {}
-        for word in words:
-            word_counts[word] = word_counts.get(word, 0) + 1
+            details["caps_ratio"] = float(row[-2])
         
-        repeated_words = [word for word, count in word_counts.items() if count > 3]
-        if repeated_words:
-            score += 0.3
+        # Repeated words
+        if features.repeated_words[index]:
             flags.append("repeated_words")
-            details["repeated_words"] = repeated_words
+            details["repeated_words"] = features.repeated_words[index]
         
-        return score, flags, details
+        return float(score), flags, details
     
     async def _analyze_behavior_patterns(self, report_data: Dict[str, Any]) -> Tuple[float, List[str], Dict[str, Any]]:
         """Analyze user behavior patterns for fraud indicators."""
@@ -294,7 +560,7 @@ class FraudDetectionService:
         contact_info = report_data.get('contact_info', '')
         if contact_info:
             # Check for fake contact patterns
-            if re.search(r'(123-456-7890|000-000-0000|test@test\.com)', contact_info.lower()):
+            if FAKE_CONTACT_RE.search(contact_info.lower()):
                 score += 0.5
                 flags.append("suspicious_contact_info")
                 details["contact_info"] = contact_info
@@ -363,75 +629,127 @@ class FraudDetectionService:
         
         return score, flags, details
     
-    async def _ml_analysis(self, report_data: Dict[str, Any]) -> Tuple[float, List[str], Dict[str, Any]]:
-        """Perform machine learning-based analysis."""
+    async def _analyze_duplicates(self, report_data: Dict[str, Any]) -> Tuple[float, List[str], Dict[str, Any]]:
+        """
+        Check for near-copies of the report's text or photos posted by other
+        users, and index the report for later checks.
+        """
         score = 0.0
         flags = []
         details = {}
         
+        matches = await self.duplicate_index.check(report_data)
+        if not matches:
+            return score, flags, details
+        
+        weight = next(pattern.weight for pattern in self.patterns if pattern.pattern_type == "duplicate_content")
+        if any(match["kind"] == "text" for match in matches):
+            score += weight
+            flags.append("duplicate_content")
+        if any(match["kind"] == "image" for match in matches):
+            score += weight
+            flags.append("duplicate_images_across_reports")
+        details["duplicate_reports"] = matches
+        
+        return score, flags, details
+    
+    def _ml_analysis(self, ml_scores: MLScores, index: int) -> Tuple[float, List[str], Dict[str, Any]]:
+        """Flags from the batch's model outputs for one report."""
+        score = 0.0
+        flags = []
+        details = {}
+        
+        if ml_scores.error:
+            details["ml_error"] = ml_scores.error
+            return score, flags, details
+        
+        # Isolation forest anomaly detection
+        if ml_scores.anomaly_scores is not None:
+            anomaly_score = ml_scores.anomaly_scores[index]
+            if anomaly_score < -0.5:  # Threshold for anomaly
+                score += 0.6
+                flags.append("ml_anomaly_detected")
+                details["anomaly_score"] = float(anomaly_score)
+        
+        # Random forest classification
+        if ml_scores.fraud_probabilities is not None:
+            fraud_probability = ml_scores.fraud_probabilities[index]
+            if fraud_probability > 0.7:
+                score += fraud_probability * 0.8
+                flags.append("ml_fraud_classification")
+                details["fraud_probability"] = float(fraud_probability)
+        
+        return float(score), flags, details
+    
+    async def _score_ml_batch(self, reports: List[Dict[str, Any]]) -> MLScores:
+        """
+        Model outputs for a batch: one feature matrix, one call per model.
+        
+        Batches of FRAUD_ML_PROCESS_MIN_BATCH reports or more run on the
+        inference process pool, so tree traversal doesn't hold the event
+        loop's GIL; smaller ones aren't worth the round trip.
+        """
+        if self.isolation_model is None and self.classification_model is None:
+            return MLScores()
+        
         try:
-            # Prepare features for ML analysis
-            features = self._extract_ml_features(report_data)
-            
-            # Use isolation forest for anomaly detection
-            if hasattr(self, 'isolation_model') and self.isolation_model:
-                anomaly_score = self.isolation_model.decision_function([features])[0]
-                if anomaly_score < -0.5:  # Threshold for anomaly
-                    score += 0.6
-                    flags.append("ml_anomaly_detected")
-                    details["anomaly_score"] = float(anomaly_score)
-            
-            # Use random forest for classification
-            if hasattr(self, 'classification_model') and self.classification_model:
-                fraud_probability = self.classification_model.predict_proba([features])[0][1]
-                if fraud_probability > 0.7:
-                    score += fraud_probability * 0.8
-                    flags.append("ml_fraud_classification")
-                    details["fraud_probability"] = float(fraud_probability)
-            
+            features = self.extract_ml_features(reports)
+            if len(reports) < config.FRAUD_ML_PROCESS_MIN_BATCH:
+                return MLScores(*_score_features(self._models(), features))
+            return MLScores(*await self._score_in_pool(features))
         except Exception as e:
             logger.warning(f"ML analysis failed: {e}")
-            details["ml_error"] = str(e)
-        
-        return score, flags, details
+            return MLScores(error=str(e))
     
-    def _extract_ml_features(self, report_data: Dict[str, Any]) -> List[float]:
-        """Extract numerical features for ML analysis."""
-        features = []
-        
-        # Text length features
-        title_len = len(report_data.get('title', ''))
-        desc_len = len(report_data.get('description', ''))
-        features.extend([title_len, desc_len])
-        
-        # Reward features
-        reward_amount = 0
-        if report_data.get('reward_amount'):
-            try:
-                reward_amount = float(str(report_data['reward_amount']).replace('$', '').replace(',', ''))
-            except (ValueError, AttributeError):
-                pass
-        features.append(reward_amount)
-        
-        # Boolean features
-        features.extend([
-            1.0 if report_data.get('is_urgent', False) else 0.0,
-            1.0 if report_data.get('reward_offered', False) else 0.0,
-            1.0 if report_data.get('latitude') else 0.0,
-            1.0 if report_data.get('longitude') else 0.0,
-        ])
-        
-        # Image features
-        image_count = len(report_data.get('images', []))
-        features.append(image_count)
-        
-        # Location features
-        features.extend([
-            len(report_data.get('location_city', '')),
-            len(report_data.get('location_address', '')),
-        ])
-        
-        return features
+    async def _score_in_pool(self, features: np.ndarray) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        loop = asyncio.get_running_loop()
+        try:
+            executor = _get_inference_executor()
+            result = await loop.run_in_executor(executor, _score_in_process, self.model_generation, None, features)
+            if result is None:
+                result = await loop.run_in_executor(
+                    executor, _score_in_process, self.model_generation, self._get_model_payload(), features
+                )
+            return result
+        except BrokenProcessPool:
+            # A pool process died (e.g. OOM): start a fresh pool next time, score this batch here
+            logger.error("Fraud inference pool broke; scoring batch in-process")
+            shutdown_inference_executor()
+            return _score_features(self._models(), features)
+    
+    def _models(self) -> Tuple[Any, Any, Any]:
+        return self.scaler, self.isolation_model, self.classification_model
+    
+    def _get_model_payload(self) -> bytes:
+        if self._model_payload is None:
+            self._model_payload = pickle.dumps(self._models(), protocol=pickle.HIGHEST_PROTOCOL)
+        return self._model_payload
+    
+    def _models_changed(self) -> None:
+        self.model_generation = uuid.uuid4().hex
+        self._model_payload = None
+    
+    def extract_ml_features(self, reports: List[Dict[str, Any]]) -> np.ndarray:
+        """Numerical ML features, one row per report (columns as in ML_FEATURE_COLUMNS)."""
+        def lengths(key: str) -> List[int]:
+            return [len(report.get(key) or '') for report in reports]
+        
+        def flags(key: str) -> List[bool]:
+            return [bool(report.get(key)) for report in reports]
+        
+        columns = [
+            lengths('title'),
+            lengths('description'),
+            [_parse_reward(report.get('reward_amount')) for report in reports],
+            flags('is_urgent'),
+            flags('reward_offered'),
+            flags('latitude'),
+            flags('longitude'),
+            lengths('images'),
+            lengths('location_city'),
+            lengths('location_address'),
+        ]
+        return np.array(columns, dtype=float).T
     
     def _determine_risk_level(self, fraud_score: float) -> FraudRiskLevel:
         """Determine risk level based on fraud score."""
@@ -465,15 +783,8 @@ class FraudDetectionService:
                 return
             
             # Extract features and labels
-            features = []
-            labels = []
-            
-            for data in training_data:
-                features.append(self._extract_ml_features(data))
-                labels.append(1.0 if data.get('is_fraud', False) else 0.0)
-            
-            features = np.array(features)
-            labels = np.array(labels)
+            features = self.extract_ml_features(training_data)
+            labels = np.array([1.0 if data.get('is_fraud', False) else 0.0 for data in training_data])
             
             # Scale features
             features_scaled = self.scaler.fit_transform(features)
@@ -489,6 +800,7 @@ class FraudDetectionService:
                 class_weight='balanced'
             )
             self.classification_model.fit(features_scaled, labels)
+            self._models_changed()
             
             logger.info(f"Successfully trained models with {len(training_data)} samples")
             
@@ -497,9 +809,26 @@ class FraudDetectionService:
             raise
     
     async def batch_analyze_reports(self, reports: List[Dict[str, Any]]) -> List[FraudDetectionResult]:
-        """Analyze multiple reports in batch."""
-        tasks = [self.analyze_report(report) for report in reports]
-        return await asyncio.gather(*tasks)
+        """
+        Analyze multiple reports in batch.
+        
+        Text features are extracted and scored for the whole batch at once
+        and each ML model runs once over the batch's feature matrix; the
+        remaining checks are cheap per-report lookups. Reports are checked
+        against (and added to) the duplicate index in order, so copies
+        within one batch are caught too.
+        """
+        if not reports:
+            return []
+        
+        text_features = self.extract_text_features(reports)
+        text_scores = self.score_text_features(text_features)
+        ml_scores = await self._score_ml_batch(reports)
+        
+        return [
+            await self._analyze(report, text_features, index, text_scores[index], ml_scores)
+            for index, report in enumerate(reports)
+        ]
     
     def save_models(self, filepath: str) -> None:
         """Save trained models to disk."""
@@ -524,6 +853,7 @@ class FraudDetectionService:
             self.classification_model = model_data['classification_model']
             self.scaler = model_data['scaler']
             self.model_version = model_data.get('model_version', '1.0.0')
+            self._models_changed()
             logger.info(f"Models loaded from {filepath}")
         except Exception as e:
             logger.error(f"Failed to load models: {e}")
@@ -4,8 +4,11 @@ MinIO Object Storage Integration
 S3-compatible object storage for media files with proper error handling and caching.
 """
 import os
+import asyncio
+import functools
 import logging
-from typing import Optional, BinaryIO, Union, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, BinaryIO, Union, Dict, Any, AsyncIterator
 from datetime import datetime, timedelta
 import mimetypes
 import hashlib
@@ -13,6 +16,8 @@ from pathlib import Path
 
 try:
     from minio import Minio
+    from minio.commonconfig import CopySource
+    from minio.deleteobjects import DeleteObject
     from minio.error import S3Error
     MINIO_AVAILABLE = True
 except ImportError:
@@ -24,6 +29,91 @@ from .config import config
 
 logger = logging.getLogger(__name__)
 
+# The minio SDK is blocking, so uploads run on a dedicated, size-limited pool
+# instead of the event loop or the shared request threadpool.
+_upload_executor = ThreadPoolExecutor(
+    max_workers=config.MINIO_UPLOAD_WORKERS,
+    thread_name_prefix="minio-upload",
+)
+
+# Size of the reads taken from an incoming upload
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# Chunks buffered between the request and the upload thread
+_STREAM_QUEUE_CHUNKS = 8
+
+
+class UploadTooLargeError(Exception):
+    """Raised when a streamed upload grows past its size limit."""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"Upload exceeds {max_size} bytes")
+
+
+class UploadAbortedError(Exception):
+    """
+    Raised in the upload thread when the request side stopped with a
+    BaseException (e.g. cancellation). minio only aborts the multipart
+    upload for Exception subclasses, so those are never passed through.
+    """
+
+
+class _StreamReader:
+    """
+    File-like object read by put_object on the upload thread, fed chunk by
+    chunk from the event loop through a bounded queue (so a slow MinIO
+    applies backpressure to the request instead of buffering it).
+    """
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=_STREAM_QUEUE_CHUNKS)
+        self._buffer = bytearray()
+        self._finished = False
+        self.closed = False
+    
+    async def put(self, item: Union[bytes, Exception, None]) -> None:
+        """Queue a chunk, an exception to raise in the reader, or None for end of stream."""
+        if not self.closed:
+            await self._queue.put(item)
+    
+    def close(self) -> None:
+        """Called on the loop once the upload finished; unblocks any pending put."""
+        self.closed = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+    
+    def read(self, size: int = -1) -> bytes:
+        while not self._finished and (size < 0 or len(self._buffer) < size):
+            item = asyncio.run_coroutine_threadsafe(self._queue.get(), self._loop).result()
+            if item is None:
+                self._finished = True
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                self._buffer += item
+        
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+async def iter_upload_chunks(file, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read an UploadFile (or any object with async read) in chunks."""
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def shutdown_upload_executor() -> None:
+    """Stop the upload pool."""
+    _upload_executor.shutdown(wait=False, cancel_futures=True)
+
 
 class MinIOClient:
     """MinIO client for object storage operations."""
@@ -54,6 +144,17 @@ class MinIOClient:
             secure=self.secure
         )
         
+        # Presigned URLs are signed for the host clients will use, which may differ
+        # from the internal endpoint. The region is fixed so signing needs no lookup.
+        public_endpoint = config.MINIO_PUBLIC_ENDPOINT
+        self.presign_client = Minio(
+            endpoint=public_endpoint.split("://", 1)[-1].split("/", 1)[0] if public_endpoint else self.endpoint,
+            access_key=self.access_key,
+            secret_key=self.secret_key,
+            secure=public_endpoint.startswith("https://") if public_endpoint else self.secure,
+            region=self.region
+        )
+        
         # Ensure bucket exists
         self._ensure_bucket_exists()
     
@@ -84,8 +185,8 @@ class MinIOClient:
             content_type = content_type or "application/octet-stream"
         
         try:
-            # Upload file
-            self.client.fput_object(
+            # Upload file; the write result carries the etag, so no stat_object round-trip
+            write_result = self.client.fput_object(
                 bucket_name=bucket,
                 object_name=object_name,
                 file_path=file_path,
@@ -95,18 +196,17 @@ class MinIOClient:
             # Generate URL
             url = f"{'https' if self.secure else 'http'}://{self.endpoint}/{bucket}/{object_name}"
             
-            # Get file info
-            stat = self.client.stat_object(bucket_name=bucket, object_name=object_name)
-            
             result = {
                 "success": True,
                 "url": url,
                 "bucket": bucket,
                 "object_name": object_name,
-                "size": stat.size,
+                "size": os.path.getsize(file_path),
                 "content_type": content_type,
-                "etag": stat.etag,
-                "last_modified": stat.last_modified.isoformat()
+                "etag": write_result.etag,
+                "last_modified": (
+                    write_result.last_modified.isoformat() if write_result.last_modified else None
+                )
             }
             
             logger.info(f"Uploaded file to MinIO: {url}")
@@ -161,6 +261,88 @@ class MinIOClient:
                 "error": str(e)
             }
     
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        object_name: str,
+        bucket_name: str = None,
+        content_type: str = None,
+        max_size: int = None
+    ) -> Dict[str, Any]:
+        """
+        Stream chunks to MinIO as a multipart upload without buffering the whole object.
+        
+        put_object runs on the upload pool and reads parts of MINIO_UPLOAD_PART_SIZE_MB
+        as the chunks arrive. Size and SHA-256 are computed on the fly; going past
+        max_size raises UploadTooLargeError and aborts the multipart upload.
+        
+        Chunks read from a Starlette UploadFile come from the request body that
+        Starlette already spooled to a temporary file before the handler ran,
+        so for form uploads max_size bounds what is stored, not what the client
+        sends: the whole body is received before the limit is checked.
+        """
+        bucket = bucket_name or self.bucket_name
+        content_type = content_type or "application/octet-stream"
+        loop = asyncio.get_running_loop()
+        reader = _StreamReader(loop)
+        
+        upload = loop.run_in_executor(
+            _upload_executor,
+            functools.partial(
+                self.client.put_object,
+                bucket_name=bucket,
+                object_name=object_name,
+                data=reader,
+                length=-1,
+                part_size=config.MINIO_UPLOAD_PART_SIZE_MB * 1024 * 1024,
+                content_type=content_type,
+                num_parallel_uploads=1
+            )
+        )
+        upload.add_done_callback(lambda _: reader.close())
+        
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async for chunk in chunks:
+                if upload.done():
+                    break  # Failed early; the error surfaces below
+                size += len(chunk)
+                if max_size is not None and size > max_size:
+                    raise UploadTooLargeError(max_size)
+                digest.update(chunk)
+                await reader.put(chunk)
+            await reader.put(None)
+        except BaseException as e:
+            await reader.put(e if isinstance(e, Exception) else UploadAbortedError(f"Upload aborted: {e!r}"))
+            try:
+                await upload
+            except BaseException:
+                pass
+            raise
+        
+        try:
+            write_result = await upload
+        except S3Error as e:
+            logger.error(f"Failed to stream upload {object_name}: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
+        url = f"{'https' if self.secure else 'http'}://{self.endpoint}/{bucket}/{object_name}"
+        logger.info(f"Streamed upload to MinIO: {url} ({size} bytes)")
+        return {
+            "success": True,
+            "url": url,
+            "bucket": bucket,
+            "object_name": object_name,
+            "size": size,
+            "content_type": content_type,
+            "etag": write_result.etag,
+            "sha256": digest.hexdigest()
+        }
+    
     def download_file(
         self,
         object_name: str,
@@ -247,6 +429,64 @@ class MinIOClient:
                 "error": str(e)
             }
     
+    def delete_files(
+        self,
+        object_names: list,
+        bucket_name: str = None
+    ) -> list:
+        """
+        Delete many objects with batched DeleteObjects requests.
+
+        Returns:
+            Object names that could not be deleted
+        """
+        bucket = bucket_name or self.bucket_name
+        
+        try:
+            errors = self.client.remove_objects(
+                bucket_name=bucket,
+                delete_object_list=(DeleteObject(name) for name in object_names)
+            )
+            # remove_objects is lazy: the requests run while errors are consumed
+            failed = [error.name for error in errors]
+        except S3Error as e:
+            logger.error(f"Failed to delete files: {e}")
+            return list(object_names)
+        
+        for name in failed:
+            logger.error(f"Failed to delete file {name}")
+        logger.info(f"Deleted {len(object_names) - len(failed)} files from MinIO")
+        return failed
+    
+    def copy_file(
+        self,
+        source_name: str,
+        object_name: str,
+        bucket_name: str = None
+    ) -> Dict[str, Any]:
+        """Copy an object within the bucket (server-side, no data passes through the API)."""
+        bucket = bucket_name or self.bucket_name
+        
+        try:
+            self.client.copy_object(
+                bucket_name=bucket,
+                object_name=object_name,
+                source=CopySource(bucket, source_name)
+            )
+            
+            logger.info(f"Copied {source_name} to {object_name} in MinIO")
+            return {
+                "success": True,
+                "object_name": object_name
+            }
+            
+        except S3Error as e:
+            logger.error(f"Failed to copy file {source_name} to {object_name}: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
     def file_exists(
         self,
         object_name: str,
@@ -313,7 +553,7 @@ class MinIOClient:
         bucket = bucket_name or self.bucket_name
         
         try:
-            url = self.client.presigned_url(
+            url = self.presign_client.presigned_url(
                 method=method,
                 bucket_name=bucket,
                 object_name=object_name,
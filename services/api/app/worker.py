@@ -3,19 +3,33 @@ Background task worker using ARQ for async job processing.
 Handles embedding generation, hash generation, and background processing.
 """
 import asyncio
-from arq import create_pool
+import hashlib
+import io
+import tempfile
+import time
+from arq import cron
 from arq.connections import RedisSettings
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 import logging
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from pathlib import PurePosixPath
+from typing import Optional, Tuple
 
 from app.config import config
 from app.clients import get_nlp_client, get_vision_client
-from app.models import User
+from app.models import Media, MediaBlob, User
+from app.derivatives import DerivativeSet, build_derivatives, build_hash_input
+from app.fraud_scoring import score_pending_reports
+from app.job_queue import get_redis_pool
+from app.media_blobs import acquire_blob, apply_blob, blob_metadata, blob_object_name, cleanup_orphaned_media
+from app.storage import get_minio_client
+from PIL import Image
 from app.domains.reports.models.report import Report
 from app.domains.matches.models.match import Match
+from app.rollups import ROLLUP_SOURCES, refresh_rollup
+from app.services.fraud_detection_service import shutdown_inference_executor
 from uuid import uuid4
 
 logging.basicConfig(level=logging.INFO)
@@ -40,19 +54,8 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
-# Global ARQ pool
-_redis_pool = None
-
-
-async def get_redis_pool():
-    """Get or create Redis pool for job enqueueing."""
-    global _redis_pool
-    if _redis_pool is None:
-        _redis_pool = await create_pool(
-            RedisSettings.from_dsn(config.ARQ_REDIS_URL)
-        )
-    return _redis_pool
-
+# Photos whose outdated hashes are recomputed per transaction
+REHASH_BATCH_SIZE = 50
 
 async def enqueue_vision_hash_generation(media_id: str, file_path: str):
     """Enqueue vision hash generation task."""
@@ -70,19 +73,18 @@ async def enqueue_vision_hash_generation(media_id: str, file_path: str):
         return None
 
 
-async def enqueue_thumbnail_generation(media_id: str, file_path: str):
-    """Enqueue thumbnail generation task."""
+async def enqueue_derivative_generation(media_id: str):
+    """Enqueue derivative (thumbnail/WebP/AVIF) generation task."""
     try:
         pool = await get_redis_pool()
         job = await pool.enqueue_job(
-            "generate_thumbnail",
-            media_id,
-            file_path
+            "generate_media_derivatives",
+            media_id
         )
-        logger.info(f"Enqueued thumbnail generation job {job.job_id} for media {media_id}")
+        logger.info(f"Enqueued derivative generation job {job.job_id} for media {media_id}")
         return job.job_id
     except Exception as e:
-        logger.error(f"Failed to enqueue thumbnail generation: {e}")
+        logger.error(f"Failed to enqueue derivative generation: {e}")
         return None
 
 
@@ -219,31 +221,299 @@ async def generate_hash_for_media(ctx, media_id: str, file_path: str):
         return {"status": "error", "message": str(e)}
 
 
-async def generate_thumbnail(ctx, media_id: str, file_path: str):
-    """Generate thumbnail for uploaded media."""
-    logger.info(f"Generating thumbnail for media {media_id}")
-    
-    try:
-        from PIL import Image
-        import os
-        
-        # Open image
-        with Image.open(file_path) as img:
-            # Create thumbnail (max 300x300)
-            img.thumbnail((300, 300), Image.Resampling.LANCZOS)
-            
-            # Save thumbnail
-            thumbnail_dir = os.path.dirname(file_path).replace("originals", "thumbnails")
-            os.makedirs(thumbnail_dir, exist_ok=True)
-            
-            thumbnail_path = os.path.join(thumbnail_dir, os.path.basename(file_path))
-            img.save(thumbnail_path, optimize=True, quality=85)
-            
-            logger.info(f"✅ Generated thumbnail for media {media_id}")
-            return {"status": "success", "media_id": media_id, "thumbnail_path": thumbnail_path}
-    except Exception as e:
-        logger.error(f"Error generating thumbnail for media {media_id}: {e}")
-        return {"status": "error", "message": str(e)}
+async def _store_derivatives(data: bytes) -> DerivativeSet:
+    """Render an image's derivatives and upload them to MinIO under their content keys."""
+    minio = get_minio_client()
+    derived = await asyncio.to_thread(build_derivatives, data)
+    for key, (blob, content_type) in derived.blobs.items():
+        uploaded = await asyncio.to_thread(
+            minio.upload_data, io.BytesIO(blob), key, content_type=content_type, length=len(blob)
+        )
+        if not uploaded.get("success"):
+            raise RuntimeError(f"Failed to store derivative {key}: {uploaded.get('error')}")
+    return derived
+
+
+async def _hash_derivative_input(derived: DerivativeSet) -> Optional[dict]:
+    """Perceptual hashes from the small grayscale hash input instead of the original."""
+    return await _hash_input_image(derived.hash_input)
+
+
+async def _hash_input_image(hash_input: bytes) -> Optional[dict]:
+    with tempfile.NamedTemporaryFile(suffix=".png") as hash_file:
+        hash_file.write(hash_input)
+        hash_file.flush()
+        async with get_vision_client() as vision:
+            return await vision.generate_image_hashes(hash_file.name, use_cache=False)
+
+
+def _apply_derivatives(media: Media, derived: DerivativeSet, hashes: Optional[dict]) -> None:
+    media.width = derived.width
+    media.height = derived.height
+    media.derivatives = derived.derivatives
+    if hashes:
+        media.phash_hex = hashes.get("phash")
+        media.dhash_hex = hashes.get("dhash")
+        media.hash_version = hashes.get("hash_version")
+
+
+async def generate_media_derivatives(ctx, media_id: str):
+    """(Re)generate the resized renditions and hashes of a stored photo."""
+    logger.info(f"Generating derivatives for media {media_id}")
+
+    async for db in get_db_session():
+        try:
+            media = await db.get(Media, media_id)
+            if media is None:
+                return {"status": "error", "message": "Media not found"}
+
+            download = await asyncio.to_thread(get_minio_client().download_data, media.filename)
+            if not download.get("success"):
+                return {"status": "error", "message": download.get("error")}
+
+            derived = await _store_derivatives(download["data"])
+            hashes = await _hash_derivative_input(derived)
+            _apply_derivatives(media, derived, hashes)
+            if media.content_hash:
+                # Photos sharing the content share the renditions
+                metadata = blob_metadata(derived, hashes)
+                await db.execute(
+                    update(MediaBlob).where(MediaBlob.content_hash == media.content_hash).values(**metadata)
+                )
+                await db.execute(
+                    update(Media).where(Media.content_hash == media.content_hash).values(**metadata)
+                )
+            await db.commit()
+
+            logger.info(f"✅ Generated {len(derived.derivatives)} derivatives for media {media_id}")
+            return {"status": "success", "media_id": media_id, "derivatives": derived.derivatives}
+        except Exception as e:
+            logger.error(f"Error generating derivatives for media {media_id}: {e}")
+            await db.rollback()
+            return {"status": "error", "message": str(e)}
+
+
+async def _process_blob(session: dict, object_name: str, data: bytes) -> dict:
+    """
+    Store a new content blob: derivatives, perceptual hashes and the original
+    (copied server-side from the upload object to its content key).
+
+    Returns:
+        Blob metadata for acquire_blob
+
+    Raises:
+        OSError / Image.DecompressionBombError: if the data is not a usable image
+    """
+    derived = await _store_derivatives(data)
+    hashes = await _hash_derivative_input(derived)
+    copied = await asyncio.to_thread(get_minio_client().copy_file, session["object_name"], object_name)
+    if not copied.get("success"):
+        raise RuntimeError(f"Failed to store original {object_name}: {copied.get('error')}")
+    return blob_metadata(derived, hashes)
+
+
+async def process_media_upload(ctx, upload_id: str):
+    """
+    Verify a direct (presigned PUT) upload, then record it against its content blob.
+
+    Enqueued by the completion call or the MinIO bucket notification with a
+    fixed job id, so it runs once per upload. Content seen before reuses the
+    stored original, derivatives and hashes; new content is processed and
+    stored under its content key. Either way the upload object is deleted,
+    as are objects that don't match their session.
+    """
+    from app.media_uploads import UploadStatus, check_uploaded_object, get_upload_session, save_upload_session
+
+    session = await get_upload_session(upload_id)
+    if session is None:
+        logger.warning(f"Upload session {upload_id} not found (expired?)")
+        return {"status": "error", "message": "Upload session not found"}
+
+    minio = get_minio_client()
+    metadata = None
+    async for db in get_db_session():
+        # Set when a previous attempt got as far as committing the row
+        media = await db.get(Media, upload_id)
+
+    rejection = None if media else await asyncio.to_thread(check_uploaded_object, session)
+    if media is None and rejection is None:
+        download = await asyncio.to_thread(minio.download_data, session["object_name"])
+        if not download.get("success"):
+            return {"status": "error", "message": download.get("error")}
+        data = download["data"]
+        content_hash = hashlib.sha256(data).hexdigest()
+        object_name = blob_object_name(content_hash, PurePosixPath(session["object_name"]).suffix)
+
+        async for db in get_db_session():
+            try:
+                existing = await db.get(MediaBlob, content_hash)
+                reuse = existing is not None and existing.processed_at is not None
+                await db.rollback()  # Don't hold a transaction open while processing
+                if not reuse:
+                    metadata = await _process_blob(session, object_name, data)
+
+                blob = await acquire_blob(db, content_hash, object_name, session["content_type"], len(data), metadata)
+                if blob.processed_at is None:
+                    # Collected between the lookup and the acquire: store it again
+                    await db.rollback()
+                    metadata = await _process_blob(session, object_name, data)
+                    blob = await acquire_blob(
+                        db, content_hash, object_name, session["content_type"], len(data), metadata
+                    )
+
+                media = Media(
+                    id=upload_id,
+                    filename=blob.object_name,
+                    url=f"{config.MINIO_BUCKET_NAME}/{blob.object_name}",
+                    media_type="image",
+                    mime_type=blob.mime_type,
+                    size_bytes=blob.size_bytes,
+                    content_hash=content_hash
+                )
+                apply_blob(media, blob)
+                db.add(media)
+                await db.commit()
+            except (OSError, Image.DecompressionBombError) as e:
+                # Not a decodable image (PIL's UnidentifiedImageError is an OSError)
+                await db.rollback()
+                rejection = f"Invalid image: {e}"
+
+    # The upload object is either rejected or now stored under its content key
+    await asyncio.to_thread(minio.delete_file, session["object_name"])
+
+    if rejection:
+        session.update(status=UploadStatus.REJECTED, error=rejection)
+        await save_upload_session(session)
+        logger.warning(f"Rejected upload {upload_id}: {rejection}")
+        return {"status": "rejected", "upload_id": upload_id, "message": rejection}
+
+    session.update(
+        status=UploadStatus.READY,
+        object_name=media.filename,
+        media_id=media.id,
+        thumbnail_object=media.thumbnail_key(),
+        deduplicated=metadata is None
+    )
+    await save_upload_session(session)
+    logger.info(f"✅ Processed direct upload {upload_id} (content {media.content_hash}, reused: {metadata is None})")
+    return {"status": "success", "upload_id": upload_id, "media_id": media.id, "content_hash": media.content_hash}
+
+
+async def cleanup_media_task(ctx):
+    """Drop unattached direct uploads and garbage-collect unreferenced blobs and their objects."""
+    async for db in get_db_session():
+        try:
+            cleaned = await cleanup_orphaned_media(db)
+            return {"status": "success", **cleaned}
+        except Exception as e:
+            logger.error(f"Error cleaning up media: {e}")
+            await db.rollback()
+            return {"status": "error", "message": str(e)}
+
+
+async def _rehash_batch(db: AsyncSession) -> Tuple[int, int, bool]:
+    """
+    Recompute one batch of stored hashes from an older vision hash version.
+
+    Returns:
+        (photos or blobs rehashed, cleared, whether rows remain)
+    """
+    rows = (await db.execute(
+        select(Media.id, Media.filename, Media.content_hash)
+        .where(
+            Media.phash_hex.isnot(None),
+            Media.hash_version.is_distinct_from(config.VISION_HASH_VERSION),
+        )
+        .limit(REHASH_BATCH_SIZE)
+    )).all()
+
+    rehashed = cleared = 0
+    seen = set()
+    for media_id, object_name, content_hash in rows:
+        if content_hash and content_hash in seen:
+            continue
+        seen.add(content_hash)
+
+        download = await asyncio.to_thread(get_minio_client().download_data, object_name)
+        hashes = None
+        if download.get("success"):
+            hash_input = await asyncio.to_thread(build_hash_input, download["data"])
+            hashes = await _hash_input_image(hash_input)
+            if not hashes or hashes.get("hash_version") != config.VISION_HASH_VERSION:
+                # Vision unavailable (or not upgraded yet): retry on the next run
+                await db.commit()
+                return rehashed, cleared, False
+            values = {"phash_hex": hashes.get("phash"), "dhash_hex": hashes.get("dhash")}
+            rehashed += 1
+        else:
+            # Original gone: an outdated hash would only produce wrong matches
+            values = {"phash_hex": None, "dhash_hex": None}
+            cleared += 1
+        values["hash_version"] = config.VISION_HASH_VERSION
+
+        if content_hash:
+            await db.execute(update(MediaBlob).where(MediaBlob.content_hash == content_hash).values(**values))
+            await db.execute(update(Media).where(Media.content_hash == content_hash).values(**values))
+        else:
+            await db.execute(update(Media).where(Media.id == media_id).values(**values))
+
+    await db.commit()
+    return rehashed, cleared, len(rows) == REHASH_BATCH_SIZE
+
+
+async def rehash_media_task(ctx):
+    """
+    Backfill perceptual hashes computed by an older vision HASH_VERSION, which
+    don't compare with new ones. Runs in batches until done or half the job
+    timeout has passed; the next run continues.
+    """
+    deadline = time.monotonic() + config.BACKGROUND_TASK_TIMEOUT / 2
+    rehashed = cleared = 0
+    async for db in get_db_session():
+        try:
+            remaining = True
+            while remaining and time.monotonic() < deadline:
+                done, dropped, remaining = await _rehash_batch(db)
+                rehashed += done
+                cleared += dropped
+        except Exception as e:
+            logger.error(f"Error rehashing media: {e}")
+            await db.rollback()
+            return {"status": "error", "message": str(e), "rehashed": rehashed, "cleared": cleared}
+
+    if rehashed or cleared:
+        logger.info(f"✅ Rehashed {rehashed} photos to hash version {config.VISION_HASH_VERSION}, cleared {cleared}")
+    return {"status": "success", "rehashed": rehashed, "cleared": cleared}
+
+
+async def score_fraud_task(ctx):
+    """Score reports queued by schedule_fraud_scoring, plus recent ones the queue missed."""
+    async for db in get_db_session():
+        try:
+            scored = await score_pending_reports(db)
+            return {"status": "success", **scored}
+        except Exception as e:
+            logger.error(f"Error scoring reports for fraud: {e}")
+            await db.rollback()
+            return {"status": "error", "message": str(e)}
+
+
+async def refresh_rollups_task(ctx):
+    """Roll changed rows since each metric's watermark into daily_rollups."""
+    refreshed = {}
+
+    for metric in ROLLUP_SOURCES:
+        async for db in get_db_session():
+            try:
+                refreshed[metric] = await refresh_rollup(db, metric)
+                await db.commit()
+            except Exception as e:
+                logger.error(f"Error refreshing {metric} rollup: {e}")
+                await db.rollback()
+                refreshed[metric] = None
+
+    logger.info(f"✅ Refreshed rollups (days recomputed): {refreshed}")
+    return {"status": "success", "days": refreshed}
 
 
 async def startup(ctx):
@@ -255,6 +525,7 @@ async def startup(ctx):
 async def shutdown(ctx):
     """Worker shutdown hook."""
     logger.info("👋 ARQ Worker shutting down")
+    shutdown_inference_executor()
     await engine.dispose()
 
 
@@ -266,7 +537,23 @@ class WorkerSettings:
         generate_hash_task,
         process_new_report_task,
         generate_hash_for_media,
-        generate_thumbnail,
+        generate_media_derivatives,
+        process_media_upload,
+        cleanup_media_task,
+        refresh_rollups_task,
+        score_fraud_task,
+        rehash_media_task,
+    ]
+    
+    cron_jobs = [
+        cron(
+            refresh_rollups_task,
+            minute=set(range(0, 60, config.ROLLUP_REFRESH_MINUTES)),
+            run_at_startup=True,
+        ),
+        cron(cleanup_media_task, hour={3}, minute={30}),
+        cron(score_fraud_task, minute=set(range(0, 60, 10))),
+        cron(rehash_media_task, minute={45}, run_at_startup=True),
     ]
     
     redis_settings = RedisSettings.from_dsn(config.ARQ_REDIS_URL)
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from uuid import uuid4
 
 from app.main import app
+from app.config import config
 from app.models import User
 from app.domains.reports.models.report import Report, ReportStatus, ReportType
 from app.domains.matches.models.match import Match, MatchStatus
@@ -165,8 +166,8 @@ def test_bulk_operations_empty_list(client: TestClient, admin_user: User):
 
 
 def test_bulk_operations_too_many_ids(client: TestClient, admin_user: User):
-    """Test bulk operation with too many IDs (>100)."""
-    report_ids = [str(uuid4()) for _ in range(101)]
+    """Test bulk operation with too many IDs (>BULK_OPERATION_MAX_IDS)."""
+    report_ids = [str(uuid4()) for _ in range(config.BULK_OPERATION_MAX_IDS + 1)]
     
     response = client.post(
         "/admin/reports/bulk/approve",
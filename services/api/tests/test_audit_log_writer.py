@@ -0,0 +1,88 @@
+"""Unit tests for the buffered audit log writer."""
+
+import asyncio
+
+import pytest
+
+from app.config import config
+from app.helpers import AuditLogWriter
+
+
+class RecordingWriter(AuditLogWriter):
+    """AuditLogWriter whose writes are recorded instead of inserted, and can be held."""
+
+    def __init__(self):
+        super().__init__()
+        self.written = []
+        self.writing = asyncio.Event()
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def _write(self, batch):
+        self.writing.set()
+        await self.release.wait()
+        self.written.extend(entry["id"] for entry in batch)
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    monkeypatch.setattr(config, "AUDIT_LOG_BATCH_SIZE", 5)
+    monkeypatch.setattr(config, "AUDIT_LOG_FLUSH_INTERVAL", 60.0)
+
+
+def enqueue(writer, count):
+    return [str(writer.enqueue(None, "test_action").id) for _ in range(count)]
+
+
+class TestAuditLogWriter:
+    """Test suite for flushing and shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushed_by_loop(self):
+        writer = RecordingWriter()
+        await writer.start()
+
+        ids = enqueue(writer, 5)
+        await asyncio.wait_for(writer.writing.wait(), timeout=1)
+        await writer.stop()
+
+        assert writer.written == ids
+
+    @pytest.mark.asyncio
+    async def test_stop_during_flush_loses_nothing(self):
+        """stop() waits for the write in progress instead of cancelling it."""
+        writer = RecordingWriter()
+        await writer.start()
+        writer.release.clear()
+
+        ids = enqueue(writer, 7)
+        await asyncio.wait_for(writer.writing.wait(), timeout=1)
+        stopping = asyncio.create_task(writer.stop())
+        await asyncio.sleep(0.01)
+        assert not stopping.done()
+
+        writer.release.set()
+        await asyncio.wait_for(stopping, timeout=1)
+
+        assert writer.written == ids
+        assert not writer.running
+
+    @pytest.mark.asyncio
+    async def test_cancelled_flush_requeues_batch(self):
+        """A flush cancelled mid-write puts its entries back in order."""
+        writer = RecordingWriter()
+        writer._flush_lock = asyncio.Lock()
+        writer.release.clear()
+
+        ids = enqueue(writer, 7)
+        flushing = asyncio.create_task(writer.flush())
+        await asyncio.wait_for(writer.writing.wait(), timeout=1)
+        flushing.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flushing
+
+        assert [entry["id"] for entry in writer._buffer] == ids
+
+        writer.release.set()
+        assert await writer.flush() and await writer.flush()
+        assert writer.written == ids
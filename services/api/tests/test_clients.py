@@ -1,10 +1,18 @@
 """Integration tests for service clients (NLP and Vision)."""
 
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
 import pytest
 from unittest.mock import AsyncMock, patch, Mock
 import httpx
+from PIL import Image
 
-from app.clients import NLPClient, VisionClient
+from app.clients import NLPClient, VisionClient, fused_hash_set
+from app.config import config
+from app.matching import EnhancedMatchingService
 
 
 @pytest.fixture
@@ -236,4 +244,70 @@ class TestCacheClient:
         """Test cache set and get operations."""
         # Test that cache operations work
         client = NLPClient()
-        assert client is not None
\ No newline at end of file
+        assert client is not None
+
+VISION_SERVICE_DIR = Path(__file__).resolve().parents[2] / "vision"
+
+
+@pytest.fixture
+def vision_service(monkeypatch):
+    """The real vision app behind a VisionClient, over ASGI (no cache, thread pool)."""
+    pytest.importorskip("cv2")
+    pytest.importorskip("skimage")
+    monkeypatch.syspath_prepend(str(VISION_SERVICE_DIR))
+    vision_main = importlib.import_module("main")
+    if not hasattr(vision_main, "FUSED_HASH_TYPES"):
+        pytest.skip("another top-level main module is loaded")
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(vision_main, "image_executor", executor)
+    monkeypatch.setattr(vision_main, "redis_client", None)
+    monkeypatch.setattr(config, "ENABLE_VISION_CACHE", False)
+
+    client = VisionClient()
+    client.client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=vision_main.app), base_url="http://vision"
+    )
+    yield client
+    executor.shutdown(wait=True)
+
+
+def write_image(path, seed):
+    """A noisy RGB test photo, different for each seed."""
+    pixels = np.random.default_rng(seed).integers(0, 256, (256, 256, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path, "JPEG", quality=90)
+    return str(path)
+
+
+class TestVisionContract:
+    """Client requests against the vision service's own request models."""
+
+    @pytest.mark.asyncio
+    async def test_fused_similarity_of_generated_hashes(self, vision_service, tmp_path):
+        """Hash sets from generate_image_hashes (with hash_version) are accepted for fused scoring."""
+        first = await vision_service.generate_image_hashes(write_image(tmp_path / "a.jpg", 1))
+        second = await vision_service.generate_image_hashes(write_image(tmp_path / "b.jpg", 2))
+        assert first["hash_version"] == config.VISION_HASH_VERSION
+
+        same = await vision_service.calculate_image_similarity(first, dict(first), algorithm="fused")
+        other = await vision_service.calculate_image_similarity(first, second, algorithm="fused")
+
+        assert same == (1.0, 0)
+        assert other is not None and other[0] < 1.0
+
+    @pytest.mark.asyncio
+    async def test_matching_service_image_similarity(self, vision_service, tmp_path):
+        """EnhancedMatchingService scores identical photos as identical instead of falling back to 0.0."""
+        matching = EnhancedMatchingService()
+        matching.vision_client = vision_service
+        image = write_image(tmp_path / "a.jpg", 3)
+
+        assert await matching._calculate_image_similarity(image, image) == 1.0
+
+    @pytest.mark.asyncio
+    async def test_candidate_scoring_with_generated_hashes(self, vision_service, tmp_path):
+        query = await vision_service.generate_image_hashes(write_image(tmp_path / "a.jpg", 4))
+
+        results = await vision_service.score_image_candidates(query, [fused_hash_set(query)])
+
+        assert results is not None and results[0]["similarity_score"] == 1.0
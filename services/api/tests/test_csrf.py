@@ -0,0 +1,147 @@
+"""Unit tests for signed CSRF tokens."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app import cache, csrf
+from app.config import config
+from app.csrf import CSRFProtection
+
+OLD_KEY = ("2025", b"old-secret")
+NEW_KEY = ("2026", b"new-secret")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake wall clock for token issue and expiry times."""
+    clock = SimpleNamespace(now=1_700_000_000.0)
+    monkeypatch.setattr(csrf, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture
+def protection():
+    return CSRFProtection(keys=[NEW_KEY], token_ttl=3600)
+
+
+class TestSignAndVerify:
+    """Test suite for token signing and binding."""
+
+    def test_round_trip(self, protection):
+        token = protection.generate_csrf_token("session-1", "user-1")
+        assert protection.validate_csrf_token("session-1", token, "user-1")
+
+    def test_bound_to_session_and_user(self, protection):
+        token = protection.generate_csrf_token("session-1", "user-1")
+
+        assert not protection.validate_csrf_token("session-2", token, "user-1")
+        assert not protection.validate_csrf_token("session-1", token, "user-2")
+        assert not protection.validate_csrf_token("session-1", token)
+
+    def test_anonymous_token(self, protection):
+        token = protection.generate_csrf_token("session-1")
+        assert protection.validate_csrf_token("session-1", token)
+        assert not protection.validate_csrf_token("session-1", token, "user-1")
+
+    def test_tampered_tokens_rejected(self, protection):
+        kid, issued, nonce, signature = protection.generate_csrf_token("session-1").split(".")
+
+        for forged in (
+            f"{kid}.{issued}.{nonce}x.{signature}",
+            f"{kid}.{int(issued) + 1}.{nonce}.{signature}",
+            f"{kid}.{issued}.{nonce}.{signature[:-1]}{'B' if signature.endswith('A') else 'A'}",
+        ):
+            assert not protection.validate_csrf_token("session-1", forged)
+
+    @pytest.mark.parametrize("token", ["", "garbage", "a.b.c", "2026.notanumber.nonce.sig", "2026.1.2.3.4"])
+    def test_malformed_tokens_rejected(self, protection, token):
+        assert not protection.validate_csrf_token("session-1", token)
+        assert protection.expires_in(token) == 0
+
+
+class TestExpiry:
+    """Test suite for self-expiring tokens."""
+
+    def test_valid_until_ttl(self, protection, clock):
+        token = protection.generate_csrf_token("session-1")
+
+        clock.now += 3599
+        assert protection.validate_csrf_token("session-1", token)
+        assert protection.expires_in(token) == 1
+
+        clock.now += 2
+        assert not protection.validate_csrf_token("session-1", token)
+        assert protection.expires_in(token) == 0
+
+    def test_future_tokens_within_clock_skew(self, protection, clock):
+        """Tokens from a worker whose clock runs slightly ahead still validate."""
+        token = protection.generate_csrf_token("session-1")
+
+        clock.now -= 30
+        assert protection.validate_csrf_token("session-1", token)
+        clock.now -= 60
+        assert not protection.validate_csrf_token("session-1", token)
+
+
+class TestKeyRotation:
+    """Test suite for rotating signing keys."""
+
+    def test_old_tokens_verify_after_rotation(self):
+        before = CSRFProtection(keys=[OLD_KEY], token_ttl=3600)
+        after = CSRFProtection(keys=[NEW_KEY, OLD_KEY], token_ttl=3600)
+
+        old_token = before.generate_csrf_token("session-1")
+        assert after.validate_csrf_token("session-1", old_token)
+
+    def test_new_tokens_use_first_key(self):
+        after = CSRFProtection(keys=[NEW_KEY, OLD_KEY], token_ttl=3600)
+
+        token = after.generate_csrf_token("session-1")
+        assert token.startswith(f"{NEW_KEY[0]}.")
+        assert not CSRFProtection(keys=[OLD_KEY]).validate_csrf_token("session-1", token)
+
+    def test_retired_key_rejected(self):
+        before = CSRFProtection(keys=[OLD_KEY], token_ttl=3600)
+        retired = CSRFProtection(keys=[NEW_KEY], token_ttl=3600)
+
+        assert not retired.validate_csrf_token("session-1", before.generate_csrf_token("session-1"))
+
+    def test_same_kid_with_other_secret_rejected(self):
+        forger = CSRFProtection(keys=[(NEW_KEY[0], b"guessed-secret")], token_ttl=3600)
+
+        token = forger.generate_csrf_token("session-1")
+        assert not CSRFProtection(keys=[NEW_KEY]).validate_csrf_token("session-1", token)
+
+
+class TestRevocation:
+    """Test suite for revoking tokens in Redis."""
+
+    @pytest.fixture
+    def redis(self, monkeypatch):
+        fakeredis = pytest.importorskip("fakeredis")
+        client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        monkeypatch.setattr(cache, "get_redis_client", lambda: SimpleNamespace(client=client))
+        monkeypatch.setattr(config, "CSRF_REVOCATION_ENABLED", True)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_revoked_until_expiry(self, protection, redis):
+        token = protection.generate_csrf_token("session-1")
+        assert not await protection.is_revoked(token)
+
+        assert await protection.revoke_token(token)
+        assert await protection.is_revoked(token)
+
+        nonce = token.split(".")[2]
+        assert 0 < await redis.ttl(f"csrf:revoked:{nonce}") <= 3600
+
+    @pytest.mark.asyncio
+    async def test_refresh_revokes_old_token(self, protection, redis):
+        old_token = protection.generate_csrf_token("session-1")
+
+        new_token = await protection.refresh_token("session-1", old_token=old_token)
+
+        assert await protection.is_revoked(old_token)
+        assert not await protection.is_revoked(new_token)
+        assert protection.validate_csrf_token("session-1", new_token)
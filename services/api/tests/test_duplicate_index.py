@@ -0,0 +1,154 @@
+"""Unit tests for the MinHash/LSH near-duplicate report index."""
+
+import random
+
+import numpy as np
+import pytest
+
+from app.config import config
+from app.services.duplicate_index import (
+    NUM_PERM, DuplicateIndex, _band_keys, minhash, shingles, signature_similarity,
+)
+
+
+def set_pair(jaccard: float, rng: random.Random, union: int = 100):
+    """Two shingle sets with exactly the given Jaccard similarity."""
+    shared = round(union * jaccard)
+    unique = (union - shared) // 2
+    words = [f"w{rng.getrandbits(48):x}" for _ in range(shared + 2 * unique)]
+    common = set(words[:shared])
+    return common | set(words[shared:shared + unique]), common | set(words[shared + unique:])
+
+
+def share_a_band(first: np.ndarray, second: np.ndarray) -> bool:
+    return bool(set(_band_keys(first)) & set(_band_keys(second)))
+
+
+class TestMinHash:
+    """Test suite for signatures and their similarity estimate."""
+
+    def test_shingles_normalize_text(self):
+        assert shingles("Lost BLACK wallet, near the station!") == {
+            "lost black wallet", "black wallet near", "wallet near the", "near the station",
+        }
+        assert shingles("too short") == set()
+
+    def test_signature_is_deterministic(self):
+        items = shingles("lost a brown leather wallet with cards near the central station")
+        first, second = minhash(items), minhash(set(items))
+
+        assert first.dtype == np.uint32 and first.shape == (NUM_PERM,)
+        assert np.array_equal(first, second)
+        assert _band_keys(first) == _band_keys(second)
+
+    @pytest.mark.parametrize("jaccard", [0.2, 0.5, 0.8, 0.9])
+    def test_similarity_estimates_jaccard(self, jaccard):
+        rng = random.Random(jaccard)
+        estimates = []
+        for _ in range(50):
+            first, second = set_pair(jaccard, rng)
+            estimates.append(signature_similarity(minhash(first), minhash(second)))
+
+        # Standard error of one estimate is sqrt(J(1-J)/128) <= 0.045
+        assert abs(np.mean(estimates) - jaccard) < 0.03
+        assert max(abs(estimate - jaccard) for estimate in estimates) < 0.2
+
+    def test_identical_and_disjoint_sets(self):
+        first, second = set_pair(0.0, random.Random(1))
+
+        assert signature_similarity(minhash(first), minhash(first)) == 1.0
+        assert signature_similarity(minhash(first), minhash(second)) < 0.1
+
+
+class TestLSHRecall:
+    """Test suite for band bucketing around FRAUD_DUPLICATE_THRESHOLD."""
+
+    def candidate_rate(self, jaccard: float, pairs: int = 300) -> float:
+        rng = random.Random(int(jaccard * 1000))
+        hits = 0
+        for _ in range(pairs):
+            first, second = set_pair(jaccard, rng)
+            hits += share_a_band(minhash(first), minhash(second))
+        return hits / pairs
+
+    def test_recall_at_threshold(self):
+        """Pairs at the default 0.8 threshold land in a shared bucket ~95% of the time."""
+        assert self.candidate_rate(0.8) >= 0.9
+
+    def test_recall_above_threshold(self):
+        assert self.candidate_rate(0.9) >= 0.99
+
+    def test_dissimilar_pairs_rarely_collide(self):
+        assert self.candidate_rate(0.3) <= 0.02
+
+    def test_confirmed_above_threshold(self):
+        """Clear near-duplicates are both bucketed together and confirmed by their signatures."""
+        rng = random.Random(5)
+        confirmed = 0
+        for _ in range(200):
+            first, second = (minhash(items) for items in set_pair(0.95, rng))
+            confirmed += share_a_band(first, second) and signature_similarity(first, second) >= 0.8
+        assert confirmed >= 198
+
+
+class TestDuplicateIndex:
+    """Test suite for DuplicateIndex.check on an in-memory Redis."""
+
+    @pytest.fixture
+    def index(self, monkeypatch):
+        fakeredis = pytest.importorskip("fakeredis")
+        client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        monkeypatch.setattr(config, "FRAUD_DUPLICATE_THRESHOLD", 0.8)
+        index = DuplicateIndex()
+        index._client = client
+        return index
+
+    TEXT = (
+        "Lost my black leather wallet with two credit cards, a driving licence "
+        "and some cash near the central station on Monday evening"
+    )
+
+    @pytest.mark.asyncio
+    async def test_reposted_text_from_other_user(self, index):
+        await index.check({"id": "r1", "owner_id": "u1", "title": "Lost wallet", "description": self.TEXT})
+
+        matches = await index.check(
+            {"id": "r2", "owner_id": "u2", "title": "Lost wallet", "description": self.TEXT + " please"}
+        )
+        assert [(match["report_id"], match["kind"]) for match in matches] == [("r1", "text")]
+        assert matches[0]["similarity"] >= 0.8
+
+    @pytest.mark.asyncio
+    async def test_same_owner_and_unrelated_text_ignored(self, index):
+        await index.check({"id": "r1", "owner_id": "u1", "title": "Lost wallet", "description": self.TEXT})
+
+        assert await index.check(
+            {"id": "r2", "owner_id": "u1", "title": "Lost wallet", "description": self.TEXT}
+        ) == []
+        assert await index.check({
+            "id": "r3", "owner_id": "u3", "title": "Found keys",
+            "description": "Found a set of house keys with a red keyring outside the library yesterday",
+        }) == []
+
+    @pytest.mark.asyncio
+    async def test_photo_within_hamming_distance(self, index):
+        phash = "f0e1d2c3b4a59687"
+        near = f"{int(phash, 16) ^ 0b111:016x}"  # 3 bits apart
+        far = f"{int(phash, 16) ^ 0x0F0F0F0F0F0F0F0F:016x}"
+
+        await index.check({"id": "r1", "owner_id": "u1", "image_hashes": [phash]})
+
+        matches = await index.check({"id": "r2", "owner_id": "u2", "image_hashes": [near]})
+        assert [(match["report_id"], match["kind"]) for match in matches] == [("r1", "image")]
+        assert await index.check({"id": "r3", "owner_id": "u3", "image_hashes": [far]}) == []
+
+    @pytest.mark.asyncio
+    async def test_fails_open_without_redis(self):
+        class BrokenRedis:
+            def pipeline(self, **kwargs):
+                raise ConnectionError("Redis down")
+
+        index = DuplicateIndex()
+        index._client = BrokenRedis()
+
+        assert await index.check({"id": "r1", "owner_id": "u1", "description": self.TEXT}) == []
@@ -0,0 +1,19 @@
+"""Entry points import on their own, without app.main loaded first."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+API_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.mark.parametrize("module", ["app.worker", "app.main", "app.fraud_scoring", "app.job_queue"])
+def test_module_imports_in_fresh_interpreter(module):
+    """conftest imports app.main, so import cycles only show up in a new process."""
+    result = subprocess.run(
+        [sys.executable, "-c", f"import {module}"],
+        cwd=API_ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,84 @@
+"""Unit tests for KeywordMatcher against plain substring checks."""
+
+import random
+
+import pytest
+
+from app.services import fraud_detection_service as service_module
+from app.services.fraud_detection_service import KeywordMatcher, fraud_detection_service
+
+SERVICE_KEYWORDS = sorted({
+    keyword.lower()
+    for pattern in fraud_detection_service.keyword_patterns
+    for keyword in pattern.keywords
+})
+
+OVERLAPPING = ["instant", "instant reward", "reward", "war", "ward", "a", "an", "ant", "cash", "cashapp", "app"]
+
+
+def expected(keywords, text):
+    return {keyword.lower() for keyword in keywords if keyword.lower() in text}
+
+
+def random_texts(keywords, count=300, seed=7):
+    """Texts glued from keyword fragments and filler, so matches overlap and touch."""
+    rng = random.Random(seed)
+    filler = ["the", "lost", "wallet", "near", "station", "please", "contact", "me", "", " ", "-", "!"]
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 12)):
+            word = rng.choice(keywords) if rng.random() < 0.5 else rng.choice(filler)
+            if word and rng.random() < 0.2:
+                start = rng.randrange(len(word))
+                word = word[start:start + rng.randint(1, len(word))]
+            parts.append(word)
+        texts.append(rng.choice(["", " "]).join(parts))
+    return texts
+
+
+@pytest.fixture(params=["ahocorasick", "regex"])
+def backend(request, monkeypatch):
+    """Run each test on both implementations."""
+    if request.param == "ahocorasick":
+        if not service_module.AHOCORASICK_AVAILABLE:
+            pytest.skip("pyahocorasick not installed")
+    else:
+        monkeypatch.setattr(service_module, "AHOCORASICK_AVAILABLE", False)
+    return request.param
+
+
+class TestKeywordMatcher:
+    """Test suite for KeywordMatcher equivalence with `in` checks."""
+
+    def test_uses_requested_backend(self, backend):
+        matcher = KeywordMatcher(["reward"])
+        assert (matcher.automaton is not None) == (backend == "ahocorasick")
+
+    def test_service_keywords_on_random_texts(self, backend):
+        matcher = KeywordMatcher(SERVICE_KEYWORDS)
+        for text in random_texts(SERVICE_KEYWORDS):
+            assert matcher.find(text) == expected(SERVICE_KEYWORDS, text), text
+
+    def test_overlapping_keywords(self, backend):
+        matcher = KeywordMatcher(OVERLAPPING)
+        for text in ["instant reward", "instantreward", "cashapp awards", "a", "", "warden", "ant reward war"]:
+            assert matcher.find(text) == expected(OVERLAPPING, text), text
+
+    def test_overlapping_keywords_on_random_texts(self, backend):
+        matcher = KeywordMatcher(OVERLAPPING)
+        for text in random_texts(OVERLAPPING, seed=11):
+            assert matcher.find(text) == expected(OVERLAPPING, text), text
+
+    def test_keywords_are_lowercased(self, backend):
+        matcher = KeywordMatcher(["Western Union", "URGENT"])
+        assert matcher.find("send via western union, urgent") == {"western union", "urgent"}
+
+    def test_regex_metacharacters_are_literal(self, backend):
+        keywords = ["$100", "c.o.d", "(cash)", "100%"]
+        matcher = KeywordMatcher(keywords)
+        for text in ["pay $100 c.o.d (cash) 100%", "pay 100 cod cash", "c-o-d $1000"]:
+            assert matcher.find(text) == expected(keywords, text), text
+
+    def test_no_keywords(self, backend):
+        assert KeywordMatcher([]).find("anything at all") == set()
@@ -0,0 +1,218 @@
+"""Unit tests for the GCRA rate limiter and its local token leases."""
+
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from app import rate_limit
+from app.config import config
+from app.rate_limit import GCRA_SCRIPT, RateLimiter, RateLimitResult, TokenLeases, _leased_hit, script_args
+
+
+class FakeClock:
+    """Monotonic clock advanced by the test."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeGCRA:
+    """The GCRA script's arithmetic for one key, on the fake clock."""
+
+    def __init__(self, clock: FakeClock, limit: int, period: float):
+        self.clock = clock
+        self.limit = limit
+        self.interval = period * 1000 / limit
+        self.tat = 0.0
+        self.calls = 0
+
+    def __call__(self, cost: int) -> RateLimitResult:
+        self.calls += 1
+        now = self.clock.now * 1000
+        period = self.interval * self.limit
+        tat = max(self.tat, now)
+        new_tat = tat + self.interval * cost
+        allow_at = new_tat - period
+        if allow_at > now:
+            remaining = math.floor((period - (tat - now)) / self.interval)
+            return RateLimitResult.from_script(
+                self.limit, [0, remaining, math.ceil(allow_at - now), math.ceil(tat - now)]
+            )
+        if cost > 0:
+            self.tat = new_tat
+        remaining = math.floor((period - (new_tat - now)) / self.interval)
+        return RateLimitResult.from_script(self.limit, [1, remaining, 0, math.ceil(new_tat - now)])
+
+
+@pytest.fixture
+def gcra():
+    """The GCRA Lua script on an in-memory Redis (needs fakeredis with Lua support)."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    client = fakeredis.FakeRedis(decode_responses=True)
+    script = client.register_script(GCRA_SCRIPT)
+
+    def run(key: str, limit: int, period: float, cost: int = 1) -> RateLimitResult:
+        return RateLimitResult.from_script(limit, script(keys=[key], args=script_args(limit, period, cost)))
+
+    run.client = client
+    return run
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=clock))
+    monkeypatch.setattr(config, "RATE_LIMIT_LOCAL_BATCH", 10)
+    monkeypatch.setattr(config, "RATE_LIMIT_LOCAL_LEASE", 1.0)
+    return clock
+
+
+class TestTokenLeases:
+    """Test suite for leasing tokens to hot keys only."""
+
+    def test_spaced_low_rate_traffic_gets_its_full_limit(self, clock):
+        """20/hour hit every 2s: no lease is taken, so no token is forfeited."""
+        leases = TokenLeases()
+        gcra = FakeGCRA(clock, limit=20, period=3600)
+
+        allowed = 0
+        for _ in range(25):
+            allowed += _leased_hit(leases, "create_report:1.2.3.4", 20, gcra).allowed
+            clock.now += 2.0
+
+        assert allowed == 20
+        assert gcra.calls == 25
+
+    def test_hot_key_is_served_from_lease(self, clock):
+        """Once a key had a batch of hits in one lease period, Redis is called once per batch."""
+        leases = TokenLeases()
+        gcra = FakeGCRA(clock, limit=1000, period=60)
+
+        results = []
+        for _ in range(100):
+            results.append(_leased_hit(leases, "search:1.2.3.4", 1000, gcra))
+            clock.now += 0.0001
+
+        assert all(result.allowed for result in results)
+        # 9 single hits until the key is hot, then one call per batch of 10
+        assert gcra.calls == 9 + 10
+        assert results[-1].remaining == 1000 - 100
+
+    def test_leases_never_exceed_the_limit(self, clock):
+        """A hot key is cut off at exactly its limit."""
+        leases = TokenLeases()
+        gcra = FakeGCRA(clock, limit=100, period=3600)
+
+        allowed = sum(_leased_hit(leases, "burst", 100, gcra).allowed for _ in range(150))
+
+        assert allowed == 100
+
+    def test_expired_lease_forfeits_only_after_a_hot_period(self, clock):
+        """A key that goes quiet loses its lease; once quiet, hits go to Redis one by one."""
+        leases = TokenLeases()
+        gcra = FakeGCRA(clock, limit=100, period=3600)
+
+        for _ in range(11):
+            _leased_hit(leases, "quiet", 100, gcra)
+        assert gcra.calls == 10  # The 10th hit reserved a batch of 10
+
+        clock.now += 5.0
+        _leased_hit(leases, "quiet", 100, gcra)
+        assert gcra.calls == 11
+        assert leases.batch("quiet", 100) == 1
+
+
+class TestGCRAScript:
+    """Test suite for the GCRA script semantics."""
+
+    def test_burst_up_to_limit_then_denied(self, gcra):
+        """A fresh key allows a burst of `limit` hits, then reports when the next one fits."""
+        results = [gcra("login:1.2.3.4", 5, 60) for _ in range(6)]
+
+        assert [result.allowed for result in results] == [True] * 5 + [False]
+        assert [result.remaining for result in results[:5]] == [4, 3, 2, 1, 0]
+        # One emission interval (60s / 5) until a token is back
+        assert 11 < results[5].retry_after <= 12
+        assert 59 < results[5].reset_after <= 60
+
+    def test_zero_cost_only_reads(self, gcra):
+        """Cost 0 reports the state without consuming a token."""
+        gcra("search", 10, 60)
+        gcra("search", 10, 60)
+
+        peek = gcra("search", 10, 60, cost=0)
+        assert peek.allowed
+        assert peek.remaining == 8
+        assert gcra("search", 10, 60).remaining == 7
+
+    def test_denied_batch_consumes_nothing(self, gcra):
+        """A cost that doesn't fit is refused whole; a smaller one still fits."""
+        assert gcra("batch", 5, 60, cost=3).remaining == 2
+
+        denied = gcra("batch", 5, 60, cost=3)
+        assert not denied.allowed
+        assert denied.remaining == 2
+
+        assert gcra("batch", 5, 60, cost=2).allowed
+
+    def test_key_expires_when_fully_replenished(self, gcra):
+        """The key's TTL always matches the time until the limit is back to full."""
+        result = gcra("ttl", 4, 60, cost=2)
+
+        ttl_ms = gcra.client.pttl("ttl")
+        assert abs(ttl_ms - result.reset_after * 1000) <= 5
+        assert 29_000 < ttl_ms <= 30_000
+
+    def test_fresh_read_leaves_no_key(self, gcra):
+        """Reading an unknown key doesn't create it."""
+        assert gcra("unknown", 10, 60, cost=0).remaining == 10
+        assert not gcra.client.exists("unknown")
+
+
+class TestRateLimiter:
+    """Test suite for RateLimiter.hit on the GCRA script."""
+
+    @pytest.fixture
+    def limiter(self, monkeypatch):
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        monkeypatch.setattr(config, "RATE_LIMIT_LOCAL_BATCH", 10)
+        monkeypatch.setattr(config, "RATE_LIMIT_LOCAL_LEASE", 60.0)
+        limiter = RateLimiter()
+        limiter._script = fakeredis.aioredis.FakeRedis(decode_responses=True).register_script(GCRA_SCRIPT)
+        return limiter
+
+    @pytest.mark.asyncio
+    async def test_lease_path_counts_every_hit(self, limiter):
+        """Hot keys switch to leased batches; the reported remaining count stays exact."""
+        results = [await limiter.hit("api:1.2.3.4", 100, 3600) for _ in range(15)]
+
+        assert all(result.allowed for result in results)
+        assert [result.remaining for result in results] == list(range(99, 84, -1))
+        # 9 single hits, then one reservation of 10 serving the rest locally
+        peek = await limiter._run("api:1.2.3.4", 100, 3600, 0)
+        assert peek.remaining == 100 - 19
+
+    @pytest.mark.asyncio
+    async def test_lease_never_exceeds_limit(self, limiter):
+        """Leased and unleased hits together stop at exactly the limit."""
+        results = [await limiter.hit("burst", 30, 3600) for _ in range(40)]
+
+        assert sum(result.allowed for result in results) == 30
+        assert not results[-1].allowed
+
+    @pytest.mark.asyncio
+    async def test_fails_open_without_redis(self, limiter):
+        """A Redis error lets the hit through."""
+        async def broken(**kwargs):
+            raise ConnectionError("Redis down")
+        limiter._script = broken
+
+        result = await limiter.hit("any", 10, 60)
+        assert result.allowed
+        assert result.remaining == 10
@@ -252,6 +252,24 @@ def get_cache_key(data: str, prefix: str = "nlp") -> str:
     """Generate cache key for text processing."""
     return f"{prefix}:{hashlib.md5(data.encode()).hexdigest()}"
 
+def text_digest(text: str) -> str:
+    """Fixed-length digest of a text, used to build bounded cache keys."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def get_match_cache_key(query_digest: str, candidate_digests: List[str], algorithm: str) -> str:
+    """
+    Cache key for a whole /match request.
+    
+    Built from the sorted per-candidate digests so the key length does not grow
+    with the candidate list and reordering the candidates still hits the cache.
+    """
+    key_data = "|".join([query_digest, algorithm, *sorted(candidate_digests)])
+    return get_cache_key(key_data, "match")
+
+def get_match_pair_cache_key(query_digest: str, candidate_digest: str, algorithm: str) -> str:
+    """Cache key for the score of a single query/candidate pair."""
+    return f"match_pair:{algorithm}:{query_digest}:{candidate_digest}"
+
 async def get_from_cache(key: str) -> Optional[Dict]:
     """Get data from Redis cache."""
     if not redis_client:
@@ -280,6 +298,32 @@ async def set_cache(key: str, data: Dict) -> None:
     except Exception as e:
         logger.error(f"Cache set error: {e}")
 
+async def get_many_from_cache(keys: List[str]) -> List[Optional[Dict]]:
+    """Get several entries from Redis cache in one round-trip."""
+    if not redis_client or not keys:
+        return [None] * len(keys)
+    
+    try:
+        values = redis_client.mget(keys)
+        return [json.loads(value) if value else None for value in values]
+    except Exception as e:
+        logger.error(f"Cache mget error: {e}")
+    
+    return [None] * len(keys)
+
+async def set_many_cache(entries: Dict[str, Dict]) -> None:
+    """Set several entries in Redis cache in one pipeline."""
+    if not redis_client or not entries:
+        return
+    
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key, data in entries.items():
+            pipe.setex(key, config.REDIS_CACHE_TTL, json.dumps(data))
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"Cache pipeline set error: {e}")
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint."""
@@ -380,32 +424,65 @@ async def find_best_matches(request: MatchRequest):
     """Find best matches for a query text against candidate texts."""
     start_time = time.time()
     
-    # Check cache first
-    cache_data = f"{request.query_text}:{':'.join(request.candidate_texts)}:{request.algorithm}:{request.threshold}"
-    cache_key = get_cache_key(cache_data, "match")
+    query_digest = text_digest(request.query_text)
+    candidate_digests = [text_digest(text) for text in request.candidate_texts]
+    
+    # Check cache first. Scores are cached per candidate digest rather than per
+    # position, so the threshold and candidate order are applied afterwards.
+    cache_key = get_match_cache_key(query_digest, candidate_digests, request.algorithm)
     cached_result = await get_from_cache(cache_key)
     
     if cached_result:
-        cached_result["cached"] = True
-        return MatchResponse(**cached_result)
-    
-    # Preprocess query text
-    query_processed, _ = preprocess_text(request.query_text)
+        scores = cached_result["scores"]
+        cached = True
+    else:
+        # Reuse per-candidate results from overlapping candidate sets
+        unique_candidates = dict(zip(candidate_digests, request.candidate_texts))
+        pair_keys = {
+            digest: get_match_pair_cache_key(query_digest, digest, request.algorithm)
+            for digest in unique_candidates
+        }
+        cached_pairs = await get_many_from_cache(list(pair_keys.values()))
+        
+        scores = {}
+        for digest, cached_pair in zip(pair_keys, cached_pairs):
+            if cached_pair:
+                scores[digest] = cached_pair
+        
+        missing = [digest for digest in unique_candidates if digest not in scores]
+        new_pairs = {}
+        if missing:
+            # Preprocess query text
+            query_processed, _ = preprocess_text(request.query_text)
+            
+            for digest in missing:
+                candidate_processed, _ = preprocess_text(unique_candidates[digest])
+                
+                # Calculate similarity
+                similarity_score = calculate_similarity(query_processed, candidate_processed, request.algorithm)
+                
+                scores[digest] = {
+                    "similarity_score": float(similarity_score),
+                    "processed_text": candidate_processed
+                }
+                new_pairs[pair_keys[digest]] = scores[digest]
+        
+        # Cache results
+        await set_many_cache(new_pairs)
+        await set_cache(cache_key, {"scores": scores})
+        cached = not missing
     
     matches = []
     
     # Process each candidate
-    for i, candidate_text in enumerate(request.candidate_texts):
-        candidate_processed, _ = preprocess_text(candidate_text)
-        
-        # Calculate similarity
-        similarity_score = calculate_similarity(query_processed, candidate_processed, request.algorithm)
+    for i, (candidate_text, digest) in enumerate(zip(request.candidate_texts, candidate_digests)):
+        similarity_score = scores[digest]["similarity_score"]
         
         if similarity_score >= request.threshold:
             matches.append({
                 "index": i,
                 "text": candidate_text,
-                "processed_text": candidate_processed,
+                "processed_text": scores[digest]["processed_text"],
                 "similarity_score": similarity_score,
                 "algorithm": request.algorithm
             })
@@ -418,17 +495,12 @@ async def find_best_matches(request: MatchRequest):
     
     processing_time = (time.time() - start_time) * 1000
     
-    result = {
-        "matches": matches,
-        "total_candidates": len(request.candidate_texts),
-        "processing_time_ms": processing_time,
-        "cached": False
-    }
-    
-    # Cache result
-    await set_cache(cache_key, result)
-    
-    return MatchResponse(**result)
+    return MatchResponse(
+        matches=matches,
+        total_candidates=len(request.candidate_texts),
+        processing_time_ms=processing_time,
+        cached=cached
+    )
 
 @app.post("/process/batch", response_model=BatchTextResponse)
 async def process_batch(request: BatchTextRequest):
@@ -33,6 +33,7 @@ class Config:
     MAX_IMAGE_SIZE_MB: int = int(os.getenv("MAX_IMAGE_SIZE_MB", "10"))
     MAX_IMAGE_DIMENSION: int = int(os.getenv("MAX_IMAGE_DIMENSION", "4096"))
     SUPPORTED_FORMATS: list = os.getenv("SUPPORTED_FORMATS", "jpg,jpeg,png,webp,bmp").split(",")
+    UPLOAD_CHUNK_SIZE: int = int(os.getenv("UPLOAD_CHUNK_SIZE", str(256 * 1024)))  # 256 KB
     
     # Hash Configuration
     HASH_SIZE: int = int(os.getenv("HASH_SIZE", "8"))  # 8x8 = 64-bit hash
@@ -43,10 +44,17 @@ class Config:
     HASH_THRESHOLD_SIMILAR: int = int(os.getenv("HASH_THRESHOLD_SIMILAR", "10"))
     HASH_THRESHOLD_MATCH: int = int(os.getenv("HASH_THRESHOLD_MATCH", "5"))
     MAX_MATCHES: int = int(os.getenv("MAX_MATCHES", "20"))
+    MAX_BATCH_CANDIDATES: int = int(os.getenv("MAX_BATCH_CANDIDATES", "1000"))
+    
+    # Fused Similarity Weights (per hash type, normalized over the hashes compared)
+    HASH_WEIGHT_PHASH: float = float(os.getenv("HASH_WEIGHT_PHASH", "0.4"))
+    HASH_WEIGHT_DHASH: float = float(os.getenv("HASH_WEIGHT_DHASH", "0.3"))
+    HASH_WEIGHT_AHASH: float = float(os.getenv("HASH_WEIGHT_AHASH", "0.1"))
+    HASH_WEIGHT_WHASH: float = float(os.getenv("HASH_WEIGHT_WHASH", "0.2"))
     
     # Image Preprocessing
-    RESIZE_FOR_HASHING: bool = os.getenv("RESIZE_FOR_HASHING", "true").lower() == "true"
-    HASH_RESIZE_SIZE: int = int(os.getenv("HASH_RESIZE_SIZE", "32"))
+    ANALYSIS_MAX_SIZE: int = int(os.getenv("ANALYSIS_MAX_SIZE", "512"))  # Working resolution for decoding
+    HASH_RESIZE_SIZE: int = int(os.getenv("HASH_RESIZE_SIZE", "32"))  # Shared grid all hashes are computed from
     NORMALIZE_BRIGHTNESS: bool = os.getenv("NORMALIZE_BRIGHTNESS", "true").lower() == "true"
     ENHANCE_CONTRAST: bool = os.getenv("ENHANCE_CONTRAST", "true").lower() == "true"
     
@@ -58,6 +66,12 @@ class Config:
     # CORS
     CORS_ORIGINS: list = os.getenv("CORS_ORIGINS", "*").split(",")
     
+    # Image Worker Pool
+    IMAGE_EXECUTOR: str = os.getenv("IMAGE_EXECUTOR", "process")  # process or thread
+    IMAGE_WORKERS: int = int(os.getenv("IMAGE_WORKERS", str(os.cpu_count() or 2)))
+    IMAGE_QUEUE_SIZE: int = int(os.getenv("IMAGE_QUEUE_SIZE", "16"))  # Jobs waiting beyond busy workers
+    MAX_BATCH_SIZE: int = int(os.getenv("MAX_BATCH_SIZE", "20"))
+    
     # Timeouts
     PROCESSING_TIMEOUT: int = int(os.getenv("PROCESSING_TIMEOUT", "15"))
     
@@ -72,6 +86,9 @@ class Config:
         if cls.MAX_IMAGE_DIMENSION <= 0:
             errors.append("MAX_IMAGE_DIMENSION must be positive")
         
+        if cls.UPLOAD_CHUNK_SIZE <= 0:
+            errors.append("UPLOAD_CHUNK_SIZE must be positive")
+        
         if cls.REDIS_CACHE_TTL <= 0:
             errors.append("REDIS_CACHE_TTL must be positive")
         
@@ -81,6 +98,25 @@ class Config:
         if cls.HASH_SIZE <= 0:
             errors.append("HASH_SIZE must be positive")
         
+        if cls.HASH_RESIZE_SIZE < cls.HASH_SIZE or cls.HASH_RESIZE_SIZE % max(cls.HASH_SIZE, 1):
+            errors.append("HASH_RESIZE_SIZE must be a multiple of HASH_SIZE")
+        
+        if cls.ANALYSIS_MAX_SIZE < cls.HASH_RESIZE_SIZE:
+            errors.append("ANALYSIS_MAX_SIZE must be at least HASH_RESIZE_SIZE")
+        
+        hash_weights = (cls.HASH_WEIGHT_PHASH, cls.HASH_WEIGHT_DHASH, cls.HASH_WEIGHT_AHASH, cls.HASH_WEIGHT_WHASH)
+        if min(hash_weights) < 0 or sum(hash_weights) <= 0:
+            errors.append("HASH_WEIGHT_* must be non-negative and not all zero")
+        
+        if cls.IMAGE_EXECUTOR not in ("process", "thread"):
+            errors.append("IMAGE_EXECUTOR must be 'process' or 'thread'")
+        
+        if cls.IMAGE_WORKERS <= 0:
+            errors.append("IMAGE_WORKERS must be positive")
+        
+        if cls.IMAGE_QUEUE_SIZE < 0:
+            errors.append("IMAGE_QUEUE_SIZE must not be negative")
+        
         if errors:
             raise ValueError(f"Configuration errors: {', '.join(errors)}")
         
@@ -105,17 +141,31 @@ class Config:
                 "max_size_mb": cls.MAX_IMAGE_SIZE_MB,
                 "max_dimension": cls.MAX_IMAGE_DIMENSION,
                 "supported_formats": cls.SUPPORTED_FORMATS,
+                "upload_chunk_size": cls.UPLOAD_CHUNK_SIZE,
                 "hash_size": cls.HASH_SIZE,
                 "multiple_hashes": cls.ENABLE_MULTIPLE_HASHES,
             },
+            "workers": {
+                "executor": cls.IMAGE_EXECUTOR,
+                "image_workers": cls.IMAGE_WORKERS,
+                "queue_size": cls.IMAGE_QUEUE_SIZE,
+                "max_batch_size": cls.MAX_BATCH_SIZE,
+            },
             "matching": {
                 "similarity_threshold": cls.SIMILARITY_THRESHOLD,
                 "hash_threshold_similar": cls.HASH_THRESHOLD_SIMILAR,
                 "hash_threshold_match": cls.HASH_THRESHOLD_MATCH,
                 "max_matches": cls.MAX_MATCHES,
+                "max_batch_candidates": cls.MAX_BATCH_CANDIDATES,
+                "hash_weights": {
+                    "phash": cls.HASH_WEIGHT_PHASH,
+                    "dhash": cls.HASH_WEIGHT_DHASH,
+                    "ahash": cls.HASH_WEIGHT_AHASH,
+                    "whash": cls.HASH_WEIGHT_WHASH,
+                },
             },
             "preprocessing": {
-                "resize_for_hashing": cls.RESIZE_FOR_HASHING,
+                "analysis_max_size": cls.ANALYSIS_MAX_SIZE,
                 "hash_resize_size": cls.HASH_RESIZE_SIZE,
                 "normalize_brightness": cls.NORMALIZE_BRIGHTNESS,
                 "enhance_contrast": cls.ENHANCE_CONTRAST,
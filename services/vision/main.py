@@ -10,10 +10,13 @@ Improved image processing service with better matching:
 
 from fastapi import FastAPI, HTTPException, File, UploadFile, Request
 from fastapi.responses import Response
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any, Tuple
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional, Dict, Any, Tuple, Callable
+from functools import lru_cache
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import multiprocessing
 from PIL import Image, ImageEnhance, ImageOps, ImageFilter
-import imagehash
 import io
 import logging
 import time
@@ -37,18 +40,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Bumped whenever the bits an image hashes to change. Hashes of different
+# versions are not comparable: stored ones must be recomputed, not matched.
+#   1: imagehash on a full-resolution RGB decode, LANCZOS-resized to the grid
+#   2: draft-mode grayscale decode, numpy hashes on the shared grid
+HASH_VERSION = 2
+
 # Import configuration
 from config import config
 
 # Initialize Redis connection
 redis_client = None
 
+# Pool for CPU-bound image work, and the number of jobs admitted to it
+image_executor: Optional[Executor] = None
+image_jobs_in_flight = 0
+
+
+class ImageProcessingError(Exception):
+    """Raised by image pool jobs; plain exception so it survives pickling."""
+
+
+class ImageDimensionError(ImageProcessingError):
+    """Raised when a decoded image exceeds MAX_IMAGE_DIMENSION."""
+
 # Pydantic models
 class ImageHashResponse(BaseModel):
     phash: str
     dhash: str
     ahash: str
     whash: str
+    hash_version: int = HASH_VERSION
     image_size: Dict[str, int]
     file_size_bytes: int
     processing_time_ms: float
@@ -66,9 +88,17 @@ class ImageInfoResponse(BaseModel):
     quality_metrics: Dict[str, float] = {}
 
 class SimilarityRequest(BaseModel):
-    hash1: str = Field(..., description="First image hash")
-    hash2: str = Field(..., description="Second image hash")
-    algorithm: str = Field("combined", description="Similarity algorithm: hamming, cosine, combined")
+    hash1: Optional[str] = Field(None, description="First image hash (phash)")
+    hash2: Optional[str] = Field(None, description="Second image hash (phash)")
+    hashes1: Optional[Dict[str, str]] = Field(None, description="All hashes of the first image, keyed by type")
+    hashes2: Optional[Dict[str, str]] = Field(None, description="All hashes of the second image, keyed by type")
+    algorithm: str = Field("combined", description="Similarity algorithm: hamming, cosine, combined, fused")
+    
+    @model_validator(mode="after")
+    def check_hashes(self):
+        if not (self.hash1 or self.hashes1) or not (self.hash2 or self.hashes2):
+            raise ValueError("Both images need a hash (hash1/hash2) or a hash set (hashes1/hashes2)")
+        return self
 
 class SimilarityResponse(BaseModel):
     similarity_score: float
@@ -76,11 +106,24 @@ class SimilarityResponse(BaseModel):
     algorithm: str
     processing_time_ms: float
     cached: bool = False
+    hash_distances: Dict[str, int] = {}
+
+class BatchSimilarityRequest(BaseModel):
+    query_hashes: Dict[str, str] = Field(..., description="Hashes of the query image, keyed by type")
+    candidates: List[Dict[str, Any]] = Field(..., min_items=1, description="Candidate hash sets, each optionally with metadata")
+    threshold: float = Field(0.0, ge=0.0, le=1.0, description="Minimum fused similarity")
+    top_k: Optional[int] = Field(None, ge=1, description="Maximum number of results")
+
+class BatchSimilarityResponse(BaseModel):
+    results: List[Dict[str, Any]]
+    total_candidates: int
+    processing_time_ms: float
 
 class MatchRequest(BaseModel):
     query_hash: str = Field(..., description="Query image hash")
+    query_hashes: Optional[Dict[str, str]] = Field(None, description="All hashes of the query image, for fused matching")
     candidate_hashes: List[Dict[str, str]] = Field(..., min_items=1, max_items=100, description="List of candidate hashes with metadata")
-    algorithm: str = Field("combined", description="Matching algorithm")
+    algorithm: str = Field("combined", description="Matching algorithm: hamming, cosine, combined, fused")
     threshold: float = Field(0.8, ge=0.0, le=1.0, description="Minimum similarity threshold")
 
 class MatchResponse(BaseModel):
@@ -111,8 +154,21 @@ app = FastAPI(
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize Redis connection on startup."""
-    global redis_client
+    """Initialize Redis connection and the image worker pool on startup."""
+    global redis_client, image_executor
+    if config.IMAGE_EXECUTOR == "process":
+        # Decoding and hashing small arrays mostly hold the GIL, so scale across processes
+        image_executor = ProcessPoolExecutor(
+            max_workers=config.IMAGE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    else:
+        image_executor = ThreadPoolExecutor(
+            max_workers=config.IMAGE_WORKERS,
+            thread_name_prefix="image-worker"
+        )
+    logger.info(f"Image worker pool started: {config.IMAGE_WORKERS} {config.IMAGE_EXECUTOR} workers")
+    
     try:
         if config.ENABLE_REDIS_CACHE:
             redis_client = redis.from_url(
@@ -130,11 +186,15 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close Redis connection on shutdown."""
-    global redis_client
+    """Close Redis connection and stop the image worker pool on shutdown."""
+    global redis_client, image_executor
     if redis_client:
         await asyncio.to_thread(redis_client.close)
         logger.info("Redis connection closed")
+    if image_executor:
+        await asyncio.to_thread(image_executor.shutdown, wait=True, cancel_futures=True)
+        image_executor = None
+        logger.info("Image worker pool stopped")
 
 def validate_image_format(filename: str) -> bool:
     """Validate image format."""
@@ -149,38 +209,100 @@ def validate_image_size(file_size_bytes: int) -> bool:
     max_size_bytes = config.MAX_IMAGE_SIZE_MB * 1024 * 1024
     return file_size_bytes <= max_size_bytes
 
-def preprocess_image(image: Image.Image) -> Image.Image:
-    """Enhanced image preprocessing for better hashing."""
-    # Convert to RGB if necessary
-    if image.mode != 'RGB':
-        image = image.convert('RGB')
+async def read_upload(file: UploadFile) -> Tuple[io.BytesIO, int, str]:
+    """
+    Read an uploaded image in chunks.
     
-    # Resize for consistent hashing
-    if config.RESIZE_FOR_HASHING:
-        image = image.resize((config.HASH_RESIZE_SIZE, config.HASH_RESIZE_SIZE), Image.Resampling.LANCZOS)
+    The size limit is enforced while reading, so oversized uploads are rejected
+    without being buffered, and a BLAKE2 digest of the content is computed on
+    the fly for use as a cache key.
     
-    # Normalize brightness
-    if config.NORMALIZE_BRIGHTNESS:
-        # Convert to numpy array for processing
-        img_array = np.array(image)
+    Returns:
+        Tuple of (buffer positioned at the start, size in bytes, hex digest)
+    """
+    too_large = HTTPException(
+        status_code=400,
+        detail=f"Image too large. Max size: {config.MAX_IMAGE_SIZE_MB}MB"
+    )
+    
+    # Reject early when the client declared the size up front
+    if file.size is not None and not validate_image_size(file.size):
+        raise too_large
+    
+    hasher = hashlib.blake2b(digest_size=32)
+    buffer = io.BytesIO()
+    file_size = 0
+    
+    while True:
+        chunk = await file.read(config.UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
         
-        # Calculate mean brightness
-        mean_brightness = np.mean(img_array)
-        target_brightness = 128
+        file_size += len(chunk)
+        if not validate_image_size(file_size):
+            raise too_large
         
-        # Adjust brightness
+        hasher.update(chunk)
+        buffer.write(chunk)
+    
+    buffer.seek(0)
+    return buffer, file_size, hasher.hexdigest()
+
+def load_analysis_image(image_bytes: bytes, check_dimensions: bool = True) -> Tuple[Image.Image, Dict[str, Any]]:
+    """
+    Decode an image once, in grayscale, at a reduced working resolution.
+    
+    JPEGs are decoded directly at 1/2, 1/4 or 1/8 scale via draft mode, so a
+    12 MP photo never gets fully decoded. Other formats are decoded normally
+    and converted to grayscale once.
+    
+    Returns:
+        Tuple of (grayscale image, details of the original image)
+    
+    Raises:
+        ImageDimensionError: if check_dimensions and the image exceeds MAX_IMAGE_DIMENSION
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+    details = {
+        "width": image.width,
+        "height": image.height,
+        "format": image.format or "unknown",
+        "mode": image.mode
+    }
+    
+    # Validate image dimensions
+    if check_dimensions and (image.width > config.MAX_IMAGE_DIMENSION or image.height > config.MAX_IMAGE_DIMENSION):
+        raise ImageDimensionError(f"Image too large. Max dimension: {config.MAX_IMAGE_DIMENSION}px")
+    
+    image.draft("L", (config.ANALYSIS_MAX_SIZE, config.ANALYSIS_MAX_SIZE))
+    gray = image.convert("L")
+    
+    # Bound the working size for formats without draft support
+    if max(gray.size) > config.ANALYSIS_MAX_SIZE:
+        gray.thumbnail((config.ANALYSIS_MAX_SIZE, config.ANALYSIS_MAX_SIZE), Image.Resampling.BILINEAR)
+    
+    return gray, details
+
+def preprocess_image(gray: Image.Image) -> np.ndarray:
+    """Downscale a grayscale image to the shared hashing grid and normalize it."""
+    size = config.HASH_RESIZE_SIZE
+    pixels = np.asarray(
+        gray.resize((size, size), Image.Resampling.LANCZOS, reducing_gap=3.0),
+        dtype=np.float32
+    )
+    
+    # Normalize brightness
+    if config.NORMALIZE_BRIGHTNESS:
+        mean_brightness = pixels.mean()
         if mean_brightness != 0:
-            brightness_factor = target_brightness / mean_brightness
-            img_array = np.clip(img_array * brightness_factor, 0, 255)
-        
-        image = Image.fromarray(img_array.astype(np.uint8))
+            pixels = np.clip(pixels * (128.0 / mean_brightness), 0, 255)
     
-    # Enhance contrast
+    # Enhance contrast (slight, around the mean as PIL's ImageEnhance.Contrast does)
     if config.ENHANCE_CONTRAST:
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(1.2)  # Slight contrast enhancement
+        mean_brightness = pixels.mean()
+        pixels = np.clip(mean_brightness + (pixels - mean_brightness) * 1.2, 0, 255)
     
-    return image
+    return pixels
 
 def calculate_image_quality(image: Image.Image) -> Dict[str, float]:
     """Calculate image quality metrics."""
@@ -216,24 +338,105 @@ def calculate_image_quality(image: Image.Image) -> Dict[str, float]:
             "noise_level": 0.0
         }
 
-def generate_multiple_hashes(image: Image.Image) -> Dict[str, str]:
-    """Generate multiple types of perceptual hashes."""
+@lru_cache(maxsize=4)
+def dct_matrix(size: int) -> np.ndarray:
+    """DCT-II basis, so a 2-D DCT is two matrix products."""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    return np.cos(np.pi * k * (2 * n + 1) / (2 * size))
+
+def bits_to_hex(bits: np.ndarray) -> str:
+    """Pack a boolean hash array into a hex string, most significant bit first."""
+    flat = bits.ravel()
+    packed = np.packbits(flat)
+    value = int.from_bytes(packed.tobytes(), "big") >> (packed.size * 8 - flat.size)
+    return f"{value:0{(flat.size + 3) // 4}x}"
+
+def generate_multiple_hashes(pixels: np.ndarray) -> Dict[str, str]:
+    """
+    Generate phash, dhash, ahash and whash from one preprocessed grid.
+    
+    These are the HASH_VERSION 2 hashes, modelled on the imagehash ones but
+    not bit-compatible with them (dhash resamples with INTER_AREA, ahash and
+    whash use block means; whash with the top Haar LL removed reduces to
+    block means against their median).
+    """
     try:
-        # Preprocess image
-        processed_image = preprocess_image(image)
+        hash_size = config.HASH_SIZE
+        block = pixels.shape[0] // hash_size
         
-        # Generate different types of hashes
-        hashes = {
-            "phash": str(imagehash.phash(processed_image, hash_size=config.HASH_SIZE)),
-            "dhash": str(imagehash.dhash(processed_image, hash_size=config.HASH_SIZE)),
-            "ahash": str(imagehash.average_hash(processed_image, hash_size=config.HASH_SIZE)),
-            "whash": str(imagehash.whash(processed_image, hash_size=config.HASH_SIZE))
-        }
+        # phash: low-frequency DCT coefficients against their median, rounded
+        # so float noise on flat regions does not flip bits
+        basis = dct_matrix(pixels.shape[0])
+        dct_low = np.round((basis @ pixels @ basis.T)[:hash_size, :hash_size], 4)
         
-        return hashes
+        # ahash/whash: hash_size x hash_size block means
+        block_means = pixels.reshape(hash_size, block, hash_size, block).mean(axis=(1, 3))
+        
+        # dhash: horizontal gradient on a (hash_size + 1) x hash_size grid
+        gradient = cv2.resize(pixels, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+        
+        return {
+            "phash": bits_to_hex(dct_low > np.median(dct_low)),
+            "dhash": bits_to_hex(gradient[:, 1:] > gradient[:, :-1]),
+            "ahash": bits_to_hex(block_means > block_means.mean()),
+            "whash": bits_to_hex(block_means > np.median(block_means))
+        }
     except Exception as e:
         logger.error(f"Hash generation error: {e}")
-        raise HTTPException(status_code=500, detail="Failed to generate image hashes")
+        raise ImageProcessingError("Failed to generate image hashes") from e
+
+def hash_image_bytes(image_bytes: bytes) -> Dict[str, Any]:
+    """Decode an image and compute its hashes and quality metrics (pool job)."""
+    gray, details = load_analysis_image(image_bytes)
+    hashes = generate_multiple_hashes(preprocess_image(gray))
+    quality_metrics = calculate_image_quality(gray)
+    
+    return {
+        **hashes,
+        "image_size": {
+            "width": details["width"],
+            "height": details["height"]
+        },
+        "quality_metrics": quality_metrics
+    }
+
+def inspect_image_bytes(image_bytes: bytes) -> Dict[str, Any]:
+    """Decode an image and compute its format details and quality metrics (pool job)."""
+    # Reporting on images too large to hash is part of what /info is for
+    gray, details = load_analysis_image(image_bytes, check_dimensions=False)
+    
+    return {
+        **details,
+        "quality_metrics": calculate_image_quality(gray)
+    }
+
+@asynccontextmanager
+async def reserve_image_workers(jobs: int = 1):
+    """
+    Admit jobs to the image worker pool.
+    
+    At most IMAGE_WORKERS + IMAGE_QUEUE_SIZE jobs are in flight at once; beyond
+    that the request is rejected with 503 instead of queueing without bound.
+    """
+    global image_jobs_in_flight
+    if image_jobs_in_flight + jobs > config.IMAGE_WORKERS + config.IMAGE_QUEUE_SIZE:
+        raise HTTPException(
+            status_code=503,
+            detail="Image workers are busy, please retry",
+            headers={"Retry-After": "1"}
+        )
+    
+    image_jobs_in_flight += jobs
+    try:
+        yield
+    finally:
+        image_jobs_in_flight -= jobs
+
+async def run_image_job(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a CPU-bound image function in the worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(image_executor, func, *args)
 
 def calculate_hash_similarity(hash1: str, hash2: str, algorithm: str = "combined") -> Tuple[float, int]:
     """Calculate similarity between two hashes."""
@@ -299,6 +502,95 @@ def calculate_hash_similarity(hash1: str, hash2: str, algorithm: str = "combined
         logger.error(f"Similarity calculation error: {e}")
         return 0.0, 0
 
+FUSED_HASH_TYPES = ("phash", "dhash", "ahash", "whash")
+POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def fused_hash_weights() -> np.ndarray:
+    """Configured weight of each hash type, in FUSED_HASH_TYPES order."""
+    return np.array([
+        config.HASH_WEIGHT_PHASH,
+        config.HASH_WEIGHT_DHASH,
+        config.HASH_WEIGHT_AHASH,
+        config.HASH_WEIGHT_WHASH
+    ])
+
+def pack_hash_sets(hash_sets: List[Dict[str, Any]], hex_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pack hash sets into a (n, hash types, bytes) uint8 array.
+    
+    Returns the packed array and a (n, hash types) mask of which hashes were
+    present and well-formed.
+    """
+    padded_length = hex_length + hex_length % 2
+    packed = np.zeros((len(hash_sets), len(FUSED_HASH_TYPES), padded_length // 2), dtype=np.uint8)
+    present = np.zeros((len(hash_sets), len(FUSED_HASH_TYPES)), dtype=bool)
+    
+    for i, hashes in enumerate(hash_sets):
+        for j, hash_type in enumerate(FUSED_HASH_TYPES):
+            value = hashes.get(hash_type)
+            if not isinstance(value, str) or len(value) != hex_length:
+                continue
+            try:
+                packed[i, j] = np.frombuffer(bytes.fromhex(value.zfill(padded_length)), dtype=np.uint8)
+            except ValueError:
+                continue
+            present[i, j] = True
+    
+    return packed, present
+
+def fused_hash_similarity(
+    query_hashes: Dict[str, str],
+    candidate_hash_sets: List[Dict[str, Any]]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Score one image against many using phash, dhash, ahash and whash together.
+    
+    All Hamming distances come from one XOR + popcount pass over the packed
+    hashes. Each hash type's similarity is weighted by its configured weight,
+    normalized over the hash types both sides actually have.
+    
+    Returns:
+        Tuple of (fused scores (n,), Hamming distances (n, hash types),
+        mask of compared hash types (n, hash types))
+    """
+    query_values = [query_hashes.get(hash_type) for hash_type in FUSED_HASH_TYPES]
+    hex_length = max((len(value) for value in query_values if value), default=0)
+    if hex_length == 0:
+        raise ValueError("Query has no hashes to compare")
+    
+    query, query_present = pack_hash_sets([query_hashes], hex_length)
+    candidates, candidate_present = pack_hash_sets(candidate_hash_sets, hex_length)
+    
+    distances = POPCOUNT_TABLE[candidates ^ query].sum(axis=2, dtype=np.int64)
+    compared = candidate_present & query_present
+    
+    similarities = 1.0 - distances / (hex_length * 4)
+    weights = fused_hash_weights() * compared
+    total_weight = weights.sum(axis=1)
+    scores = np.divide(
+        (similarities * weights).sum(axis=1),
+        total_weight,
+        out=np.zeros(len(candidate_hash_sets)),
+        where=total_weight > 0
+    )
+    
+    return scores, distances, compared
+
+def fused_result(score: float, distances: np.ndarray, compared: np.ndarray) -> Tuple[float, int, Dict[str, int]]:
+    """
+    Summarize one fused comparison as (score, Hamming distance, per-hash distances).
+    
+    The Hamming distance is the phash one when phash was compared, so it keeps
+    the meaning of the single-hash algorithms; otherwise it is the total.
+    """
+    hash_distances = {
+        hash_type: int(distance)
+        for hash_type, distance, was_compared in zip(FUSED_HASH_TYPES, distances, compared)
+        if was_compared
+    }
+    hamming_dist = hash_distances.get("phash", sum(hash_distances.values()))
+    return float(score), hamming_dist, hash_distances
+
 def hamming_distance(s1: str, s2: str) -> int:
     """Calculate Hamming distance between two binary strings."""
     if len(s1) != len(s2):
@@ -310,6 +602,20 @@ def get_cache_key(data: str, prefix: str = "vision") -> str:
     """Generate cache key for image processing."""
     return f"{prefix}:{hashlib.md5(data.encode()).hexdigest()}"
 
+def get_hash_cache_key(content_digest: str) -> str:
+    """Cache key of an image's hashes; versioned, so older hashes are never served."""
+    return f"hash:v{HASH_VERSION}:{content_digest}"
+
+def get_match_cache_key(query_hash: str, candidate_hashes: List[str], algorithm: str) -> str:
+    """
+    Cache key for a whole /match request.
+    
+    Built from the sorted candidate hashes so two different candidate lists never
+    share a key and reordering the same candidates still hits the cache.
+    """
+    key_data = "|".join([query_hash.lower(), algorithm, *sorted(h.lower() for h in candidate_hashes)])
+    return get_cache_key(key_data, "match")
+
 async def get_from_cache(key: str) -> Optional[Dict]:
     """Get data from Redis cache."""
     if not redis_client:
@@ -364,6 +670,37 @@ async def health_check():
         opencv_available=opencv_available
     )
 
+async def compute_image_hashes(image_bytes: bytes, file_size: int, content_digest: str, start_time: float) -> Dict[str, Any]:
+    """Hash an uploaded image in the worker pool and cache the result."""
+    try:
+        analysis = await run_image_job(hash_image_bytes, image_bytes)
+    except ImageDimensionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Image processing error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to process image")
+    
+    quality_score = analysis["quality_metrics"]["sharpness"] / 1000.0  # Normalize sharpness
+    processing_time = (time.time() - start_time) * 1000
+    
+    result = {
+        "phash": analysis["phash"],
+        "dhash": analysis["dhash"],
+        "ahash": analysis["ahash"],
+        "whash": analysis["whash"],
+        "hash_version": HASH_VERSION,
+        "image_size": analysis["image_size"],
+        "file_size_bytes": file_size,
+        "processing_time_ms": processing_time,
+        "cached": False,
+        "quality_score": quality_score
+    }
+    
+    # Cache result
+    await set_cache(get_hash_cache_key(content_digest), result)
+    
+    return result
+
 @app.post("/hash", response_model=ImageHashResponse)
 async def generate_image_hash(file: UploadFile = File(...)):
     """Generate multiple perceptual hashes for uploaded image."""
@@ -373,77 +710,95 @@ async def generate_image_hash(file: UploadFile = File(...)):
     if not validate_image_format(file.filename):
         raise HTTPException(status_code=400, detail="Invalid image file")
     
-    # Read file content
-    file_content = await file.read()
-    file_size = len(file_content)
-    
-    # Check file size
-    if not validate_image_size(file_size):
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Image too large. Max size: {config.MAX_IMAGE_SIZE_MB}MB"
-        )
+    # Read file content, checking size and hashing the bytes as they arrive
+    file_buffer, file_size, content_digest = await read_upload(file)
     
     # Check cache first
-    cache_key = get_cache_key(str(file_content), "hash")
-    cached_result = await get_from_cache(cache_key)
+    cached_result = await get_from_cache(get_hash_cache_key(content_digest))
     
     if cached_result:
         cached_result["cached"] = True
         return ImageHashResponse(**cached_result)
     
-    try:
-        # Open image
-        image = Image.open(io.BytesIO(file_content))
-        
-        # Validate image dimensions
-        if image.width > config.MAX_IMAGE_DIMENSION or image.height > config.MAX_IMAGE_DIMENSION:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Image too large. Max dimension: {config.MAX_IMAGE_DIMENSION}px"
-            )
-        
-        # Generate hashes
-        hashes = generate_multiple_hashes(image)
-        
-        # Calculate quality metrics
-        quality_metrics = calculate_image_quality(image)
-        quality_score = quality_metrics["sharpness"] / 1000.0  # Normalize sharpness
-        
-        processing_time = (time.time() - start_time) * 1000
-        
-        result = {
-            "phash": hashes["phash"],
-            "dhash": hashes["dhash"],
-            "ahash": hashes["ahash"],
-            "whash": hashes["whash"],
-            "image_size": {
-                "width": image.width,
-                "height": image.height
-            },
-            "file_size_bytes": file_size,
-            "processing_time_ms": processing_time,
-            "cached": False,
-            "quality_score": quality_score
-        }
-        
-        # Cache result
-        await set_cache(cache_key, result)
-        
-        return ImageHashResponse(**result)
-        
-    except Exception as e:
-        logger.error(f"Image processing error: {e}")
-        raise HTTPException(status_code=500, detail="Failed to process image")
+    async with reserve_image_workers():
+        result = await compute_image_hashes(file_buffer.getvalue(), file_size, content_digest, start_time)
+    
+    return ImageHashResponse(**result)
+
+@app.post("/hash/batch", response_model=BatchImageResponse)
+async def generate_image_hashes_batch(files: List[UploadFile] = File(...)):
+    """Generate hashes for several uploaded images, fanned out across the worker pool."""
+    start_time = time.time()
+    
+    if len(files) > config.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many images. Max batch size: {config.MAX_BATCH_SIZE}"
+        )
+    
+    for file in files:
+        if not validate_image_format(file.filename):
+            raise HTTPException(status_code=400, detail=f"Invalid image file: {file.filename}")
+    
+    uploads = [await read_upload(file) for file in files]
+    cached_results = await asyncio.gather(
+        *(get_from_cache(get_hash_cache_key(content_digest)) for _, _, content_digest in uploads)
+    )
+    
+    results: List[Optional[Dict[str, Any]]] = []
+    pending: Dict[str, Tuple[bytes, int]] = {}
+    for (file_buffer, file_size, content_digest), cached_result in zip(uploads, cached_results):
+        if cached_result:
+            cached_result["cached"] = True
+        elif content_digest not in pending:
+            pending[content_digest] = (file_buffer.getvalue(), file_size)
+        results.append(cached_result)
+    
+    if pending:
+        # Admitted in slices the pool can hold, so a batch larger than the
+        # pool's capacity is processed in turns rather than always rejected
+        capacity = config.IMAGE_WORKERS + config.IMAGE_QUEUE_SIZE
+        jobs = list(pending.items())
+        computed = []
+        for offset in range(0, len(jobs), capacity):
+            batch = jobs[offset:offset + capacity]
+            async with reserve_image_workers(len(batch)):
+                computed += await asyncio.gather(*(
+                    compute_image_hashes(image_bytes, file_size, content_digest, start_time)
+                    for content_digest, (image_bytes, file_size) in batch
+                ))
+        computed_by_digest = dict(zip(pending, computed))
+        results = [
+            result if result is not None else computed_by_digest[content_digest]
+            for result, (_, _, content_digest) in zip(results, uploads)
+        ]
+    
+    total_time = (time.time() - start_time) * 1000
+    
+    return BatchImageResponse(
+        results=[ImageHashResponse(**result) for result in results],
+        total_processing_time_ms=total_time,
+        cached_count=sum(1 for result in cached_results if result)
+    )
 
 @app.post("/similarity", response_model=SimilarityResponse)
 async def calculate_image_similarity(request: SimilarityRequest):
-    """Calculate similarity between two image hashes."""
+    """Calculate similarity between two image hashes, or two hash sets with algorithm=fused."""
     start_time = time.time()
     
+    hashes1 = request.hashes1 or {"phash": request.hash1}
+    hashes2 = request.hashes2 or {"phash": request.hash2}
+    
     # Check cache first
-    cache_data = f"{request.hash1}:{request.hash2}:{request.algorithm}"
-    cache_key = get_cache_key(cache_data, "similarity")
+    if request.algorithm == "fused":
+        cache_data = "|".join(
+            f"{hash_type}={hashes.get(hash_type, '')}"
+            for hashes in (hashes1, hashes2)
+            for hash_type in FUSED_HASH_TYPES
+        )
+    else:
+        cache_data = f"{request.hash1 or hashes1.get('phash')}:{request.hash2 or hashes2.get('phash')}"
+    cache_key = get_cache_key(f"{cache_data}:{request.algorithm}", "similarity")
     cached_result = await get_from_cache(cache_key)
     
     if cached_result:
@@ -451,11 +806,19 @@ async def calculate_image_similarity(request: SimilarityRequest):
         return SimilarityResponse(**cached_result)
     
     # Calculate similarity
-    similarity_score, hamming_dist = calculate_hash_similarity(
-        request.hash1, 
-        request.hash2, 
-        request.algorithm
-    )
+    hash_distances: Dict[str, int] = {}
+    if request.algorithm == "fused":
+        try:
+            scores, distances, compared = fused_hash_similarity(hashes1, [hashes2])
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        similarity_score, hamming_dist, hash_distances = fused_result(scores[0], distances[0], compared[0])
+    else:
+        hash1 = request.hash1 or hashes1.get("phash")
+        hash2 = request.hash2 or hashes2.get("phash")
+        if not hash1 or not hash2:
+            raise HTTPException(status_code=400, detail="Both images need a phash")
+        similarity_score, hamming_dist = calculate_hash_similarity(hash1, hash2, request.algorithm)
     
     processing_time = (time.time() - start_time) * 1000
     
@@ -464,7 +827,8 @@ async def calculate_image_similarity(request: SimilarityRequest):
         "hamming_distance": hamming_dist,
         "algorithm": request.algorithm,
         "processing_time_ms": processing_time,
-        "cached": False
+        "cached": False,
+        "hash_distances": hash_distances
     }
     
     # Cache result
@@ -472,36 +836,124 @@ async def calculate_image_similarity(request: SimilarityRequest):
     
     return SimilarityResponse(**result)
 
+@app.post("/similarity/batch", response_model=BatchSimilarityResponse)
+async def calculate_batch_similarity(request: BatchSimilarityRequest):
+    """Score one image's hash set against many candidates with the fused scorer."""
+    start_time = time.time()
+    
+    if len(request.candidates) > config.MAX_BATCH_CANDIDATES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many candidates. Max: {config.MAX_BATCH_CANDIDATES}"
+        )
+    
+    try:
+        scores, distances, compared = fused_hash_similarity(request.query_hashes, request.candidates)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Best first, then drop everything under the threshold or with no hash in common
+    order = np.argsort(-scores, kind="stable")
+    order = order[(scores[order] >= request.threshold) & compared[order].any(axis=1)]
+    if request.top_k:
+        order = order[:request.top_k]
+    
+    results = []
+    for i in order:
+        similarity_score, hamming_dist, hash_distances = fused_result(scores[i], distances[i], compared[i])
+        results.append({
+            "index": int(i),
+            "similarity_score": similarity_score,
+            "hamming_distance": hamming_dist,
+            "hash_distances": hash_distances,
+            "metadata": request.candidates[i].get("metadata", {})
+        })
+    
+    processing_time = (time.time() - start_time) * 1000
+    
+    return BatchSimilarityResponse(
+        results=results,
+        total_candidates=len(request.candidates),
+        processing_time_ms=processing_time
+    )
+
+def match_fused(request: MatchRequest, start_time: float) -> MatchResponse:
+    """
+    /match with algorithm=fused: every candidate's full hash set is scored in one pass.
+    
+    Not cached, since scoring is cheaper than the Redis round-trip.
+    """
+    query_hashes = request.query_hashes or {"phash": request.query_hash}
+    try:
+        scores, distances, compared = fused_hash_similarity(query_hashes, request.candidate_hashes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    matches = []
+    for i, candidate in enumerate(request.candidate_hashes):
+        if not compared[i].any() or scores[i] < request.threshold:
+            continue
+        
+        similarity_score, hamming_dist, hash_distances = fused_result(scores[i], distances[i], compared[i])
+        matches.append({
+            "index": i,
+            "hash": candidate.get("phash", candidate.get("hash", "")),
+            "similarity_score": similarity_score,
+            "hamming_distance": hamming_dist,
+            "hash_distances": hash_distances,
+            "algorithm": request.algorithm,
+            "metadata": candidate.get("metadata", {})
+        })
+    
+    # Sort by similarity score (descending)
+    matches.sort(key=lambda x: x["similarity_score"], reverse=True)
+    
+    processing_time = (time.time() - start_time) * 1000
+    
+    return MatchResponse(
+        matches=matches[:config.MAX_MATCHES],
+        total_candidates=len(request.candidate_hashes),
+        processing_time_ms=processing_time
+    )
+
 @app.post("/match", response_model=MatchResponse)
 async def find_best_matches(request: MatchRequest):
     """Find best matches for a query image hash against candidate hashes."""
     start_time = time.time()
     
-    # Check cache first
-    cache_data = f"{request.query_hash}:{len(request.candidate_hashes)}:{request.algorithm}:{request.threshold}"
-    cache_key = get_cache_key(cache_data, "match")
-    cached_result = await get_from_cache(cache_key)
+    if request.algorithm == "fused":
+        return match_fused(request, start_time)
     
-    if cached_result:
-        cached_result["cached"] = True
-        return MatchResponse(**cached_result)
+    # Use phash for matching (most reliable)
+    candidate_hashes = [
+        candidate.get("phash", candidate.get("hash", "")) for candidate in request.candidate_hashes
+    ]
+    
+    # Check cache first. Scores are cached per candidate hash rather than per
+    # position, so metadata, order and threshold always come from this request.
+    cache_key = get_match_cache_key(
+        request.query_hash, [h for h in candidate_hashes if h], request.algorithm
+    )
+    cached_result = await get_from_cache(cache_key)
+    cached = cached_result is not None
+    scores = cached_result["scores"] if cached else {}
     
     matches = []
     
     # Process each candidate
-    for i, candidate in enumerate(request.candidate_hashes):
-        # Use phash for matching (most reliable)
-        candidate_hash = candidate.get("phash", candidate.get("hash", ""))
-        
+    for i, (candidate, candidate_hash) in enumerate(zip(request.candidate_hashes, candidate_hashes)):
         if not candidate_hash:
             continue
         
-        # Calculate similarity
-        similarity_score, hamming_dist = calculate_hash_similarity(
-            request.query_hash, 
-            candidate_hash, 
-            request.algorithm
-        )
+        score_key = candidate_hash.lower()
+        if score_key not in scores:
+            # Calculate similarity
+            scores[score_key] = calculate_hash_similarity(
+                request.query_hash, 
+                candidate_hash, 
+                request.algorithm
+            )
+        similarity_score, hamming_dist = scores[score_key]
         
         if similarity_score >= request.threshold:
             matches.append({
@@ -521,17 +973,16 @@ async def find_best_matches(request: MatchRequest):
     
     processing_time = (time.time() - start_time) * 1000
     
-    result = {
-        "matches": matches,
-        "total_candidates": len(request.candidate_hashes),
-        "processing_time_ms": processing_time,
-        "cached": False
-    }
-    
     # Cache result
-    await set_cache(cache_key, result)
+    if not cached:
+        await set_cache(cache_key, {"scores": scores})
     
-    return MatchResponse(**result)
+    return MatchResponse(
+        matches=matches,
+        total_candidates=len(request.candidate_hashes),
+        processing_time_ms=processing_time,
+        cached=cached
+    )
 
 @app.post("/info", response_model=ImageInfoResponse)
 async def get_image_info(file: UploadFile = File(...)):
@@ -543,36 +994,23 @@ async def get_image_info(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="Invalid image file")
     
     # Read file content
-    file_content = await file.read()
-    file_size = len(file_content)
-    
-    # Check file size
-    if not validate_image_size(file_size):
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Image too large. Max size: {config.MAX_IMAGE_SIZE_MB}MB"
-        )
+    file_buffer, file_size, _ = await read_upload(file)
     
     try:
-        # Open image
-        image = Image.open(io.BytesIO(file_content))
-        
-        # Calculate quality metrics
-        quality_metrics = calculate_image_quality(image)
+        async with reserve_image_workers():
+            info = await run_image_job(inspect_image_bytes, file_buffer.getvalue())
         
         processing_time = (time.time() - start_time) * 1000
         
         return ImageInfoResponse(
-            width=image.width,
-            height=image.height,
-            format=image.format or "unknown",
-            mode=image.mode,
+            **info,
             file_size_bytes=file_size,
             processing_time_ms=processing_time,
-            cached=False,
-            quality_metrics=quality_metrics
+            cached=False
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Image info error: {e}")
         raise HTTPException(status_code=500, detail="Failed to get image info")
@@ -580,7 +1018,7 @@ async def get_image_info(file: UploadFile = File(...)):
 @app.get("/config")
 async def get_config():
     """Get current configuration."""
-    return config.summary()
+    return {**config.summary(), "hash_version": HASH_VERSION}
 
 if __name__ == "__main__":
     import uvicorn